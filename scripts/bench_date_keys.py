@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Microbenchmark date validation and promotion sorting over the real timeline.
+
+The committed ``master_timeline.csv`` is scaled ``--scale`` times (1000x by
+default). Every copy gets its own date string objects, as rows read from a CSV
+would. ``uncached`` calls the parser underneath the cache for every row;
+``cached`` goes through ``date_keys`` as the tools now do, starting from an
+empty cache.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import pathlib
+import random
+import time
+
+from date_keys import is_standard_date, parse_date
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def load(scale: int) -> list[tuple[str, str, str]]:
+    with (ROOT / "data" / "master" / "master_timeline.csv").open(newline="", encoding="utf-8") as handle:
+        rows = [(row["date"], row["location"].lower(), row["event"].lower()) for row in csv.DictReader(handle)]
+    scaled = [((date + " ")[:-1], location, event) for _ in range(scale) for date, location, event in rows]
+    random.Random(25).shuffle(scaled)
+    return scaled
+
+
+def timed(label: str, action) -> float:
+    started = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - started
+    print(f"  {label}={elapsed:.2f}s")
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1000, help="Copies of the committed timeline")
+    args = parser.parse_args()
+
+    rows = load(args.scale)
+    distinct = len({date for date, _, _ in rows})
+    print(f"rows={len(rows)} distinct_dates={distinct} (wall-clock seconds, single run)")
+    uncached = parse_date.__wrapped__
+
+    print("validation (every date checked once)")
+    slow = timed("uncached", lambda: sum(uncached(date.strip())[0] == 0 for date, _, _ in rows))
+    parse_date.cache_clear()
+    fast = timed("cached", lambda: sum(is_standard_date(date.strip()) for date, _, _ in rows))
+    print(f"  speedup={slow / fast:.1f}x")
+
+    print("promotion sort (master_key order)")
+    slow = timed("uncached", lambda: sorted(rows, key=lambda row: (uncached(row[0]), row[1], row[2])))
+    parse_date.cache_clear()
+    fast = timed("cached", lambda: sorted(rows, key=lambda row: (parse_date(row[0]), row[1], row[2])))
+    print(f"  speedup={slow / fast:.1f}x cache={parse_date.cache_info()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark promoting a small pending batch into a large canonical timeline.
+
+A sorted synthetic ``master_timeline.csv`` of ``--rows`` rows receives one
+pending batch of ``--batch`` rows. ``stream`` is ``merge_master`` (sort the batch,
+stream-merge it with the canonical file); ``full`` is the whole-table promotion
+it replaced (load every row, dedupe, re-sort, rewrite). The table's fingerprint
+index is built before ``stream`` is timed, as it persists between promotions;
+the build is reported as ``index``. With ``--memory`` each run also reports its
+peak traced allocation, which slows both runs.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import pathlib
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from import_pending import ALL_MASTER, RowIndex, dedupe, master_key, merge_master, normalize, read_dicts
+
+
+def write_master(path: pathlib.Path, rows: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    start = date(1990, 1, 1)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(ALL_MASTER)
+        for index in range(rows):
+            day = (start + timedelta(days=index // 40)).isoformat()
+            writer.writerow([
+                day, f"City {index % 40:02d}", f"Event {index:07d}", "Person A; Person B",
+                f"https://source.test/{index}", "Synthetic benchmark row.", "pending", "",
+            ])
+
+
+def write_batch(path: pathlib.Path, rows: int, master_rows: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    start = date(1990, 1, 1)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(ALL_MASTER)
+        for index in range(rows):
+            day = (start + timedelta(days=(master_rows * (index + 1) // (rows + 1)) // 40)).isoformat()
+            writer.writerow([day, "City 99", f"Incoming {index}", "Person C", "https://source.test/new", "New.", "", ""])
+
+
+def full_promotion(data: pathlib.Path) -> None:
+    destination = data / "master" / "master_timeline.csv"
+    rows = read_dicts(destination)
+    for path in sorted((data / "pending").glob("pending_updates_*.csv")):
+        for row in read_dicts(path):
+            normalized = normalize(row, ALL_MASTER)
+            normalized["deep_search_event"] = normalized["deep_search_event"] or "pending"
+            rows.append(normalized)
+    rows = dedupe(rows, ALL_MASTER)
+    rows.sort(key=master_key)
+    with destination.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=ALL_MASTER)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run(promotion, data: pathlib.Path, memory: bool) -> tuple[float, int]:
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    promotion(data)
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch", type=int, default=3, help="Rows in the pending batch")
+    parser.add_argument("--memory", action="store_true", help="Trace peak allocation (slower)")
+    args = parser.parse_args()
+
+    print("wall-clock seconds, single run per mode")
+    for rows in args.rows:
+        results = {}
+        for mode, promotion in (("stream", merge_master), ("full", full_promotion)):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                data = pathlib.Path(temp_dir) / "data"
+                write_master(data / "master" / "master_timeline.csv", rows)
+                write_batch(data / "pending" / "pending_updates_bench.csv", args.batch, rows)
+                if mode == "stream":
+                    started = time.perf_counter()
+                    RowIndex(data / "master" / "master_timeline.csv", ALL_MASTER, master_key).close()
+                    index_seconds = time.perf_counter() - started
+                results[mode] = run(promotion, data, args.memory)
+                with (data / "master" / "master_timeline.csv").open(encoding="utf-8") as handle:
+                    written = sum(1 for _ in handle) - 1
+                if written != rows + args.batch:
+                    raise AssertionError(f"{mode}: wrote {written} rows")
+        line = " ".join(f"{mode}={elapsed:.2f}s" for mode, (elapsed, _) in results.items()) + f" index={index_seconds:.2f}s"
+        if args.memory:
+            line += " " + " ".join(f"{mode}-peak={peak / 2**20:.1f}MiB" for mode, (_, peak) in results.items())
+        print(f"rows={rows} batch={args.batch} {line} speedup={results['full'][0] / results['stream'][0]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
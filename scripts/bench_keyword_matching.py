@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark multi-target keyword matching strategies for the search agents.
+
+Targets are generated from real ``master_timeline.csv`` rows with the search
+agent's own keyword rule. Documents are synthetic feed-entry texts built from the
+same vocabulary, so a realistic share of targets match. Every strategy must return
+identical matches; timings are printed per target count.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import pathlib
+import random
+import re
+import time
+
+from keyword_automaton import TargetMatcher
+from keyword_index import KeywordIndex
+from search_agent import keywords_for_event
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def load_targets(base: pathlib.Path, count: int) -> list[list[str]]:
+    with (base / "data" / "master" / "master_timeline.csv").open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    keyword_sets = [keywords for keywords in (keywords_for_event(row) for row in rows) if keywords]
+    return [keyword_sets[index % len(keyword_sets)] for index in range(count)]
+
+
+def make_documents(targets: list[list[str]], count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = sorted({word for keywords in targets for word in keywords})
+    filler = re.findall(r"[a-z]+", "public record hearing statement release report video archive court filing")
+    documents: list[str] = []
+    for index in range(count):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(8, 30))]
+        words += [rng.choice(filler) for _ in range(rng.randint(10, 40))]
+        if index % 5 == 0:
+            words += rng.choice(targets)
+        rng.shuffle(words)
+        documents.append(" ".join(words))
+    return documents
+
+
+def nested_loop(documents: list[str], targets: list[list[str]]) -> list[list[int]]:
+    return [
+        [doc_id for doc_id, text in enumerate(documents) if all(keyword in text for keyword in keywords)]
+        for keywords in targets
+    ]
+
+
+def inverted_index(documents: list[str], targets: list[list[str]]) -> list[list[int]]:
+    index = KeywordIndex()
+    for text in documents:
+        index.add(text)
+    return [index.search(keywords) for keywords in targets]
+
+
+def automaton(documents: list[str], targets: list[list[str]]) -> list[list[int]]:
+    matcher = TargetMatcher(targets)
+    matches: list[list[int]] = [[] for _ in targets]
+    for doc_id, text in enumerate(documents):
+        for target in matcher.match(text):
+            matches[target].append(doc_id)
+    return matches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base", default=str(ROOT))
+    parser.add_argument("--targets", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--documents", type=int, default=400, help="Feed entries plus page anchors per run")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    strategies = (("nested-loop", nested_loop), ("inverted-index", inverted_index), ("aho-corasick", automaton))
+    print(f"documents={args.documents} repeat={args.repeat} (best wall-clock seconds)")
+    for count in args.targets:
+        targets = load_targets(pathlib.Path(args.base).resolve(), count)
+        documents = make_documents(targets, args.documents, seed=count)
+        reference = None
+        timings: list[str] = []
+        for name, strategy in strategies:
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                result = strategy(documents, targets)
+                best = min(best, time.perf_counter() - started)
+            if reference is None:
+                reference = result
+            elif result != reference:
+                raise AssertionError(f"{name} disagrees with nested-loop matches at {count} targets")
+            timings.append(f"{name}={best:.4f}s")
+        matched = sum(1 for docs in reference or [] if docs)
+        print(f"targets={count} matched_targets={matched} " + " ".join(timings))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
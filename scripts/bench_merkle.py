@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark Merkle batch proof generation and verification.
+
+The per-leaf strategy rebuilds the tree for every proof, as ``merkle_proof`` did.
+It is O(n^2), so at large sizes it is timed on a leaf sample and extrapolated;
+those figures are marked ``~``. The single-pass tree builds once and emits every
+proof. Verification compares independent proof walks with the memoized verifier.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import time
+
+from merkle import MerkleTree, ProofVerifier
+
+
+def rebuilt_proof(hashes: list[str], index: int) -> list[dict[str, str]]:
+    level = [bytes.fromhex(value.split(":", 1)[1]) for value in hashes]
+    position = index
+    proof: list[dict[str, str]] = []
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        sibling = position - 1 if position % 2 else position + 1
+        proof.append({"position": "left" if sibling < position else "right", "hash": "sha256:" + level[sibling].hex()})
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+        position //= 2
+    return proof
+
+
+def independent_walk(leaf: str, siblings: list[dict[str, str]]) -> str:
+    current = bytes.fromhex(leaf.split(":", 1)[1])
+    for step in siblings:
+        sibling = bytes.fromhex(step["hash"].split(":", 1)[1])
+        pair = sibling + current if step["position"] == "left" else current + sibling
+        current = hashlib.sha256(pair).digest()
+    return "sha256:" + current.hex()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--leaves", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--sample", type=int, default=50, help="Per-leaf proofs timed before extrapolating")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print("wall-clock seconds, single run")
+    for count in args.leaves:
+        leaves = ["sha256:" + rng.randbytes(32).hex() for _ in range(count)]
+
+        started = time.perf_counter()
+        tree = MerkleTree(leaves)
+        proofs = tree.proofs()
+        single_pass = time.perf_counter() - started
+
+        sample = sorted(rng.sample(range(count), min(args.sample, count)))
+        started = time.perf_counter()
+        for index in sample:
+            if rebuilt_proof(leaves, index) != proofs[index]:
+                raise AssertionError(f"per-leaf proof {index} disagrees with single-pass tree")
+        per_leaf = (time.perf_counter() - started) * count / len(sample)
+        mark = "" if len(sample) == count else "~"
+
+        started = time.perf_counter()
+        if any(independent_walk(leaf, path) != tree.root for leaf, path in zip(leaves, proofs)):
+            raise AssertionError("independent walk failed")
+        walk = time.perf_counter() - started
+
+        verifier = ProofVerifier()
+        started = time.perf_counter()
+        if any(verifier.apply(leaf, path) != tree.root for leaf, path in zip(leaves, proofs)):
+            raise AssertionError("memoized verifier failed")
+        memoized = time.perf_counter() - started
+
+        print(
+            f"leaves={count} prove: per-leaf={mark}{per_leaf:.2f}s single-pass={single_pass:.3f}s "
+            f"verify: independent={walk:.3f}s memoized={memoized:.3f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
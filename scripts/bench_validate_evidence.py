@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark evidence validation on synthetic evidence trees.
+
+Each tree holds ``receipts`` discovery receipts, packed into segments and split
+into Merkle batches of ``--batches`` runs, with one inclusion proof per receipt.
+``validate`` runs with no cache and one process, so the figure is the full cost.
+For contrast, the list-scan proof binding the validator used before leaf
+indexes is timed on a sample of proofs and extrapolated; those figures are
+marked ``~``.
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import tempfile
+import time
+
+from evidence_chain import persist_discovery, write_run_merkle_batch
+from evidence_segments import SegmentStore
+from validate_evidence_outputs import validate
+
+
+def build(base: pathlib.Path, receipts: int, batches: int) -> list[list[str]]:
+    """Write a synthetic tree and return each batch's leaf hashes in leaf order."""
+    per_batch = -(-receipts // batches)
+    leaves: list[list[str]] = []
+    for batch in range(batches):
+        run_id = f"bench-{batch:03d}"
+        count = min(per_batch, receipts - batch * per_batch)
+        if count <= 0:
+            break
+        with SegmentStore(base, run_id) as store:
+            refs = [
+                persist_discovery(
+                    base=base, hit={"title": f"Record {batch}-{index}", "link": f"https://feed.test/{batch}/{index}"},
+                    target_type="event", target_label="Hearing", target_row_key="2024-01-01|City|Hearing",
+                    keywords=["hearing"], run_id=run_id, captured_at=f"2026-10-18T00:{batch // 60:02d}:{batch % 60:02d}Z",
+                    store=store,
+                )
+                for index in range(count)
+            ]
+            write_run_merkle_batch(base, run_id, refs, store=store)
+        leaves.append([ref["receipt_hash"] for ref in sorted(refs, key=lambda ref: ref["receipt_id"])])
+    return leaves
+
+
+def list_scan(leaves: list[list[str]], sample: int) -> float:
+    """Time ``receipt_hash in leaves`` for sampled proofs and extrapolate to every proof."""
+    rng = random.Random(17)
+    total = 0.0
+    for batch in leaves:
+        picks = [batch[rng.randrange(len(batch))] for _ in range(min(sample, len(batch)))]
+        started = time.perf_counter()
+        for leaf in picks:
+            if leaf not in batch:
+                raise AssertionError("sampled leaf missing from its batch")
+        total += (time.perf_counter() - started) * len(batch) / len(picks)
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--receipts", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--batches", type=int, default=10, help="Merkle batches per tree")
+    parser.add_argument("--sample", type=int, default=200, help="Proofs per batch timed for the list-scan figure")
+    args = parser.parse_args()
+
+    print("wall-clock seconds, single run, no validation cache, one process")
+    previous = None
+    for receipts in args.receipts:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = pathlib.Path(temp_dir)
+            started = time.perf_counter()
+            leaves = build(base, receipts, args.batches)
+            built = time.perf_counter() - started
+
+            started = time.perf_counter()
+            counts = validate(base)
+            elapsed = time.perf_counter() - started
+            if counts != (receipts, receipts, len(leaves), receipts):
+                raise AssertionError(f"unexpected counts {counts}")
+            scan = list_scan(leaves, args.sample)
+
+        growth = f" growth={elapsed / previous[1]:.1f}x for {receipts / previous[0]:.0f}x receipts" if previous else ""
+        print(
+            f"receipts={receipts} build={built:.1f}s validate={elapsed:.2f}s per-receipt={elapsed / receipts * 1e6:.0f}us "
+            f"list-scan-proof-binding=~{scan:.2f}s{growth}"
+        )
+        previous = (receipts, elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
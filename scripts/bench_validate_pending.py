@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark validating a bulk back-fill of pending batches.
+
+``--batches`` contributor files of ``--rows`` rows each, split across the
+updates, people and unverified groups, are validated once per ``--jobs`` value.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import pathlib
+import tempfile
+import time
+
+from import_pending import ALL_MASTER, REQ_PEOPLE, REQ_UNVER_EVENTS, validate_pending
+
+
+def build(pending: pathlib.Path, batches: int, rows: int) -> None:
+    pending.mkdir(parents=True)
+    groups = [
+        ("pending_updates", ALL_MASTER, lambda index: ["2019-07-07", "New York NY", f"Event {index}", "A", "https://s.test", "n", "", ""]),
+        ("pending_people", REQ_PEOPLE, lambda index: ["2019-07-07", "New York NY", f"Event {index}", "A", "subject", "https://s.test", "", ""]),
+        ("pending_unverified", ["type", *REQ_UNVER_EVENTS], lambda index: ["event", "2019", "Paris", f"Event {index}", "a", "b", "low", "n", "s"]),
+    ]
+    for batch in range(batches):
+        prefix, header, row = groups[batch % len(groups)]
+        with (pending / f"{prefix}_{batch:04d}.csv").open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(header)
+            writer.writerows(row(index) for index in range(rows))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=200, help="Rows per batch")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data = pathlib.Path(temp_dir) / "data"
+        build(data / "pending", args.batches, args.rows)
+        print(f"wall-clock seconds, single run, batches={args.batches} rows-per-batch={args.rows}")
+        for jobs in args.jobs:
+            started = time.perf_counter()
+            accepted = validate_pending(data, jobs=jobs)
+            elapsed = time.perf_counter() - started
+            if len(accepted) != args.batches:
+                raise AssertionError(f"accepted {len(accepted)} of {args.batches} batches")
+            rows = args.batches * args.rows
+            print(f"jobs={jobs} validate={elapsed:.2f}s rows_per_second={rows / elapsed:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
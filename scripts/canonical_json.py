@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Canonical JSON serialization for FREE-DOM evidence hashes.
+
+Every evidence hash and ``size_bytes`` value is taken over the same rendering:
+sorted keys, compact separators, UTF-8 without ASCII escaping. ``canonical``
+serializes a value once and returns its bytes, ``sha256:`` digest and length
+together, so no caller has to serialize the same object twice.
+
+The standard library encoder is the reference. Setting
+``FREEDOM_CANONICAL_JSON=orjson`` uses orjson when it is installed. That backend
+is only used for values it renders byte-for-byte like the reference: values
+containing floats, integers outside 64 bits or non-string keys fall back to the
+standard library. ``test_canonical_json.py`` checks the two backends agree.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, NamedTuple
+
+BACKEND_ENV = "FREEDOM_CANONICAL_JSON"
+
+
+class Canonical(NamedTuple):
+    data: bytes
+    digest: str
+    length: int
+
+
+def stdlib_bytes(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _has_float(value: Any) -> bool:
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            return True
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _load_fast() -> Any:
+    if os.environ.get(BACKEND_ENV, "stdlib").lower() != "orjson":
+        return None
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    def fast_bytes(value: Any) -> bytes:
+        # orjson and json format some floats differently (1e+16 vs 1e16).
+        if _has_float(value):
+            return stdlib_bytes(value)
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return stdlib_bytes(value)
+
+    return fast_bytes
+
+
+_FAST = _load_fast()
+BACKEND = "orjson" if _FAST is not None else "stdlib"
+canonical_bytes = _FAST or stdlib_bytes
+
+
+def canonical(value: Any) -> Canonical:
+    """Serialize ``value`` once; returns its canonical bytes, digest and length."""
+    data = canonical_bytes(value)
+    return Canonical(data, "sha256:" + hashlib.sha256(data).hexdigest(), len(data))
+
+
+def canonical_digest(value: Any) -> str:
+    return "sha256:" + hashlib.sha256(canonical_bytes(value)).hexdigest()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Maintained head record for the FREE-DOM Merkle batch chain.
+
+``data/evidence/chain-head.json`` names the newest batch, its hash and the number
+of batches in ``data/evidence/merkle/``. Writing a batch reads the head instead of
+parsing every batch file, checks it in constant time against the batch it names
+and a name-only count of the directory, and replaces it atomically once the new
+batch is on disk. A missing, stale or unreadable head falls back to a full scan,
+so the head is an index only: the batch files remain the chain of record.
+
+Usage: ``chain_head.py --base . rebuild`` or ``chain_head.py --base . verify``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pathlib
+import sys
+from typing import Any
+
+HEAD_SCHEMA = "stegverse.free-dom.evidence-chain-head.v1"
+HEAD_PATH = pathlib.PurePosixPath("data/evidence/chain-head.json")
+MERKLE_DIR = pathlib.PurePosixPath("data/evidence/merkle")
+
+
+def count_batch_files(merkle_dir: pathlib.Path) -> int:
+    """Count batch file names without opening them."""
+    if not merkle_dir.exists():
+        return 0
+    with os.scandir(merkle_dir) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(".json") and entry.is_file())
+
+
+def scan_head(base: pathlib.Path) -> dict[str, Any] | None:
+    """Find the newest batch by parsing every batch file, ordered as the validator orders them."""
+    merkle_dir = base / MERKLE_DIR
+    candidates: list[tuple[str, str, str, str]] = []
+    for path in merkle_dir.glob("*.json") if merkle_dir.exists() else []:
+        try:
+            obj = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        created_at, batch_hash = obj.get("created_at"), obj.get("batch_hash")
+        if isinstance(created_at, str) and isinstance(batch_hash, str):
+            candidates.append((created_at, path.name, batch_hash, str(obj.get("batch_id") or "")))
+    if not candidates:
+        return None
+    created_at, filename, batch_hash, batch_id = sorted(candidates)[-1]
+    return make_head(batch_id, batch_hash, f"{MERKLE_DIR}/{filename}", created_at, len(candidates))
+
+
+def make_head(batch_id: str, batch_hash: str, ref: str, created_at: str, batch_count: int) -> dict[str, Any]:
+    return {
+        "schema": HEAD_SCHEMA,
+        "batch_id": batch_id,
+        "batch_hash": batch_hash,
+        "ref": ref,
+        "created_at": created_at,
+        "batch_count": batch_count,
+    }
+
+
+def read_head(base: pathlib.Path) -> dict[str, Any] | None:
+    try:
+        head = json.loads((base / HEAD_PATH).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return head if isinstance(head, dict) and head.get("schema") == HEAD_SCHEMA else None
+
+
+def head_is_current(base: pathlib.Path, head: dict[str, Any]) -> bool:
+    """Constant-time check: the named batch exists with that hash and no batch was added."""
+    ref = head.get("ref")
+    if not isinstance(ref, str) or not ref.startswith(f"{MERKLE_DIR}/"):
+        return False
+    try:
+        batch = json.loads((base / ref).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return False
+    return (
+        batch.get("batch_hash") == head.get("batch_hash")
+        and batch.get("created_at") == head.get("created_at")
+        and count_batch_files(base / MERKLE_DIR) == head.get("batch_count")
+    )
+
+
+def current_head(base: pathlib.Path) -> dict[str, Any] | None:
+    """Return the head record, rescanning the batch directory only when it is not current."""
+    head = read_head(base)
+    if head is not None and head_is_current(base, head):
+        return head
+    return scan_head(base)
+
+
+def write_head(base: pathlib.Path, head: dict[str, Any]) -> pathlib.Path:
+    path = base / HEAD_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps(head, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(temp, path)
+    return path
+
+
+def verify_head(base: pathlib.Path) -> None:
+    """Raise ``ValueError`` unless the head matches a full scan of the batch directory."""
+    expected = scan_head(base)
+    head = read_head(base)
+    if expected is None:
+        if head is not None:
+            raise ValueError(f"{HEAD_PATH}: head names {head.get('ref')} but no batches exist")
+        return
+    if head is None:
+        raise ValueError(f"{HEAD_PATH}: chain head missing or unreadable")
+    for field in ("batch_id", "batch_hash", "ref", "created_at", "batch_count"):
+        if head.get(field) != expected[field]:
+            raise ValueError(f"{HEAD_PATH}: {field} {head.get(field)!r} does not match chain ({expected[field]!r})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base", default=".")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args()
+    base = pathlib.Path(args.base).resolve()
+    if args.command == "rebuild":
+        head = scan_head(base)
+        if head is None:
+            (base / HEAD_PATH).unlink(missing_ok=True)
+            print("ALLOW chain_head_rebuilt batches=0")
+            return 0
+        write_head(base, head)
+        print(f"ALLOW chain_head_rebuilt batches={head['batch_count']} head={head['ref']}")
+        return 0
+    try:
+        verify_head(base)
+    except ValueError as exc:
+        print(f"DENY chain_head_invalid: {exc}", file=sys.stderr)
+        return 1
+    print("ALLOW chain_head_valid")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Bounded concurrent retrieval for governed public-source sweeps.
+
+Sources are fetched on a thread pool with a global worker cap, a per-host cap and a
+bounded number of outstanding requests. Results are keyed and returned in input
+order, so downstream evidence ordering never depends on network timing.
+"""
+from __future__ import annotations
+
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST = 2
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def fetch_all(
+    urls: Iterable[str],
+    fetch: Callable[[str], T],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host: int = DEFAULT_PER_HOST,
+    max_queued: int | None = None,
+) -> dict[str, T]:
+    """Fetch each unique URL once and return results in first-seen input order.
+
+    ``fetch`` must report failures in its return value rather than raising; the
+    search agent's ``(payload, content_type, error)`` contract does exactly that.
+    At most ``max_workers`` requests run at once, at most ``per_host`` of them
+    against one host, and at most ``max_queued`` further requests wait in the pool.
+    """
+    ordered = list(dict.fromkeys(urls))
+    if max_workers <= 1 or len(ordered) <= 1:
+        return {url: fetch(url) for url in ordered}
+
+    per_host = max(per_host, 1)
+    limit = max_workers + (max_workers if max_queued is None else max(max_queued, 0))
+    waiting = deque(ordered)
+    in_flight: Counter[str] = Counter()
+    results: dict[str, T] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="source-fetch") as pool:
+        pending: dict[Future[T], str] = {}
+        while waiting or pending:
+            deferred: list[str] = []
+            while waiting and len(pending) < limit:
+                url = waiting.popleft()
+                host = host_of(url)
+                if in_flight[host] >= per_host:
+                    deferred.append(url)
+                    continue
+                in_flight[host] += 1
+                pending[pool.submit(fetch, url)] = url
+            waiting.extendleft(reversed(deferred))
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                in_flight[host_of(url)] -= 1
+                results[url] = future.result()
+
+    return {url: results[url] for url in ordered}
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Date parsing shared by the canonical-table tools.
+
+Canonical dates are ``YYYY-MM-DD``, ``YYYY-MM`` or ``YYYY``, or such a date
+opening an en-dash range (``2019-07-07 – 2019-07-08``). The same raw strings
+repeat across thousands of rows and every table, so each distinct string is
+parsed once per process. Date validation and promotion sort keys both reuse
+the cached result.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+
+FORMATS = ("%Y-%m-%d", "%Y-%m", "%Y")
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_date(value: str) -> tuple:
+    """Return a sort key: ``(0, year, month, day, start)`` for standard dates, else ``(1, 9999, 12, 31, start)``."""
+    value = value.split("–", 1)[0].strip()
+    for fmt in FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+            return (0, parsed.year, parsed.month, parsed.day, value)
+        except ValueError:
+            continue
+    return (1, 9999, 12, 31, value or "~")
+
+
+def is_standard_date(value: str) -> bool:
+    return parse_date(value)[0] == 0
@@ -6,17 +6,20 @@ Native verified/master/pending/unverified records and privacy labels are never m
 Candidate packets conform to ERL transport v1; TV/TVC remains credential authority.
 """
 from __future__ import annotations
-import argparse,csv,hashlib,json,pathlib,re,urllib.request
+import argparse,csv,hashlib,json,pathlib,re,sys,urllib.error,urllib.request
 from datetime import datetime,timezone
 from html.parser import HTMLParser
 from urllib.parse import urljoin
+sys.path.insert(0,str(pathlib.Path(__file__).resolve().parent))
+from http_cache import HttpCache
+from jsonl_writer import JsonlWriter
+from keyword_automaton import TargetMatcher
 REPOSITORY='StegVerse-Labs/FREE-DOM';UA='StegVerse-ERL-FREEDOM/1.1'
 def now():return datetime.now(timezone.utc).isoformat()
 def sid(*p):return hashlib.sha256('|'.join(map(str,p)).encode()).hexdigest()[:24]
-def append(path,obj,dry):
-    if dry:return
-    path.parent.mkdir(parents=True,exist_ok=True)
-    with path.open('a',encoding='utf-8') as f:f.write(json.dumps(obj,sort_keys=True)+'\n')
+def append(out,obj,dry):
+    if not dry:out.write(obj)
+def ledger(path):return JsonlWriter(path,ensure_ascii=True)
 def jsonl(path):return [json.loads(x) for x in path.read_text(encoding='utf-8').splitlines() if x.strip()] if path.exists() else []
 def load(path):return json.loads(path.read_text(encoding='utf-8')) if path.exists() else {}
 def sources(path):
@@ -30,6 +33,17 @@ class Links(HTMLParser):
         if self.href is not None:self.txt.append(d)
     def handle_endtag(self,tag):
         if tag=='a' and self.href is not None:self.links.append((' '.join(self.txt).strip(),self.href));self.href=None;self.txt=[]
+def fetch(u,cache=None):
+    c=cache.conditional_headers(u) if cache else {}
+    try:r=urllib.request.urlopen(urllib.request.Request(u,headers={'User-Agent':UA,**c}),timeout=15);data=r.read(2_000_000)
+    except urllib.error.HTTPError as e:
+        if e.code!=304 or not c:raise
+        hit=cache.hit(u)
+        if hit is not None:return hit.body
+        # Cached body evicted or corrupt: refetch once without validators.
+        r=urllib.request.urlopen(urllib.request.Request(u,headers={'User-Agent':UA}),timeout=15);data=r.read(2_000_000)
+    if cache:cache.miss(u,data,r.headers)
+    return data
 def active(base):
     out=jsonl(base/'research/acquisition_requests.jsonl');f=load(base/'research/frontier.json')
     for t in f.get('trajectories',[]):
@@ -38,22 +52,28 @@ def active(base):
     return [r for r in out if r.get('state','ACTIVE') in {'OPEN','ACTIVE','RETRY'}]
 def packet(req,src,title,link):return {'schema':'stegverse.erl.research_source_candidate.v1','candidate_id':'SRC-'+sid(req.get('request_id'),link),'repository':REPOSITORY,'trajectory_ids':req.get('trajectory_ids',[]),'acquisition_request_id':req.get('request_id'),'query':req.get('query',''),'source_url':link,'source_title':title,'retrieved_at':now(),'source_class':src.get('authority_class') or src.get('type') or 'unknown','authority_proximity':'unknown','content_sha256':None,'custody_pointer':None,'verification_state':'UNVERIFIED','evidence_role':'lead-only','native_records_mutated':False,'evaluation_changed':False,'privacy_policy_preserved':True,'discovered_by':'scripts/erl_research_agent.py','transport':{'source_repository':REPOSITORY,'destination_repository':'StegVerse-Labs/Executive_Rhetoric_Ledger','authority_effect':'NONE','credential_authority':'TV/TVC','github_token_authority':'NONE'}}
 def main():
-    p=argparse.ArgumentParser();p.add_argument('--base',default='.');p.add_argument('--dry-run',action='store_true');a=p.parse_args();b=pathlib.Path(a.base).resolve();R=active(b);S=sources(b/'data/sources/sources_whitelist.csv');count=0;seen=set()
-    for req in R:
-        terms=[x.lower() for x in re.findall(r'[A-Za-z0-9][A-Za-z0-9._-]{2,}',req.get('query',''))][:12]
-        for src in S:
-            u=(src.get('url') or '').strip()
-            if not u:continue
-            try:
-                r=urllib.request.urlopen(urllib.request.Request(u,headers={'User-Agent':UA}),timeout=15);data=r.read(2_000_000);digest=hashlib.sha256(data).hexdigest();parser=Links();parser.feed(data.decode('utf-8',errors='ignore'));hits=[]
-                for title,href in parser.links:
-                    hay=(title+' '+href).lower()
-                    if terms and not all(t in hay for t in terms):continue
-                    link=urljoin(u,href);k=sid(link)
-                    if k in seen:continue
-                    seen.add(k);hits.append((title,link))
-                for title,link in hits[:10]:append(b/'research/source_candidates.jsonl',packet(req,src,title,link),a.dry_run);count+=1
-                append(b/'research/research_receipts.jsonl',{'receipt_id':'RSRCH-'+sid(req.get('request_id'),u,digest),'request_id':req.get('request_id'),'trajectory_ids':req.get('trajectory_ids',[]),'source_scanned':u,'retrieved_at':now(),'response_hash':digest,'hits':len(hits),'result':'NO_UPDATE' if not hits else 'CANDIDATES_EMITTED','native_records_mutated':False,'evaluation_changed':False,'privacy_policy_preserved':True},a.dry_run)
-            except Exception as e:append(b/'research/research_receipts.jsonl',{'receipt_id':'RSRCH-'+sid(req.get('request_id'),u,now()),'request_id':req.get('request_id'),'trajectory_ids':req.get('trajectory_ids',[]),'source_scanned':u,'retrieved_at':now(),'result':'FAILED','error':type(e).__name__,'native_records_mutated':False,'evaluation_changed':False,'privacy_policy_preserved':True},a.dry_run)
-    print(json.dumps({'repository':REPOSITORY,'requests':len(R),'sources':len(S),'candidates':count,'dry_run':a.dry_run,'native_records_mutated':False,'evaluation_changed':False,'privacy_policy_preserved':True,'candidate_schema':'stegverse.erl.research_source_candidate.v1','credential_authority':'TV/TVC','github_token_authority':'NONE'},sort_keys=True))
+    p=argparse.ArgumentParser();p.add_argument('--base',default='.');p.add_argument('--dry-run',action='store_true');p.add_argument('--http-cache-dir',help='Conditional-GET cache directory, relative to --base');a=p.parse_args();b=pathlib.Path(a.base).resolve();hc=HttpCache(b/a.http_cache_dir) if a.http_cache_dir else None;R=active(b);S=sources(b/'data/sources/sources_whitelist.csv');count=0;seen=set()
+    Q=[[x.lower() for x in re.findall(r'[A-Za-z0-9][A-Za-z0-9._-]{2,}',req.get('query',''))][:12] for req in R];M=TargetMatcher(Q);docs={}
+    for src in S if R else []:
+        u=(src.get('url') or '').strip()
+        if not u or u in docs:continue
+        try:data=fetch(u,hc);parser=Links();parser.feed(data.decode('utf-8',errors='ignore'));docs[u]=(hashlib.sha256(data).hexdigest(),[(title,href,set(M.match((title+' '+href).lower()))) for title,href in parser.links])
+        except Exception as e:docs[u]=e
+    with ledger(b/'research/source_candidates.jsonl') as C,ledger(b/'research/research_receipts.jsonl') as W:
+        for i,req in enumerate(R):
+            for src in S:
+                u=(src.get('url') or '').strip()
+                if not u:continue
+                try:
+                    if isinstance(docs[u],Exception):raise docs[u]
+                    digest,links=docs[u];hits=[]
+                    for title,href,matched in links:
+                        if i not in matched:continue
+                        link=urljoin(u,href);k=sid(link)
+                        if k in seen:continue
+                        seen.add(k);hits.append((title,link))
+                    for title,link in hits[:10]:append(C,packet(req,src,title,link),a.dry_run);count+=1
+                    append(W,{'receipt_id':'RSRCH-'+sid(req.get('request_id'),u,digest),'request_id':req.get('request_id'),'trajectory_ids':req.get('trajectory_ids',[]),'source_scanned':u,'retrieved_at':now(),'response_hash':digest,'hits':len(hits),'result':'NO_UPDATE' if not hits else 'CANDIDATES_EMITTED','native_records_mutated':False,'evaluation_changed':False,'privacy_policy_preserved':True},a.dry_run)
+                except Exception as e:append(W,{'receipt_id':'RSRCH-'+sid(req.get('request_id'),u,now()),'request_id':req.get('request_id'),'trajectory_ids':req.get('trajectory_ids',[]),'source_scanned':u,'retrieved_at':now(),'result':'FAILED','error':type(e).__name__,'native_records_mutated':False,'evaluation_changed':False,'privacy_policy_preserved':True},a.dry_run)
+    print(json.dumps({'repository':REPOSITORY,'requests':len(R),'sources':len(S),'candidates':count,'dry_run':a.dry_run,'native_records_mutated':False,'evaluation_changed':False,'privacy_policy_preserved':True,'candidate_schema':'stegverse.erl.research_source_candidate.v1','credential_authority':'TV/TVC','github_token_authority':'NONE','http_cache':hc.summary() if hc else None},sort_keys=True))
 if __name__=='__main__':main()
@@ -7,7 +7,6 @@ not establish truth of the linked source.
 """
 from __future__ import annotations
 
-import hashlib
 import json
 import os
 import pathlib
@@ -16,9 +15,18 @@ from datetime import datetime, timezone
 from typing import Any
 from urllib.parse import urlparse
 
+from canonical_json import canonical, canonical_digest
+from chain_head import current_head, make_head, write_head
+from evidence_segments import SegmentStore, loose_bytes, loose_path
+from merkle import MerkleTree
+from mmr import record_batch
+
 MANIFEST_VERSION = "stegverse.evidence-manifest.v1"
 RECEIPT_VERSION = "stegverse.evidence-transition-receipt.v1"
 BATCH_VERSION = "stegverse.evidence-merkle-batch.v1"
+PROOF_VERSION = "stegverse.merkle-inclusion-proof.v1"
+BUNDLE_VERSION = "stegverse.merkle-proof-bundle.v1"
+PROOF_FORMATS = ("files", "bundle")
 POLICY_REF = "StegVerse-Labs/repo-standards:ST-007@v1"
 
 
@@ -26,12 +34,8 @@ def utc_now() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def canonical_bytes(value: Any) -> bytes:
-    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
-
-
 def sha256_value(value: Any) -> str:
-    return "sha256:" + hashlib.sha256(canonical_bytes(value)).hexdigest()
+    return canonical_digest(value)
 
 
 def safe_slug(value: str, limit: int = 72) -> str:
@@ -68,7 +72,8 @@ def make_manifest(*, hit: dict[str, Any], target_type: str, target_label: str,
         "captured_at": captured_at,
         "run_id": run_id,
     }
-    artifact_hash = sha256_value(artifact)
+    rendered = canonical(artifact)
+    artifact_hash = rendered.digest
     evidence_id = "EVID-FREEDOM-" + artifact_hash.split(":", 1)[1][:24]
     claim_text = title or f"Discovery hit for {target_label}"
     claim_hash = sha256_value({"claim_text": claim_text})
@@ -80,7 +85,7 @@ def make_manifest(*, hit: dict[str, Any], target_type: str, target_label: str,
         "artifact": {
             "media_type": "application/vnd.stegverse.discovery-record+json",
             "content_hash": artifact_hash,
-            "size_bytes": len(canonical_bytes(artifact)),
+            "size_bytes": rendered.length,
             "source_pointer": link,
             "custody": "external-pointer",
         },
@@ -169,34 +174,17 @@ def make_discovery_receipt(manifest: dict[str, Any], occurred_at: str) -> dict[s
 def calculate_merkle_root(hashes: list[str]) -> str:
     if not hashes:
         raise ValueError("Merkle batch requires at least one receipt hash")
-    level = [bytes.fromhex(value.split(":", 1)[1]) for value in hashes]
-    while len(level) > 1:
-        if len(level) % 2:
-            level.append(level[-1])
-        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
-    return "sha256:" + level[0].hex()
+    return MerkleTree(hashes).root
 
 
 def merkle_proof(hashes: list[str], index: int) -> list[dict[str, str]]:
-    level = [bytes.fromhex(value.split(":", 1)[1]) for value in hashes]
-    position = index
-    proof: list[dict[str, str]] = []
-    while len(level) > 1:
-        if len(level) % 2:
-            level.append(level[-1])
-        sibling = position - 1 if position % 2 else position + 1
-        proof.append({
-            "position": "left" if sibling < position else "right",
-            "hash": "sha256:" + level[sibling].hex(),
-        })
-        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
-        position //= 2
-    return proof
+    return MerkleTree(hashes).proof(index)
 
 
 def persist_discovery(*, base: pathlib.Path, hit: dict[str, Any], target_type: str,
                       target_label: str, target_row_key: str, keywords: list[str],
-                      run_id: str, captured_at: str | None = None) -> dict[str, str]:
+                      run_id: str, captured_at: str | None = None,
+                      store: SegmentStore | None = None) -> dict[str, str]:
     captured_at = captured_at or utc_now()
     manifest, artifact = make_manifest(
         hit=hit, target_type=target_type, target_label=target_label,
@@ -204,50 +192,77 @@ def persist_discovery(*, base: pathlib.Path, hit: dict[str, Any], target_type: s
         run_id=run_id, executed_commit=os.environ.get("GITHUB_SHA") or None,
     )
     receipt = make_discovery_receipt(manifest, captured_at)
-    root = base / "data" / "evidence"
-    artifact_path = root / "artifacts" / f"{manifest['evidence_id']}.json"
-    manifest_path = root / "manifests" / f"{manifest['evidence_id']}.json"
-    receipt_path = root / "receipts" / f"{receipt['receipt_id']}.json"
-    for path in (artifact_path, manifest_path, receipt_path):
-        path.parent.mkdir(parents=True, exist_ok=True)
-    artifact_path.write_text(json.dumps(artifact, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    receipt_path.write_text(json.dumps(receipt, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    records = (
+        ("artifact", manifest["evidence_id"], artifact),
+        ("manifest", manifest["evidence_id"], manifest),
+        ("receipt", receipt["receipt_id"], receipt),
+    )
+    paths = [_put_record(base, kind, key, record, store) for kind, key, record in records]
     return {
         "evidence_id": manifest["evidence_id"],
-        "manifest_path": manifest_path.relative_to(base).as_posix(),
+        "manifest_path": paths[1],
         "manifest_hash": manifest["manifest_hash"],
-        "receipt_path": receipt_path.relative_to(base).as_posix(),
+        "receipt_path": paths[2],
         "receipt_id": receipt["receipt_id"],
         "receipt_hash": receipt["receipt_hash"],
     }
 
 
-def _latest_previous_batch(merkle_dir: pathlib.Path) -> tuple[str | None, str | None]:
-    candidates: list[tuple[str, str, str]] = []
-    for path in merkle_dir.glob("*.json") if merkle_dir.exists() else []:
-        try:
-            obj = json.loads(path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            continue
-        created_at, batch_hash = obj.get("created_at"), obj.get("batch_hash")
-        if isinstance(created_at, str) and isinstance(batch_hash, str):
-            candidates.append((created_at, path.name, batch_hash))
-    if not candidates:
-        return None, None
-    _, filename, batch_hash = sorted(candidates)[-1]
-    return batch_hash, f"data/evidence/merkle/{filename}"
+def _put_record(base: pathlib.Path, kind: str, key: str, record: dict[str, Any],
+                store: SegmentStore | None) -> str:
+    """Write one evidence record loose, or append it to ``store``; returns its loose path."""
+    if store is not None:
+        return store.put(kind, key, record)
+    path = base / loose_path(kind, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(loose_bytes(record))
+    return path.relative_to(base).as_posix()
+
+
+def make_proof_bundle(batch: dict[str, Any], tree: MerkleTree,
+                      refs: list[dict[str, str]]) -> dict[str, Any]:
+    """Bundle inclusion proofs for ``refs`` (any subset of the batch) as one multiproof.
+
+    Each covered leaf is listed once and every other node needed to recompute the
+    root appears once, however many covered leaves share it. A bundle covering the
+    whole batch needs no nodes at all.
+    """
+    leaves = batch["leaf_receipt_hashes"]
+    positions = {value: index for index, value in enumerate(leaves)}
+    covered = sorted(
+        ({"receipt_id": ref["receipt_id"], "receipt_hash": ref["receipt_hash"],
+          "leaf_index": positions[ref["receipt_hash"]]} for ref in refs),
+        key=lambda item: item["leaf_index"],
+    )
+    bundle: dict[str, Any] = {
+        "bundle_version": BUNDLE_VERSION,
+        "batch_id": batch["batch_id"],
+        "batch_hash": batch["batch_hash"],
+        "merkle_root": batch["merkle_root"],
+        "leaf_count": len(leaves),
+        "leaves": covered,
+        "nodes": tree.multiproof([item["leaf_index"] for item in covered]),
+        "bundle_hash": "",
+    }
+    bundle["bundle_hash"] = sha256_value({k: v for k, v in bundle.items() if k != "bundle_hash"})
+    return bundle
 
 
 def write_run_merkle_batch(base: pathlib.Path, run_id: str,
-                           receipt_refs: list[dict[str, str]]) -> pathlib.Path | None:
+                           receipt_refs: list[dict[str, str]],
+                           store: SegmentStore | None = None,
+                           proof_format: str = "files") -> pathlib.Path | None:
+    if proof_format not in PROOF_FORMATS:
+        raise ValueError(f"unsupported proof format {proof_format!r}")
     if not receipt_refs:
         return None
     ordered = sorted(receipt_refs, key=lambda item: item["receipt_id"])
     leaves = [item["receipt_hash"] for item in ordered]
+    tree = MerkleTree(leaves)
     created_at = utc_now()
     merkle_dir = base / "data" / "evidence" / "merkle"
-    previous_hash, previous_ref = _latest_previous_batch(merkle_dir)
+    head = current_head(base)
+    previous_hash, previous_ref = (head["batch_hash"], head["ref"]) if head else (None, None)
     batch: dict[str, Any] = {
         "batch_version": BATCH_VERSION,
         "batch_id": f"BATCH-FREEDOM-{safe_slug(run_id, 48)}",
@@ -256,31 +271,41 @@ def write_run_merkle_batch(base: pathlib.Path, run_id: str,
         "hash_algorithm": "sha256",
         "leaf_order": "lexicographic-receipt-id",
         "leaf_receipt_hashes": leaves,
-        "merkle_root": calculate_merkle_root(leaves),
+        "merkle_root": tree.root,
         "previous_batch_hash": previous_hash,
         "checkpoint_ref": previous_ref,
         "batch_hash": "",
         "signature": None,
     }
     batch["batch_hash"] = sha256_value({k: v for k, v in batch.items() if k != "batch_hash"})
+    slug = safe_slug(run_id, 64)
+
+    # Proofs land before the batch that the head and accumulator will point at.
+    if proof_format == "bundle":
+        _put_record(base, "bundle", slug, make_proof_bundle(batch, tree, ordered), store)
+    else:
+        for index, (ref, siblings) in enumerate(zip(ordered, tree.proofs())):
+            proof = {
+                "proof_version": PROOF_VERSION,
+                "batch_id": batch["batch_id"],
+                "batch_hash": batch["batch_hash"],
+                "merkle_root": batch["merkle_root"],
+                "receipt_id": ref["receipt_id"],
+                "receipt_hash": ref["receipt_hash"],
+                "leaf_index": index,
+                "siblings": siblings,
+            }
+            proof["proof_hash"] = sha256_value(proof)
+            _put_record(base, "proof", f"{slug}/{safe_slug(ref['receipt_id'], 96)}", proof, store)
+
     merkle_dir.mkdir(parents=True, exist_ok=True)
-    path = merkle_dir / f"{safe_slug(run_id, 64)}.json"
-    path.write_text(json.dumps(batch, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-
-    proofs_dir = base / "data" / "evidence" / "proofs" / safe_slug(run_id, 64)
-    proofs_dir.mkdir(parents=True, exist_ok=True)
-    for index, ref in enumerate(ordered):
-        proof = {
-            "proof_version": "stegverse.merkle-inclusion-proof.v1",
-            "batch_id": batch["batch_id"],
-            "batch_hash": batch["batch_hash"],
-            "merkle_root": batch["merkle_root"],
-            "receipt_id": ref["receipt_id"],
-            "receipt_hash": ref["receipt_hash"],
-            "leaf_index": index,
-            "siblings": merkle_proof(leaves, index),
-        }
-        proof["proof_hash"] = sha256_value(proof)
-        proof_path = proofs_dir / f"{safe_slug(ref['receipt_id'], 96)}.json"
-        proof_path.write_text(json.dumps(proof, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    path = merkle_dir / f"{slug}.json"
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps(batch, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(temp, path)
+    write_head(base, make_head(
+        batch["batch_id"], batch["batch_hash"], path.relative_to(base).as_posix(), created_at,
+        (head["batch_count"] if head else 0) + 1,
+    ))
+    record_batch(base, batch, path.relative_to(base).as_posix())
     return path
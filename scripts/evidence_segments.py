@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Packed, append-only storage for FREE-DOM evidence records.
+
+In packed mode, per-hit artifacts, manifests and receipts and per-receipt inclusion
+proofs are appended as one compact JSON line each to segment files under
+``data/evidence/segments/`` instead of being written as individual files. Each
+writer (one run) owns its own segments, so parallel shards never share a file.
+Every segment has an append-only offset index keyed by record kind and identity.
+
+Records keep their original key order, so exporting a packed record renders the
+exact bytes the loose layout would have written and every hash is unchanged.
+Readers see loose and packed records as one set; a record present in both forms
+must be byte-identical. Packing changes storage only, never evidence standing.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import re
+import sys
+from typing import Any, Iterator
+
+SEGMENT_DIR = pathlib.PurePosixPath("data/evidence/segments")
+KIND_DIRS = {
+    "artifact": "artifacts",
+    "manifest": "manifests",
+    "receipt": "receipts",
+    "proof": "proofs",
+    "bundle": "proof-bundles",
+}
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+
+def loose_bytes(record: dict[str, Any]) -> bytes:
+    """Render a record exactly as the loose evidence layout writes it."""
+    return (json.dumps(record, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def loose_path(kind: str, key: str) -> str:
+    """Base-relative loose path; proof keys are ``<run-slug>/<receipt-slug>``."""
+    return f"data/evidence/{KIND_DIRS[kind]}/{key}.json"
+
+
+class SegmentStore:
+    """Append evidence records for one writer into rolling segment files."""
+
+    def __init__(self, base: pathlib.Path, writer_id: str,
+                 max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES) -> None:
+        self.base = base
+        self.directory = base / SEGMENT_DIR
+        self.prefix = (_SLUG_RE.sub("-", writer_id).strip("-").lower() or "unknown")[:64]
+        self.max_segment_bytes = max_segment_bytes
+        self.records = 0
+        self._number = 0
+        self._segment: Any = None
+        self._index: Any = None
+        self._size = 0
+
+    def __enter__(self) -> "SegmentStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _roll(self) -> None:
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        while True:
+            self._number += 1
+            segment_path = self.directory / f"{self.prefix}-{self._number:04d}.seg"
+            if not segment_path.exists():
+                break
+        self._segment = segment_path.open("ab", buffering=0)
+        self._index = segment_path.with_suffix(".idx").open("ab", buffering=0)
+        self._size = 0
+
+    def put(self, kind: str, key: str, record: dict[str, Any]) -> str:
+        """Append one record and return its base-relative loose path."""
+        if kind not in KIND_DIRS:
+            raise ValueError(f"unknown evidence record kind {kind!r}")
+        path = loose_path(kind, key)
+        line = (json.dumps({"kind": kind, "key": key, "path": path, "record": record},
+                           ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        if self._segment is None or (self._size and self._size + len(line) > self.max_segment_bytes):
+            self._roll()
+        offset = self._size
+        self._segment.write(line)
+        self._size += len(line)
+        entry = {"kind": kind, "key": key, "path": path, "offset": offset, "length": len(line)}
+        self._index.write((json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+        self.records += 1
+        return path
+
+    def close(self) -> None:
+        for handle in (self._segment, self._index):
+            if handle is not None:
+                os.fsync(handle.fileno())
+                handle.close()
+        self._segment = self._index = None
+
+
+def scan_segment(segment_path: pathlib.Path) -> list[dict[str, Any]]:
+    """Rebuild a segment's index entries from the segment itself."""
+    entries: list[dict[str, Any]] = []
+    offset = 0
+    with segment_path.open("rb") as handle:
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            item = json.loads(line)
+            entries.append({"kind": item["kind"], "key": item["key"], "path": item["path"],
+                            "offset": offset, "length": len(line)})
+            offset += len(line)
+    return entries
+
+
+def reindex(base: pathlib.Path) -> int:
+    """Rewrite every segment index from its segment; returns the record count."""
+    total = 0
+    for segment_path in sorted((base / SEGMENT_DIR).glob("*.seg")):
+        entries = scan_segment(segment_path)
+        index_path = segment_path.with_suffix(".idx")
+        temp = index_path.with_name(index_path.name + ".tmp")
+        temp.write_bytes(b"".join(
+            (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8") for entry in entries
+        ))
+        os.replace(temp, index_path)
+        total += len(entries)
+    return total
+
+
+class EvidenceReader:
+    """Read loose and packed evidence records through one interface."""
+
+    def __init__(self, base: pathlib.Path) -> None:
+        self.base = base
+        self._packed: dict[str, tuple[pathlib.Path, dict[str, Any]]] = {}
+        self._segments: dict[pathlib.Path, bytes] = {}
+        for index_path in sorted((base / SEGMENT_DIR).glob("*.idx")):
+            segment_path = index_path.with_suffix(".seg")
+            for line in index_path.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["path"] in self._packed:
+                    raise ValueError(f"{index_path}: duplicate packed record {entry['path']}")
+                self._packed[entry["path"]] = (segment_path, entry)
+
+    def packed_paths(self) -> list[str]:
+        return sorted(self._packed)
+
+    def _read_packed(self, path: str) -> dict[str, Any]:
+        segment_path, entry = self._packed[path]
+        data = self._segments.get(segment_path)
+        if data is None:
+            data = self._segments[segment_path] = segment_path.read_bytes()
+        item = json.loads(data[entry["offset"]:entry["offset"] + entry["length"]])
+        if item.get("kind") != entry["kind"] or item.get("key") != entry["key"] or item.get("path") != path:
+            raise ValueError(f"{segment_path}@{entry['offset']}: index does not match packed record")
+        record = item.get("record")
+        if not isinstance(record, dict):
+            raise ValueError(f"{self.base / path}: root must be an object")
+        return record
+
+    def packed_record(self, path: str) -> dict[str, Any]:
+        """Load a packed record, checking it against any loose copy of the same path."""
+        record = self._read_packed(path)
+        loose = self.base / path
+        if loose.exists() and loose.read_bytes() != loose_bytes(record):
+            raise ValueError(f"{loose}: loose file diverges from its packed record")
+        return record
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        """Load the record at a base-relative loose path, loose file first."""
+        if path in self._packed and not os.path.exists(os.path.join(self.base, path)):
+            return self._read_packed(path)
+        loose = self.base / path
+        if loose.exists():
+            if path in self._packed:
+                self.packed_record(path)
+            data = json.loads(loose.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError(f"{loose}: root must be an object")
+            return data
+        if path in self._packed:
+            return self._read_packed(path)
+        return None
+
+    def exists(self, path: str) -> bool:
+        return path in self._packed or (self.base / path).exists()
+
+    def stamp(self, path: str) -> tuple[int, int] | None:
+        """Return ``(size, mtime_ns)`` of a loose-only record, or ``None`` if it is packed or absent."""
+        if path in self._packed:
+            return None
+        try:
+            stat = os.stat(os.path.join(self.base, path))
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _stored(self, path: str) -> tuple[bytes | None, bytes | None]:
+        """Return the loose file bytes and the packed item bytes of a record, either ``None``."""
+        try:
+            with open(os.path.join(self.base, path), "rb") as handle:
+                loose = handle.read()
+        except FileNotFoundError:
+            loose = None
+        packed = None
+        if path in self._packed:
+            segment_path, entry = self._packed[path]
+            data = self._segments.get(segment_path)
+            if data is None:
+                data = self._segments[segment_path] = segment_path.read_bytes()
+            packed = data[entry["offset"]:entry["offset"] + entry["length"]]
+        return loose, packed
+
+    @staticmethod
+    def _hash(loose: bytes | None, packed: bytes | None) -> str:
+        hasher = hashlib.sha256()
+        if loose is not None:
+            hasher.update(b"loose\0" + loose)
+        if packed is not None:
+            hasher.update(b"packed\0" + packed)
+        return "sha256:" + hasher.hexdigest()
+
+    def digest(self, path: str) -> str:
+        """Hash the stored bytes of a record, loose and packed, without parsing them."""
+        return self._hash(*self._stored(path))
+
+    def load(self, path: str) -> tuple[str, dict[str, Any] | None]:
+        """Return ``(digest(path), get(path))`` from a single read of the stored bytes."""
+        loose, packed = self._stored(path)
+        record = None
+        if packed is not None:
+            record = self._read_packed(path)
+            if loose is not None and loose != loose_bytes(record):
+                raise ValueError(f"{self.base / path}: loose file diverges from its packed record")
+        if loose is not None:
+            record = json.loads(loose.decode("utf-8"))
+            if not isinstance(record, dict):
+                raise ValueError(f"{self.base / path}: root must be an object")
+        return self._hash(loose, packed), record
+
+    def record_paths(self, kind: str, subdir: str = "") -> list[str]:
+        """Return the base-relative loose path of every record of ``kind`` in path order.
+
+        ``subdir`` limits proofs to one run's directory, such as ``"<run-slug>/"``.
+        """
+        directory = self.base / "data" / "evidence" / KIND_DIRS[kind] / subdir
+        pattern = "**/*.json" if kind == "proof" else "*.json"
+        paths = {path.relative_to(self.base).as_posix() for path in directory.glob(pattern)} if directory.exists() else set()
+        prefix = f"data/evidence/{KIND_DIRS[kind]}/{subdir}"
+        paths.update(path for path, (_, entry) in self._packed.items() if entry["kind"] == kind and path.startswith(prefix))
+        return sorted(paths, key=lambda value: value.split("/"))
+
+    def iter_records(self, kind: str) -> Iterator[tuple[pathlib.Path, dict[str, Any]]]:
+        """Yield ``(loose path, record)`` for every record of ``kind`` in path order."""
+        for path in self.record_paths(kind):
+            record = self.get(path)
+            if record is not None:
+                yield self.base / path, record
+
+
+def export_loose(base: pathlib.Path) -> tuple[int, int]:
+    """Write every packed record to its loose path; returns ``(written, unchanged)``."""
+    reader = EvidenceReader(base)
+    written = unchanged = 0
+    for path in reader.packed_paths():
+        data = loose_bytes(reader.packed_record(path))
+        target = base / path
+        if target.exists():
+            unchanged += 1
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(target.name + ".tmp")
+        temp.write_bytes(data)
+        os.replace(temp, target)
+        written += 1
+    return written, unchanged
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base", default=".")
+    parser.add_argument("command", choices=["export", "reindex"],
+                        help="export: write packed records to the loose layout; reindex: rebuild offset indexes")
+    args = parser.parse_args()
+    base = pathlib.Path(args.base).resolve()
+    try:
+        if args.command == "export":
+            written, unchanged = export_loose(base)
+            print(f"ALLOW evidence_segments_exported written={written} unchanged={unchanged}")
+        else:
+            print(f"ALLOW evidence_segments_reindexed records={reindex(base)}")
+    except (ValueError, OSError, json.JSONDecodeError) as exc:
+        print(f"DENY evidence_segments_invalid: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
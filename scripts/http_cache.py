@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Persistent conditional-GET cache for governed public-source retrieval.
+
+Bodies and their ``ETag``/``Last-Modified`` validators are stored on disk keyed by
+URL. A later run revalidates with ``If-None-Match``/``If-Modified-Since`` and reuses
+the stored body on ``304 Not Modified``. The cache is a transport optimization
+only: it is never evidence and is never committed with governed outputs.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from datetime import datetime, timezone
+from typing import Any, Mapping, NamedTuple
+
+CACHE_SCHEMA = "stegverse.free-dom.http-cache-entry.v1"
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    content_type: str
+
+
+def header_value(headers: Mapping[str, Any] | None, name: str) -> str | None:
+    """Read one response header from requests, urllib or plain-dict headers."""
+    if headers is None:
+        return None
+    value = headers.get(name)
+    if value is None and isinstance(headers, dict):
+        wanted = name.lower()
+        value = next((item for key, item in headers.items() if key.lower() == wanted), None)
+    return str(value) if value is not None else None
+
+
+class HttpCache:
+    """Thread-safe on-disk store of validators and bodies, with hit/miss counters."""
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "stored": 0}
+
+    def _paths(self, url: str) -> tuple[pathlib.Path, pathlib.Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _entry(self, url: str) -> dict[str, Any] | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            entry = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url or not body_path.exists():
+            return None
+        return entry
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        entry = self._entry(url)
+        if entry is None:
+            return {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, url: str) -> CachedResponse | None:
+        """Return the stored body for a ``304`` response, or ``None`` if it is gone."""
+        entry = self._entry(url)
+        if entry is None:
+            return None
+        try:
+            body = self._paths(url)[1].read_bytes()
+        except OSError:
+            return None
+        if "sha256:" + hashlib.sha256(body).hexdigest() != entry.get("body_sha256"):
+            return None
+        self._count("hits")
+        return CachedResponse(body=body, content_type=str(entry.get("content_type") or ""))
+
+    def miss(self, url: str, body: bytes, headers: Mapping[str, Any] | None) -> None:
+        """Record a full download and keep it when the server supplied validators."""
+        self._count("misses")
+        etag = header_value(headers, "ETag")
+        last_modified = header_value(headers, "Last-Modified")
+        if not etag and not last_modified:
+            return
+        meta_path, body_path = self._paths(url)
+        entry = {
+            "schema": CACHE_SCHEMA,
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": header_value(headers, "Content-Type") or "",
+            "body_sha256": "sha256:" + hashlib.sha256(body).hexdigest(),
+            "stored_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        body_tmp = body_path.with_name(body_path.name + suffix)
+        meta_tmp = meta_path.with_name(meta_path.name + suffix)
+        body_tmp.write_bytes(body)
+        os.replace(body_tmp, body_path)
+        meta_tmp.write_text(json.dumps(entry, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(meta_tmp, meta_path)
+        self._count("stored")
+
+    def summary(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
@@ -9,9 +9,18 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import heapq
+import json
+import os
 import pathlib
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Iterable
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator
+
+from date_keys import parse_date
 
 
 class CsvSchemaError(RuntimeError):
@@ -25,6 +34,22 @@ REQ_PEOPLE = ["date", "location", "event", "person", "role", "source_urls", "dee
 REQ_UNVER_EVENTS = ["date", "location", "event", "primary_source", "secondary_source", "confidence", "notes", "next_step"]
 REQ_UNVER_PEOPLE = ["person", "possible_event_date", "location", "alleged_association", "source", "confidence", "notes", "next_step"]
 REQ_UNVER_CONN = ["entity_a", "entity_b", "connection_type", "source", "confidence", "notes", "next_step"]
+MASTER_TABLE = "master/master_timeline.csv"
+PEOPLE_TABLE = "master/verified_people_events.csv"
+UNVERIFIED_TABLES = {
+    "unverified/unverified_events.csv": ("event", REQ_UNVER_EVENTS),
+    "unverified/unverified_people.csv": ("person", REQ_UNVER_PEOPLE),
+    "unverified/unverified_connections.csv": ("connection", REQ_UNVER_CONN),
+}
+INDEX_SCHEMA = "stegverse.row-fingerprints.v1"
+JOURNAL_NAME = ".promotion-journal.json"
+JOURNAL_SCHEMA = "stegverse.promotion-journal.v1"
+PENDING_GROUPS = {
+    "updates": ("pending_updates_*.csv", REQ_MASTER),
+    "people": ("pending_people_*.csv", REQ_PEOPLE),
+    "unverified": ("pending_unverified_*.csv", ["type"]),
+}
+UNVERIFIED_REQUIRED = {"event": REQ_UNVER_EVENTS, "person": REQ_UNVER_PEOPLE, "connection": REQ_UNVER_CONN}
 
 
 def is_template(path: pathlib.Path) -> bool:
@@ -35,25 +60,45 @@ def pending_files(directory: pathlib.Path, pattern: str) -> list[pathlib.Path]:
     return [path for path in sorted(directory.glob(pattern)) if not is_template(path)]
 
 
-def read_rows(path: pathlib.Path) -> tuple[list[str], list[dict[str, str]]]:
-    if not path.exists():
-        return [], []
-    with path.open(newline="", encoding="utf-8") as handle:
-        raw = list(csv.reader(handle))
-    if not raw:
-        return [], []
-    header = raw[0]
-    if not header or any(not value.strip() for value in header):
+def _read_header(path: pathlib.Path, reader: Iterator[list[str]]) -> list[str] | None:
+    header = next(reader, None)
+    if not header:
+        return None
+    if any(not value.strip() for value in header):
         raise CsvSchemaError(f"{path.as_posix()}: empty header name")
+    return header
+
+
+def _records(path: pathlib.Path, header: list[str], reader: Iterator[list[str]]) -> Iterator[dict[str, str]]:
     width = len(header)
-    rows: list[dict[str, str]] = []
-    for line_number, row in enumerate(raw[1:], start=2):
+    for line_number, row in enumerate(reader, start=2):
         if len(row) != width:
             raise CsvSchemaError(
                 f"{path.as_posix()}: row {line_number} has {len(row)} columns; expected {width}"
             )
-        rows.append({header[index]: row[index] for index in range(width)})
-    return header, rows
+        yield {header[index]: row[index] for index in range(width)}
+
+
+def read_rows(path: pathlib.Path) -> tuple[list[str], list[dict[str, str]]]:
+    if not path.exists():
+        return [], []
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = _read_header(path, reader)
+        if header is None:
+            return [], []
+        return header, list(_records(path, header, reader))
+
+
+def iter_rows(path: pathlib.Path) -> Iterator[dict[str, str]]:
+    """Yield ``path``'s rows one at a time, with the same schema checks as ``read_rows``."""
+    if not path.exists():
+        return
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = _read_header(path, reader)
+        if header is not None:
+            yield from _records(path, header, reader)
 
 
 def require_headers(path: pathlib.Path, headers: Iterable[str], required: Iterable[str]) -> None:
@@ -68,35 +113,20 @@ def read_dicts(path: pathlib.Path) -> list[dict[str, str]]:
     return rows
 
 
-def write_dicts(path: pathlib.Path, rows: list[dict[str, str]], headers: list[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+def _write_csv(path: pathlib.Path, rows: Iterable[dict[str, str]], headers: list[str]) -> None:
     with path.open("w", newline="", encoding="utf-8") as handle:
         writer = csv.DictWriter(handle, fieldnames=headers)
         writer.writeheader()
         for row in rows:
             writer.writerow({header: row.get(header, "") for header in headers})
-
-
-def ensure_file(path: pathlib.Path, headers: list[str]) -> None:
-    if not path.exists():
-        write_dicts(path, [], headers)
+        handle.flush()
+        os.fsync(handle.fileno())
 
 
 def normalize(row: dict[str, str], headers: list[str]) -> dict[str, str]:
     return {header: " ".join((row.get(header, "") or "").strip().split()) for header in headers}
 
 
-def parse_date(value: str) -> tuple:
-    value = value.split("–", 1)[0].strip()
-    for fmt in ("%Y-%m-%d", "%Y-%m", "%Y"):
-        try:
-            parsed = datetime.strptime(value, fmt)
-            return (0, parsed.year, parsed.month, parsed.day, value)
-        except ValueError:
-            continue
-    return (1, 9999, 12, 31, value or "~")
-
-
 def dedupe(rows: list[dict[str, str]], headers: list[str]) -> list[dict[str, str]]:
     output: list[dict[str, str]] = []
     seen: set[tuple[str, ...]] = set()
@@ -109,112 +139,528 @@ def dedupe(rows: list[dict[str, str]], headers: list[str]) -> list[dict[str, str
     return output
 
 
-def validate_pending(data: pathlib.Path) -> list[pathlib.Path]:
+def check_pending_file(path: pathlib.Path, group: str) -> bool:
+    """Stream one pending batch through its schema checks; returns whether it holds any row."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = _read_header(path, reader) or []
+        require_headers(path, header, PENDING_GROUPS[group][1])
+        has_rows = False
+        checked_kinds: set[str] = set()
+        for row in _records(path, header, reader):
+            has_rows = True
+            if group != "unverified":
+                continue
+            kind = (row.get("type", "") or "").strip().lower()
+            required = UNVERIFIED_REQUIRED.get(kind)
+            if required is not None:
+                if kind not in checked_kinds:
+                    require_headers(path, header, required)
+                    checked_kinds.add(kind)
+            elif any((value or "").strip() for value in row.values()):
+                raise CsvSchemaError(f"{path.as_posix()}: unknown type {kind!r}")
+    return has_rows
+
+
+def _check_task(task: tuple[pathlib.Path, str]) -> tuple[bool, str | None]:
+    try:
+        return check_pending_file(*task), None
+    except CsvSchemaError as exc:
+        return False, str(exc)
+
+
+def validate_pending(data: pathlib.Path, jobs: int = 1) -> list[pathlib.Path]:
+    """Check every pending batch and return those holding rows, in group then file order.
+
+    Files are independent, so with ``jobs`` > 1 they are checked in a process
+    pool. Every file is checked either way, and all schema errors are raised
+    together in file order.
+    """
     pending = data / "pending"
-    accepted: list[pathlib.Path] = []
+    tasks = [(path, group) for group, (pattern, _) in PENDING_GROUPS.items() for path in pending_files(pending, pattern)]
+    if jobs > 1 and len(tasks) > 1:
+        workers = min(jobs, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_check_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        results = [_check_task(task) for task in tasks]
+    errors = [error for _, error in results if error is not None]
+    if errors:
+        raise CsvSchemaError("\n".join(errors))
+    return [path for (path, _), (has_rows, _) in zip(tasks, results) if has_rows]
+
+
+def master_key(row: dict[str, str]) -> tuple:
+    return (parse_date(row["date"]), row["location"].lower(), row["event"].lower())
+
+
+def people_key(row: dict[str, str]) -> tuple:
+    return (parse_date(row["date"]), row["location"].lower(), row["event"].lower(), row["person"].lower())
+
+
+def fingerprint(row: dict[str, str], headers: list[str]) -> bytes:
+    """Identify a normalized row; two rows share a fingerprint exactly when ``dedupe`` merges them."""
+    encoded = json.dumps([row[header] for header in headers], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).digest()[:16]
+
+
+def _file_digest(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return "sha256:" + digest.hexdigest()
+
+
+def _ends_with_newline(path: pathlib.Path) -> bool:
+    with path.open("rb") as handle:
+        if handle.seek(0, os.SEEK_END) == 0:
+            return False
+        handle.seek(-1, os.SEEK_END)
+        return handle.read(1) == b"\n"
+
+
+def index_path(table: pathlib.Path) -> pathlib.Path:
+    return table.parents[1] / "cache" / "fingerprints" / f"{table.parent.name}-{table.stem}.sqlite"
+
+
+class RowIndex:
+    """Persisted fingerprints of one canonical table's normalized rows.
+
+    The index lives under ``data/cache/fingerprints/`` and is trusted only while
+    the table's bytes are unchanged: a matching ``(size, mtime_ns)`` stamp is
+    trusted, otherwise the table is hashed and compared, and a changed table is
+    rescanned. ``clean`` records that rewriting the table would not change it:
+    the header is exact, the file ends with a newline and every row is
+    normalized, unique and, when ``key`` is given, in key order. Promotions use
+    it to append or skip the rewrite.
+    """
+
+    def __init__(self, table: pathlib.Path, headers: list[str], key: Callable[[dict[str, str]], tuple] | None = None) -> None:
+        self.table, self.headers, self.key = table, headers, key
+        path = index_path(table)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS rows (fingerprint BLOB PRIMARY KEY) WITHOUT ROWID;"
+        )
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'state'").fetchone()
+        try:
+            self.state = json.loads(row[0]) if row else {}
+        except json.JSONDecodeError:
+            self.state = {}
+        try:
+            if not self._current():
+                self.rebuild()
+        except Exception:
+            self.db.close()
+            raise
+
+    def __enter__(self) -> RowIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    @property
+    def clean(self) -> bool:
+        return bool(self.state.get("clean"))
+
+    def _stamp(self) -> list[int]:
+        stat = self.table.stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _current(self) -> bool:
+        expected = {"schema": INDEX_SCHEMA, "headers": self.headers, "sorted": self.key is not None}
+        if any(self.state.get(name) != value for name, value in expected.items()) or not self.table.exists():
+            return False
+        stamp = self._stamp()
+        if self.state.get("stamp") == stamp:
+            return True
+        if self.state.get("digest") != _file_digest(self.table):
+            return False
+        self._save(dict(self.state, stamp=stamp))
+        return True
+
+    def _save(self, state: dict[str, Any]) -> None:
+        self.state = state
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('state', ?)", (json.dumps(state, sort_keys=True),))
+
+    def rebuild(self) -> None:
+        """Rescan the table, replacing every fingerprint."""
+        clean = True
+        count = 0
+        previous: tuple | None = None
+
+        def scan() -> Iterator[tuple[bytes]]:
+            nonlocal clean, count, previous
+            for row in iter_rows(self.table):
+                normalized = normalize(row, self.headers)
+                clean = clean and row == normalized
+                if self.key is not None:
+                    row_key = self.key(normalized)
+                    clean = clean and (previous is None or previous <= row_key)
+                    previous = row_key
+                count += 1
+                yield (fingerprint(normalized, self.headers),)
+
+        with self.db:
+            self.db.execute("DELETE FROM rows")
+            if self.table.exists():
+                with self.table.open(newline="", encoding="utf-8") as handle:
+                    clean = next(csv.reader(handle), []) == self.headers
+                # Appends land right after the last byte, so it must end a line.
+                clean = clean and _ends_with_newline(self.table)
+                inserted = self.db.executemany("INSERT OR IGNORE INTO rows (fingerprint) VALUES (?)", scan()).rowcount
+                clean = clean and inserted == count
+        self._save({
+            "schema": INDEX_SCHEMA, "headers": self.headers, "sorted": self.key is not None, "clean": clean and self.table.exists(),
+            "stamp": self._stamp() if self.table.exists() else None,
+            "digest": _file_digest(self.table) if self.table.exists() else None,
+        })
+
+    def known(self, fingerprints: list[bytes]) -> set[bytes]:
+        found: set[bytes] = set()
+        for start in range(0, len(fingerprints), 500):
+            chunk = fingerprints[start:start + 500]
+            query = f"SELECT fingerprint FROM rows WHERE fingerprint IN ({','.join('?' * len(chunk))})"
+            found.update(value for (value,) in self.db.execute(query, chunk))
+        return found
+
+    def fresh(self, rows: list[dict[str, str]]) -> list[tuple[bytes, dict[str, str]]]:
+        """Return the normalized ``rows`` not yet in the table, first occurrence only, in input order."""
+        fingerprints = [fingerprint(row, self.headers) for row in rows]
+        seen = self.known(fingerprints)
+        output = []
+        for value, row in zip(fingerprints, rows):
+            if value not in seen:
+                seen.add(value)
+                output.append((value, row))
+        return output
+
+    def commit(self, added: Iterable[bytes]) -> None:
+        """Record fingerprints just written to the table, which is now clean."""
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO rows (fingerprint) VALUES (?)", ((value,) for value in added))
+        self._save(dict(self.state, clean=True, stamp=self._stamp(), digest=_file_digest(self.table)))
+
+
+class PromotionJournal:
+    """Stage a promotion's canonical writes and archive moves, then apply them as one group.
+
+    Each target's new content is written to a ``.staged`` sibling and kept only
+    if its digest differs from the current file; appends to clean tables stage
+    just the new bytes. ``commit`` fsyncs the staged files, records every
+    replacement, append and archive move in ``data/.promotion-journal.json``,
+    then applies them. Applying is idempotent, so a promotion interrupted after
+    the journal is written is rolled forward by ``recover``; one interrupted
+    before that leaves only staged files, which ``recover`` discards.
+    """
+
+    def __init__(self, data: pathlib.Path) -> None:
+        self.data = data
+        self.path = data / JOURNAL_NAME
+        self.replace: list[dict[str, str]] = []
+        self.append: list[dict[str, Any]] = []
+        self.move: list[dict[str, str]] = []
+        self._indexes: list[tuple[RowIndex, list[bytes]]] = []
+
+    def __enter__(self) -> PromotionJournal:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        for index, _ in self._indexes:
+            index.close()
+        self._indexes = []
+        if not self.path.exists():
+            self._discard_staged()
+
+    def _relative(self, path: pathlib.Path) -> str:
+        return path.relative_to(self.data).as_posix()
+
+    def _staged(self, target: pathlib.Path) -> pathlib.Path:
+        return target.with_name(target.name + ".staged")
+
+    def _discard_staged(self) -> None:
+        for directory in ("master", "unverified"):
+            for path in (self.data / directory).glob("*.staged"):
+                path.unlink()
+
+    def track(self, index: RowIndex, added: list[bytes]) -> None:
+        """Commit ``added`` to ``index`` once the journal has been applied."""
+        self._indexes.append((index, added))
+
+    def stage_rows(self, target: pathlib.Path, rows: Iterable[dict[str, str]], headers: list[str]) -> bool:
+        """Stage ``target``'s full new content; returns whether it differs from the current file."""
+        staged = self._staged(target)
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        _write_csv(staged, rows, headers)
+        digest = _file_digest(staged)
+        if target.exists() and target.stat().st_size == staged.stat().st_size and _file_digest(target) == digest:
+            staged.unlink()
+            return False
+        self.replace.append({"target": self._relative(target), "staged": self._relative(staged), "digest": digest})
+        return True
+
+    def stage_append(self, target: pathlib.Path, rows: list[dict[str, str]], headers: list[str]) -> None:
+        staged = self._staged(target)
+        with staged.open("w", newline="", encoding="utf-8") as handle:
+            csv.DictWriter(handle, fieldnames=headers).writerows(rows)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.append.append({
+            "target": self._relative(target), "staged": self._relative(staged), "offset": target.stat().st_size,
+        })
+
+    def stage_move(self, source: pathlib.Path, target: pathlib.Path) -> None:
+        self.move.append({"source": self._relative(source), "target": self._relative(target)})
+
+    def commit(self) -> list[str]:
+        """Write the journal, apply it and return the canonical files it changed."""
+        changed = [entry["target"] for entry in self.replace + self.append]
+        if changed or self.move:
+            temp = self.path.with_name(self.path.name + ".tmp")
+            with temp.open("w", encoding="utf-8") as handle:
+                json.dump({"schema": JOURNAL_SCHEMA, "replace": self.replace, "append": self.append, "move": self.move},
+                          handle, indent=2, sort_keys=True)
+                handle.write("\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp, self.path)
+            apply_journal(self.data)
+        for index, added in self._indexes:
+            if index.table.exists():
+                index.commit(added)
+        return changed
+
+    def recover(self) -> bool:
+        """Roll an interrupted promotion forward; returns whether there was one."""
+        if self.path.exists():
+            apply_journal(self.data)
+            return True
+        self._discard_staged()
+        return False
+
+
+def apply_journal(data: pathlib.Path) -> None:
+    """Apply ``data/.promotion-journal.json``, then remove it. Safe to repeat after a crash."""
+    path = data / JOURNAL_NAME
+    journal = json.loads(path.read_text(encoding="utf-8"))
+    if journal.get("schema") != JOURNAL_SCHEMA:
+        raise CsvSchemaError(f"{path.as_posix()}: unknown promotion journal schema")
+    for entry in journal["replace"]:
+        staged = data / entry["staged"]
+        if staged.exists():
+            os.replace(staged, data / entry["target"])
+    for entry in journal["append"]:
+        staged = data / entry["staged"]
+        if staged.exists():
+            with (data / entry["target"]).open("r+b") as handle:
+                handle.truncate(entry["offset"])
+                handle.seek(entry["offset"])
+                handle.write(staged.read_bytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+            staged.unlink()
+    for entry in journal["move"]:
+        source, target = data / entry["source"], data / entry["target"]
+        if source.exists() and not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            source.replace(target)
+    path.unlink()
+
+
+class UnsortedCanonicalError(RuntimeError):
+    pass
 
-    for path in pending_files(pending, "pending_updates_*.csv"):
-        headers, rows = read_rows(path)
-        require_headers(path, headers, REQ_MASTER)
-        if rows:
-            accepted.append(path)
 
-    for path in pending_files(pending, "pending_people_*.csv"):
-        headers, rows = read_rows(path)
-        require_headers(path, headers, REQ_PEOPLE)
-        if rows:
-            accepted.append(path)
+def _sorted_stream(path: pathlib.Path, headers: list[str], key: Callable[[dict[str, str]], tuple]) -> Iterator[tuple[tuple, dict[str, str]]]:
+    previous: tuple | None = None
+    for row in iter_rows(path):
+        normalized = normalize(row, headers)
+        row_key = key(normalized)
+        if previous is not None and row_key < previous:
+            raise UnsortedCanonicalError(f"{path.as_posix()}: rows are not in canonical order")
+        previous = row_key
+        yield row_key, normalized
 
-    for path in pending_files(pending, "pending_unverified_*.csv"):
-        headers, rows = read_rows(path)
-        require_headers(path, headers, ["type"])
-        for row in rows:
-            kind = (row.get("type", "") or "").strip().lower()
-            if kind == "event":
-                require_headers(path, headers, REQ_UNVER_EVENTS)
-            elif kind == "person":
-                require_headers(path, headers, REQ_UNVER_PEOPLE)
-            elif kind == "connection":
-                require_headers(path, headers, REQ_UNVER_CONN)
-            elif any((value or "").strip() for value in row.values()):
-                raise CsvSchemaError(f"{path.as_posix()}: unknown type {kind!r}")
-        if rows:
-            accepted.append(path)
 
-    return accepted
+def _dedupe_sorted(rows: Iterable[tuple[tuple, dict[str, str]]], headers: list[str]) -> Iterator[dict[str, str]]:
+    # Identical rows share a sort key, so only the current key's rows need remembering.
+    current: tuple | None = None
+    seen: set[tuple[str, ...]] = set()
+    for row_key, row in rows:
+        if row_key != current:
+            current, seen = row_key, set()
+        values = tuple(row[header] for header in headers)
+        if values not in seen:
+            seen.add(values)
+            yield row
 
 
-def merge_master(data: pathlib.Path) -> list[pathlib.Path]:
-    destination = data / "master" / "master_timeline.csv"
-    ensure_file(destination, ALL_MASTER)
-    rows = read_dicts(destination)
-    inputs = pending_files(data / "pending", "pending_updates_*.csv")
+def pending_rows(inputs: list[pathlib.Path], headers: list[str], pending_field: str) -> list[dict[str, str]]:
+    rows = []
     for path in inputs:
-        _, chunk = read_rows(path)
-        for row in chunk:
-            normalized = normalize(row, ALL_MASTER)
-            normalized["deep_search_event"] = normalized["deep_search_event"] or "pending"
+        for row in iter_rows(path):
+            normalized = normalize(row, headers)
+            normalized[pending_field] = normalized[pending_field] or "pending"
             rows.append(normalized)
-    rows = dedupe(rows, ALL_MASTER)
-    rows.sort(key=lambda row: (parse_date(row["date"]), row["location"].lower(), row["event"].lower()))
-    write_dicts(destination, rows, ALL_MASTER)
-    return inputs
+    return rows
 
 
-def merge_people(data: pathlib.Path) -> list[pathlib.Path]:
-    destination = data / "master" / "verified_people_events.csv"
-    ensure_file(destination, REQ_PEOPLE)
-    rows = read_dicts(destination)
-    inputs = pending_files(data / "pending", "pending_people_*.csv")
-    for path in inputs:
-        _, chunk = read_rows(path)
-        for row in chunk:
-            normalized = normalize(row, REQ_PEOPLE)
-            normalized["deep_search_person"] = normalized["deep_search_person"] or "pending"
-            rows.append(normalized)
-    rows = dedupe(rows, REQ_PEOPLE)
-    rows.sort(key=lambda row: (parse_date(row["date"]), row["location"].lower(), row["event"].lower(), row["person"].lower()))
-    write_dicts(destination, rows, REQ_PEOPLE)
-    return inputs
+def _typed_rows(path: pathlib.Path) -> Iterator[tuple[int, str, dict[str, str]]]:
+    """Yield ``(line, table, normalized row)`` for each typed row of an unverified pending file."""
+    for line, row in enumerate(iter_rows(path), start=2):
+        kind = (row.get("type", "") or "").strip().lower()
+        for name, (row_kind, headers) in UNVERIFIED_TABLES.items():
+            if kind == row_kind:
+                yield line, name, normalize(row, headers)
 
 
-def merge_unverified(data: pathlib.Path) -> list[pathlib.Path]:
-    event_path = data / "unverified" / "unverified_events.csv"
-    people_path = data / "unverified" / "unverified_people.csv"
-    connection_path = data / "unverified" / "unverified_connections.csv"
-    ensure_file(event_path, REQ_UNVER_EVENTS)
-    ensure_file(people_path, REQ_UNVER_PEOPLE)
-    ensure_file(connection_path, REQ_UNVER_CONN)
-    events = read_dicts(event_path)
-    people = read_dicts(people_path)
-    connections = read_dicts(connection_path)
-    inputs = pending_files(data / "pending", "pending_unverified_*.csv")
+def unverified_rows(inputs: list[pathlib.Path]) -> dict[str, list[dict[str, str]]]:
+    tables: dict[str, list[dict[str, str]]] = {name: [] for name in UNVERIFIED_TABLES}
     for path in inputs:
-        _, rows = read_rows(path)
-        for row in rows:
-            kind = (row.get("type", "") or "").strip().lower()
-            if kind == "event":
-                events.append(normalize(row, REQ_UNVER_EVENTS))
-            elif kind == "person":
-                people.append(normalize(row, REQ_UNVER_PEOPLE))
-            elif kind == "connection":
-                connections.append(normalize(row, REQ_UNVER_CONN))
-    events = dedupe(events, REQ_UNVER_EVENTS)
-    people = dedupe(people, REQ_UNVER_PEOPLE)
-    connections = dedupe(connections, REQ_UNVER_CONN)
-    write_dicts(event_path, events, REQ_UNVER_EVENTS)
-    write_dicts(people_path, people, REQ_UNVER_PEOPLE)
-    write_dicts(connection_path, connections, REQ_UNVER_CONN)
+        for _, name, row in _typed_rows(path):
+            tables[name].append(row)
+    return tables
+
+
+def promote(
+    journal: PromotionJournal,
+    destination: pathlib.Path,
+    inputs: list[pathlib.Path],
+    headers: list[str],
+    key: Callable[[dict[str, str]], tuple],
+    pending_field: str,
+) -> None:
+    """Stage pending rows merged into an already-sorted canonical table in one streaming pass.
+
+    Rows the table's fingerprint index already holds are dropped first, and a
+    clean table that gains no rows is not staged. The remaining rows are sorted
+    and the canonical file is read row by row and merged with them into the
+    staged file. Rows that compare equal keep canonical rows first, then
+    incoming rows in input order, so the result matches a stable sort of the
+    deduplicated union. A canonical file that is out of order is rebuilt with a
+    full in-memory sort instead. A missing canonical file is created, with just
+    its header when no rows arrive.
+    """
+    index = RowIndex(destination, headers, key)
+    fresh = index.fresh(pending_rows(inputs, headers, pending_field))
+    journal.track(index, [value for value, _ in fresh])
+    if not fresh and index.clean:
+        return
+    incoming = sorted(((key(row), row) for _, row in fresh), key=itemgetter(0))
+    try:
+        merged = heapq.merge(_sorted_stream(destination, headers, key), incoming, key=itemgetter(0))
+        journal.stage_rows(destination, _dedupe_sorted(merged, headers), headers)
+    except UnsortedCanonicalError:
+        rows = dedupe(read_dicts(destination) + [row for _, row in incoming], headers)
+        rows.sort(key=key)
+        journal.stage_rows(destination, rows, headers)
+
+
+def append_unique(journal: PromotionJournal, destination: pathlib.Path, rows: list[dict[str, str]], headers: list[str]) -> None:
+    """Stage rows not already in an unordered canonical table; a clean table is appended to.
+
+    A missing table is created, with just its header when no rows arrive.
+    """
+    index = RowIndex(destination, headers)
+    fresh = index.fresh(rows)
+    journal.track(index, [value for value, _ in fresh])
+    if index.clean:
+        if fresh:
+            journal.stage_append(destination, [row for _, row in fresh], headers)
+    else:
+        journal.stage_rows(destination, dedupe(read_dicts(destination) + [row for _, row in fresh], headers), headers)
+
+
+def _promotion(data: pathlib.Path, journal: PromotionJournal | None, stage: Callable[[PromotionJournal], list[pathlib.Path]]) -> list[pathlib.Path]:
+    if journal is not None:
+        return stage(journal)
+    with PromotionJournal(data) as own:
+        inputs = stage(own)
+        own.commit()
     return inputs
 
 
-def archive_files(directory: pathlib.Path, files: list[pathlib.Path]) -> None:
+def merge_master(data: pathlib.Path, journal: PromotionJournal | None = None) -> list[pathlib.Path]:
+    def stage(journal: PromotionJournal) -> list[pathlib.Path]:
+        inputs = pending_files(data / "pending", "pending_updates_*.csv")
+        promote(journal, data / MASTER_TABLE, inputs, ALL_MASTER, master_key, "deep_search_event")
+        return inputs
+
+    return _promotion(data, journal, stage)
+
+
+def merge_people(data: pathlib.Path, journal: PromotionJournal | None = None) -> list[pathlib.Path]:
+    def stage(journal: PromotionJournal) -> list[pathlib.Path]:
+        inputs = pending_files(data / "pending", "pending_people_*.csv")
+        promote(journal, data / PEOPLE_TABLE, inputs, REQ_PEOPLE, people_key, "deep_search_person")
+        return inputs
+
+    return _promotion(data, journal, stage)
+
+
+def merge_unverified(data: pathlib.Path, journal: PromotionJournal | None = None) -> list[pathlib.Path]:
+    def stage(journal: PromotionJournal) -> list[pathlib.Path]:
+        inputs = pending_files(data / "pending", "pending_unverified_*.csv")
+        incoming = unverified_rows(inputs)
+        for name, (_, headers) in UNVERIFIED_TABLES.items():
+            append_unique(journal, data / name, incoming[name], headers)
+        return inputs
+
+    return _promotion(data, journal, stage)
+
+
+def already_canonical(data: pathlib.Path) -> dict[pathlib.Path, list[int]]:
+    """Return, per pending file, the line numbers of rows its canonical table already holds.
+
+    Lookups go through the fingerprint indexes; a canonical table is scanned only
+    when its index is missing or stale. Only promotions report this, so
+    validation-only runs never write index state.
+    """
+    pending = data / "pending"
+    incoming: dict[str, dict[pathlib.Path, list[tuple[int, dict[str, str]]]]] = {name: {} for name in UNVERIFIED_TABLES}
+    for table, pattern, headers, field in (
+        (MASTER_TABLE, "pending_updates_*.csv", ALL_MASTER, "deep_search_event"),
+        (PEOPLE_TABLE, "pending_people_*.csv", REQ_PEOPLE, "deep_search_person"),
+    ):
+        incoming[table] = {
+            path: list(enumerate(pending_rows([path], headers, field), start=2))
+            for path in pending_files(pending, pattern)
+        }
+    for path in pending_files(pending, "pending_unverified_*.csv"):
+        for line, name, row in _typed_rows(path):
+            incoming[name].setdefault(path, []).append((line, row))
+
+    keys = {MASTER_TABLE: (ALL_MASTER, master_key), PEOPLE_TABLE: (REQ_PEOPLE, people_key)}
+    keys.update((name, (headers, None)) for name, (_, headers) in UNVERIFIED_TABLES.items())
+    matches: dict[pathlib.Path, list[int]] = {}
+    for table, files in incoming.items():
+        if not files or not (data / table).exists():
+            continue
+        headers, key = keys[table]
+        with RowIndex(data / table, headers, key) as index:
+            for path, rows in files.items():
+                fingerprints = [fingerprint(row, headers) for _, row in rows]
+                known = index.known(fingerprints)
+                lines = [line for (line, _), value in zip(rows, fingerprints) if value in known]
+                if lines:
+                    matches.setdefault(path, []).extend(lines)
+    return {path: sorted(lines) for path, lines in matches.items()}
+
+
+def archive_files(journal: PromotionJournal, directory: pathlib.Path, files: list[pathlib.Path]) -> None:
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    directory.mkdir(parents=True, exist_ok=True)
     for path in files:
         if is_template(path):
             raise CsvSchemaError(f"refusing to archive template input: {path.as_posix()}")
-        path.replace(directory / f"{path.stem}.processed_{timestamp}{path.suffix}")
+        journal.stage_move(path, directory / f"{path.stem}.processed_{timestamp}{path.suffix}")
 
 
 def main() -> int:
@@ -225,17 +671,27 @@ def main() -> int:
         action="store_true",
         help="Explicitly authorize pending-to-canonical mutation for this invocation",
     )
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for pending batch validation")
     args = parser.parse_args()
     data = pathlib.Path(args.base).resolve() / "data"
 
     try:
-        accepted = validate_pending(data)
+        accepted = validate_pending(data, jobs=args.jobs)
         print(f"Validated {len(accepted)} non-template pending batch(es).")
+        if (data / JOURNAL_NAME).exists():
+            print(f"Interrupted promotion pending in data/{JOURNAL_NAME}; the next authorized promotion rolls it forward.")
         if not args.allow_master_promotion:
             print("DENY promotion_authority_missing; validation completed without mutation.")
             return 0
-        files = merge_master(data) + merge_people(data) + merge_unverified(data)
-        archive_files(data / "archive", files)
+        with PromotionJournal(data) as journal:
+            if journal.recover():
+                print("Rolled forward an interrupted promotion from its journal.")
+            for path, lines in already_canonical(data).items():
+                print(f"{path.name}: {len(lines)} row(s) already canonical (lines {', '.join(map(str, lines))})")
+            files = merge_master(data, journal) + merge_people(data, journal) + merge_unverified(data, journal)
+            archive_files(journal, data / "archive", files)
+            changed = journal.commit()
+        print(f"Promoted {len(files)} pending batch(es); {len(changed)} canonical file(s) changed.")
         print("ALLOW explicit_pending_promotion_completed")
         return 0
     except CsvSchemaError as exc:
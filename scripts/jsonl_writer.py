@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Buffered append-only JSONL writer for agent run logs and research ledgers.
+
+Records are serialized as they arrive and written in batches through one file
+handle, so a run costs one ``write`` per flush instead of an open/append/close per
+record. Flushes happen every ``flush_every`` records, at explicit ``flush()``
+points, and on ``close()``, which also fsyncs. Closing through the context manager
+finalizes the file even when the run fails. A torn final line left by a killed
+process is trimmed before the next append so every line stays one JSON record.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+from typing import Any, BinaryIO
+
+DEFAULT_FLUSH_EVERY = 256
+_TAIL_CHUNK = 4096
+
+
+def trim_torn_tail(path: pathlib.Path) -> int:
+    """Cut an unterminated final line from ``path`` and return the bytes removed."""
+    try:
+        handle = path.open("r+b")
+    except FileNotFoundError:
+        return 0
+    with handle:
+        end = handle.seek(0, os.SEEK_END)
+        if end == 0:
+            return 0
+        handle.seek(end - 1)
+        if handle.read(1) == b"\n":
+            return 0
+        position = end
+        keep = 0
+        while position > 0:
+            step = min(_TAIL_CHUNK, position)
+            position -= step
+            handle.seek(position)
+            newline = handle.read(step).rfind(b"\n")
+            if newline >= 0:
+                keep = position + newline + 1
+                break
+        handle.truncate(keep)
+        return end - keep
+
+
+class JsonlWriter:
+    def __init__(
+        self,
+        path: pathlib.Path,
+        *,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        ensure_ascii: bool = False,
+        sort_keys: bool = True,
+    ) -> None:
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.ensure_ascii = ensure_ascii
+        self.sort_keys = sort_keys
+        self.records = 0
+        self._pending: list[str] = []
+        self._handle: BinaryIO | None = None
+        self._closed = False
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _open(self) -> BinaryIO:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            trim_torn_tail(self.path)
+            self._handle = self.path.open("ab", buffering=0)
+        return self._handle
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self._closed:
+            raise ValueError(f"{self.path}: write to closed JSONL writer")
+        self._pending.append(json.dumps(record, ensure_ascii=self.ensure_ascii, sort_keys=self.sort_keys) + "\n")
+        self.records += 1
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self, *, durable: bool = False) -> None:
+        """Write buffered records; with ``durable`` also fsync them to disk."""
+        if self._pending:
+            data = "".join(self._pending).encode("utf-8")
+            self._pending.clear()
+            handle = self._open()
+            view = memoryview(data)
+            while view:
+                view = view[handle.write(view):]
+        if durable and self._handle is not None:
+            os.fsync(self._handle.fileno())
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.flush(durable=True)
+        finally:
+            self._closed = True
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Aho-Corasick multi-pattern matching for governed keyword sweeps.
+
+One automaton is compiled per run from every target's keywords. Each document is
+scanned once and reports the targets whose keywords are all present as substrings,
+which is the same rule the agents apply one target at a time.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Sequence
+
+
+class KeywordAutomaton:
+    """Report which of a fixed set of patterns occur anywhere in a text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: list[str] = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self._goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(pattern_id)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                # BFS order guarantees the failure state's outputs are complete.
+                outputs[nxt].extend(outputs[self._fail[nxt]])
+        self._outputs = [tuple(dict.fromkeys(found)) for found in outputs]
+
+    def scan(self, text: str) -> set[int]:
+        """Return the IDs of patterns found in ``text``."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class TargetMatcher:
+    """Match documents against many targets, each requiring all of its keywords."""
+
+    def __init__(self, targets: Sequence[Sequence[str]]) -> None:
+        keyword_sets = [
+            list(dict.fromkeys(keyword.lower() for keyword in keywords if keyword)) for keywords in targets
+        ]
+        self.automaton = KeywordAutomaton(keyword for keywords in keyword_sets for keyword in keywords)
+        pattern_ids = {pattern: index for index, pattern in enumerate(self.automaton.patterns)}
+        self._required = [len(keywords) for keywords in keyword_sets]
+        self._always = [index for index, keywords in enumerate(keyword_sets) if not keywords]
+        self._targets_for: list[list[int]] = [[] for _ in self.automaton.patterns]
+        for index, keywords in enumerate(keyword_sets):
+            for keyword in keywords:
+                self._targets_for[pattern_ids[keyword]].append(index)
+
+    def match(self, text: str) -> list[int]:
+        """Return ascending indices of targets whose keywords all occur in ``text``."""
+        counts: dict[int, int] = {}
+        for pattern_id in self.automaton.scan(text):
+            for target in self._targets_for[pattern_id]:
+                counts[target] = counts.get(target, 0) + 1
+        matched = [target for target, count in counts.items() if count == self._required[target]]
+        return sorted(matched + self._always)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Per-run inverted keyword index over fetched feed entries and page anchors.
+
+Lookups keep the search agent's original matching rule: a document matches when
+every keyword occurs as a substring of its lowered text. Search keywords are ASCII
+alphanumeric runs, so any occurrence lies inside one alphanumeric token of the
+document; a keyword therefore resolves to the union of postings for the vocabulary
+tokens that contain it, and a target resolves to the intersection of its keywords.
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class KeywordIndex:
+    def __init__(self) -> None:
+        self._texts: list[str] = []
+        self._postings: dict[str, list[int]] = {}
+        self._resolved: dict[str, frozenset[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, text: str) -> int:
+        """Index one lowered document text and return its document ID."""
+        doc_id = len(self._texts)
+        self._texts.append(text)
+        for token in set(TOKEN_RE.findall(text)):
+            self._postings.setdefault(token, []).append(doc_id)
+        self._resolved.clear()
+        return doc_id
+
+    def _containing(self, keyword: str) -> frozenset[int]:
+        resolved = self._resolved.get(keyword)
+        if resolved is None:
+            if TOKEN_RE.fullmatch(keyword):
+                matched: set[int] = set()
+                for token, posting in self._postings.items():
+                    if keyword in token:
+                        matched.update(posting)
+            else:
+                # Punctuation can span tokens; fall back to a direct substring scan.
+                matched = {doc_id for doc_id, text in enumerate(self._texts) if keyword in text}
+            resolved = self._resolved[keyword] = frozenset(matched)
+        return resolved
+
+    def search(self, keywords: Iterable[str]) -> list[int]:
+        """Return ascending IDs of documents containing every keyword."""
+        required = list(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+        if not required:
+            return list(range(len(self._texts)))
+        postings = sorted((self._containing(keyword) for keyword in required), key=len)
+        matched = set(postings[0])
+        for posting in postings[1:]:
+            matched &= posting
+            if not matched:
+                break
+        return sorted(matched)
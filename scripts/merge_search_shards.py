@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Bind every shard of a sharded FREE-DOM search sweep into one Merkle batch.
+
+Run once after all ``search_agent.py --shard i/N --run-id GROUP`` processes finish.
+The merge refuses incomplete or inconsistent groups, checks each referenced receipt
+on disk, writes a single batch chained to the previous one, and applies the shards'
+cursor updates. It never writes canonical tables.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+
+from evidence_chain import PROOF_FORMATS, safe_slug, write_run_merkle_batch
+from evidence_segments import EvidenceReader, SegmentStore
+from search_shards import load_shard_records
+from search_state import SearchState
+
+
+def merge_shards(base: pathlib.Path, group_run_id: str, state_path: pathlib.Path,
+                 packed: bool = False, proof_format: str = "files") -> tuple[pathlib.Path, int]:
+    batch_path = base / "data" / "evidence" / "merkle" / f"{safe_slug(group_run_id, 64)}.json"
+    if batch_path.exists():
+        raise ValueError(f"{batch_path.relative_to(base).as_posix()}: group {group_run_id!r} is already merged")
+    records = load_shard_records(base, group_run_id)
+
+    reader = EvidenceReader(base)
+    refs: dict[str, dict[str, str]] = {}
+    for record in records:
+        for ref in record["receipt_refs"]:
+            if ref["receipt_id"] in refs:
+                raise ValueError(f"receipt {ref['receipt_id']} appears in more than one shard")
+            receipt = reader.get(ref["receipt_path"])
+            if receipt is None:
+                raise ValueError(f"{ref['receipt_path']}: shard receipt is missing")
+            if receipt.get("receipt_hash") != ref["receipt_hash"]:
+                raise ValueError(f"{ref['receipt_path']}: receipt_hash does not match shard reference")
+            refs[ref["receipt_id"]] = ref
+
+    if packed:
+        with SegmentStore(base, group_run_id) as store:
+            path = write_run_merkle_batch(base, group_run_id, list(refs.values()), store, proof_format)
+    else:
+        path = write_run_merkle_batch(base, group_run_id, list(refs.values()), proof_format=proof_format)
+    if path is None:
+        raise ValueError(f"group {group_run_id!r} has no receipts to bind")
+    state = SearchState(state_path)
+    for record in records:
+        state.apply(record["state_updates"])
+    state.save()
+    return path, len(refs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base", default=".")
+    parser.add_argument("--run-id", required=True, help="Group run id shared by every shard")
+    parser.add_argument("--state-path", default="data/state/search_cursor.json",
+                        help="Non-canonical search cursor, relative to --base")
+    parser.add_argument("--evidence-store", choices=["loose", "packed"], default="loose",
+                        help="Write inclusion proofs as loose files or into append-only segments")
+    parser.add_argument("--proof-format", choices=PROOF_FORMATS, default="files",
+                        help="One inclusion proof file per receipt, or one multiproof bundle per batch")
+    args = parser.parse_args()
+
+    base = pathlib.Path(args.base).resolve()
+    try:
+        path, receipts = merge_shards(
+            base, args.run_id, base / args.state_path, args.evidence_store == "packed", args.proof_format
+        )
+    except (ValueError, OSError, json.JSONDecodeError) as exc:
+        print(f"DENY search_shards_unmerged: {exc}", file=sys.stderr)
+        return 1
+    print(f"ALLOW search_shards_merged run={args.run_id} receipts={receipts} "
+          f"merkle_batch={path.relative_to(base).as_posix()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Single-pass SHA-256 Merkle trees for FREE-DOM evidence batches.
+
+The tree keeps every level once, so the root and all inclusion proofs come from
+one build with ``n - 1`` internal hashes. An odd node at the end of a level is
+paired with itself, as the ST-007 batch format requires. ``ProofVerifier``
+replays proofs and memoizes each internal hash it computes, so verifying every
+proof of a batch hashes each internal node once.
+
+A multiproof covers any subset of leaves with the minimal set of other nodes
+needed to recompute the root, addressed by ``level`` (0 = leaves) and ``index``.
+Verifying it walks the tree once, whatever the number of leaves it covers.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Any
+
+SHA256_RE = re.compile(r"^sha256:[0-9a-f]{64}$")
+
+
+def _digest(value: str) -> bytes:
+    return bytes.fromhex(value.split(":", 1)[1])
+
+
+def _label(digest: bytes) -> str:
+    return "sha256:" + digest.hex()
+
+
+class MerkleTree:
+    def __init__(self, hashes: list[str]) -> None:
+        if not hashes:
+            raise ValueError("Merkle tree requires at least one leaf")
+        level = [_digest(value) for value in hashes]
+        self.levels: list[list[bytes]] = [level]
+        sha256 = hashlib.sha256
+        while len(level) > 1:
+            last = len(level) - 1
+            level = [sha256(level[i] + level[i + 1 if i < last else i]).digest() for i in range(0, len(level), 2)]
+            self.levels.append(level)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> str:
+        return _label(self.levels[-1][0])
+
+    def proof(self, index: int) -> list[dict[str, str]]:
+        """Return the sibling path for leaf ``index``, leaf level first."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"leaf index {index} out of range")
+        path: list[dict[str, str]] = []
+        position = index
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling >= len(level):
+                sibling = position
+            path.append({"position": "left" if sibling < position else "right", "hash": _label(level[sibling])})
+            position //= 2
+        return path
+
+    def proofs(self) -> list[list[dict[str, str]]]:
+        """Return every leaf's sibling path without rehashing the tree."""
+        labels = [[_label(node) for node in level] for level in self.levels[:-1]]
+        paths: list[list[dict[str, str]]] = []
+        for index in range(len(self)):
+            path: list[dict[str, str]] = []
+            position = index
+            for level in labels:
+                sibling = position ^ 1
+                if sibling >= len(level):
+                    sibling = position
+                path.append({"position": "left" if sibling < position else "right", "hash": level[sibling]})
+                position //= 2
+            paths.append(path)
+        return paths
+
+    def multiproof(self, indices: list[int]) -> list[dict[str, Any]]:
+        """Return the nodes, outside ``indices`` and their ancestors, that complete the root."""
+        known = set(indices)
+        if not known or min(known) < 0 or max(known) >= len(self):
+            raise IndexError("multiproof leaf indices out of range")
+        nodes: list[dict[str, Any]] = []
+        for level_number, level in enumerate(self.levels[:-1]):
+            for position in sorted(known):
+                sibling = position ^ 1
+                if sibling < len(level) and sibling not in known:
+                    nodes.append({"level": level_number, "index": sibling, "hash": _label(level[sibling])})
+            known = {position // 2 for position in known}
+        return nodes
+
+
+def level_widths(leaf_count: int) -> list[int]:
+    widths = [leaf_count]
+    while widths[-1] > 1:
+        widths.append((widths[-1] + 1) // 2)
+    return widths
+
+
+def multiproof_root(leaf_count: int, leaves: dict[int, str], nodes: list[Any]) -> str:
+    """Recompute the root from covered leaves and multiproof nodes in one walk.
+
+    Raises ``ValueError`` for malformed, misplaced, missing or unused nodes.
+    """
+    if not isinstance(leaf_count, int) or leaf_count < 1:
+        raise ValueError("multiproof leaf_count must be a positive integer")
+    if not leaves:
+        raise ValueError("multiproof covers no leaves")
+    widths = level_widths(leaf_count)
+    supplied: list[dict[int, bytes]] = [{} for _ in widths]
+    for node in nodes:
+        if not isinstance(node, dict):
+            raise ValueError("multiproof node must be an object")
+        level, index, value = node.get("level"), node.get("index"), node.get("hash")
+        if not isinstance(level, int) or not 0 <= level < len(widths) - 1:
+            raise ValueError("multiproof node level out of range")
+        if not isinstance(index, int) or not 0 <= index < widths[level]:
+            raise ValueError("multiproof node index out of range")
+        if not isinstance(value, str) or not SHA256_RE.fullmatch(value):
+            raise ValueError("multiproof node: invalid sha256 value")
+        if index in supplied[level]:
+            raise ValueError("multiproof node duplicated")
+        supplied[level][index] = _digest(value)
+    current: dict[int, bytes] = {}
+    for index, value in leaves.items():
+        if not 0 <= index < leaf_count:
+            raise ValueError("multiproof leaf index out of range")
+        current[index] = _digest(value)
+    used = 0
+    sha256 = hashlib.sha256
+    for level, width in enumerate(widths[:-1]):
+        available = supplied[level]
+        if available.keys() & current.keys():
+            raise ValueError("multiproof node overlaps a covered position")
+        parents: dict[int, bytes] = {}
+        for position in sorted(current):
+            parent = position // 2
+            if parent in parents:
+                continue
+            left, right = 2 * parent, min(2 * parent + 1, width - 1)
+            pair = []
+            for node_index in (left, right):
+                if node_index in current:
+                    pair.append(current[node_index])
+                elif node_index in available:
+                    pair.append(available[node_index])
+                    used += 1
+                else:
+                    raise ValueError("multiproof is missing a sibling node")
+            parents[parent] = sha256(pair[0] + pair[1]).digest()
+        current = parents
+    if used != sum(len(level) for level in supplied):
+        raise ValueError("multiproof carries unused nodes")
+    return _label(current[0])
+
+
+class ProofVerifier:
+    """Apply inclusion proofs against shared intermediate nodes."""
+
+    def __init__(self) -> None:
+        self._parents: dict[tuple[bytes, str, str], bytes] = {}
+
+    def apply(self, leaf_hash: str, siblings: list[Any]) -> str:
+        """Return the root ``siblings`` resolve ``leaf_hash`` to."""
+        current = _digest(leaf_hash)
+        parents = self._parents
+        for step in siblings:
+            sibling_hash = step.get("hash") if isinstance(step, dict) else None
+            if not isinstance(sibling_hash, str):
+                raise ValueError("proof sibling: invalid sha256 value")
+            position = step.get("position")
+            key = (current, sibling_hash, position if isinstance(position, str) else "")
+            parent = parents.get(key)
+            if parent is None:
+                if not SHA256_RE.fullmatch(sibling_hash):
+                    raise ValueError("proof sibling: invalid sha256 value")
+                sibling = _digest(sibling_hash)
+                if position == "left":
+                    parent = hashlib.sha256(sibling + current).digest()
+                elif position == "right":
+                    parent = hashlib.sha256(current + sibling).digest()
+                else:
+                    raise ValueError("proof sibling position must be left or right")
+                parents[key] = parent
+            current = parent
+        return _label(current)
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""Merkle Mountain Range accumulator over every FREE-DOM receipt hash.
+
+Batch roots prove membership in one run; the accumulator proves membership in the
+whole history. Each batch's leaves (receipt hashes in leaf order) are appended, in
+chain order, to one append-only Merkle Mountain Range under
+``data/evidence/accumulator/``:
+
+* ``nodes.bin``: every node hash as 32 raw bytes in post-order position order.
+  Appending never rewrites a node, so the nodes of any earlier size are a prefix.
+* ``checkpoints/<run>.json``: the accumulator size, peaks and root after each
+  batch, named like the batch file.
+* ``state.json``: the current size, peaks and root, and the batch they include.
+
+A parent is ``sha256(left || right)`` like the batch trees. The root binds the
+leaf count: ``sha256(leaf_count as 8 big-endian bytes || peak || peak ...)``.
+Inclusion proofs (a leaf to its mountain's peak, plus every peak) and consistency
+proofs (each old peak to the new peak above it, plus both peak lists) are
+O(log n) hashes; verifiers derive the proof's shape from the sizes, so a proof
+supplies hashes only. The batch files remain the record: a missing, stale or
+damaged accumulator is rebuilt from them.
+
+Usage: ``mmr.py --base . rebuild|verify``, ``mmr.py prove --leaf-index N``,
+``mmr.py consistency --from-leaves M [--to-leaves N]``.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+from typing import Any, Iterable
+
+ACCUMULATOR_DIR = pathlib.PurePosixPath("data/evidence/accumulator")
+STATE_SCHEMA = "stegverse.free-dom.mmr-state.v1"
+CHECKPOINT_SCHEMA = "stegverse.free-dom.mmr-checkpoint.v1"
+INCLUSION_VERSION = "stegverse.mmr-inclusion-proof.v1"
+CONSISTENCY_VERSION = "stegverse.mmr-consistency-proof.v1"
+NODE_BYTES = 32
+
+
+def _digest(value: Any) -> bytes:
+    if not isinstance(value, str) or not value.startswith("sha256:") or len(value) != 71:
+        raise ValueError("invalid sha256 value")
+    try:
+        return bytes.fromhex(value[7:])
+    except ValueError:
+        raise ValueError("invalid sha256 value") from None
+
+
+def _label(digest: bytes) -> str:
+    return "sha256:" + digest.hex()
+
+
+def node_count(leaf_count: int) -> int:
+    return 2 * leaf_count - bin(leaf_count).count("1")
+
+
+def leaf_position(leaf_index: int) -> int:
+    return 2 * leaf_index - bin(leaf_index).count("1")
+
+
+def peak_layout(leaf_count: int) -> list[tuple[int, int, int]]:
+    """Return ``(position, height, first leaf)`` for each peak, left to right."""
+    peaks: list[tuple[int, int, int]] = []
+    offset = first_leaf = 0
+    for height in range(leaf_count.bit_length() - 1, -1, -1):
+        if leaf_count >> height & 1:
+            size = (2 << height) - 1
+            peaks.append((offset + size - 1, height, first_leaf))
+            offset += size
+            first_leaf += 1 << height
+    return peaks
+
+
+def bag_peaks(leaf_count: int, peaks: Iterable[bytes]) -> str:
+    return _label(hashlib.sha256(leaf_count.to_bytes(8, "big") + b"".join(peaks)).digest())
+
+
+def _climb_positions(position: int, height: int, index: int, target: int) -> tuple[list[tuple[int, bool]], int]:
+    """Sibling positions (and whether each sits on the left) from a node up to ``target`` height.
+
+    ``index`` is the node's index among same-height nodes of its mountain.
+    """
+    steps: list[tuple[int, bool]] = []
+    while height < target:
+        span = (2 << height) - 1
+        if index & 1:
+            steps.append((position - span, True))
+            position += 1
+        else:
+            steps.append((position + span, False))
+            position += span + 1
+        index >>= 1
+        height += 1
+    return steps, position
+
+
+def _mountain(leaf_count: int, leaf_index: int) -> tuple[int, tuple[int, int, int]]:
+    for number, peak in enumerate(peak_layout(leaf_count)):
+        if peak[2] <= leaf_index < peak[2] + (1 << peak[1]):
+            return number, peak
+    raise ValueError(f"leaf {leaf_index} is outside an accumulator of {leaf_count} leaves")
+
+
+def _apply(node: bytes, siblings: list[Any], lefts: list[bool]) -> bytes:
+    if not isinstance(siblings, list) or len(siblings) != len(lefts):
+        raise ValueError("proof path has the wrong length")
+    for sibling, left in zip(siblings, lefts):
+        sibling_bytes = _digest(sibling)
+        node = hashlib.sha256(sibling_bytes + node if left else node + sibling_bytes).digest()
+    return node
+
+
+def _peak_bytes(leaf_count: int, peaks: Any) -> list[bytes]:
+    if not isinstance(peaks, list) or len(peaks) != len(peak_layout(leaf_count)):
+        raise ValueError("peak list does not match the accumulator size")
+    return [_digest(peak) for peak in peaks]
+
+
+def verify_inclusion(receipt_hash: str, proof: dict[str, Any], root: str) -> bool:
+    """Check an inclusion proof for ``receipt_hash`` against a trusted accumulator ``root``."""
+    if proof.get("proof_version") != INCLUSION_VERSION:
+        raise ValueError("unsupported MMR inclusion proof version")
+    leaf_index, leaf_count = proof.get("leaf_index"), proof.get("leaf_count")
+    if not isinstance(leaf_index, int) or not isinstance(leaf_count, int) or not 0 <= leaf_index < leaf_count:
+        raise ValueError("MMR inclusion proof leaf is out of range")
+    peaks = _peak_bytes(leaf_count, proof.get("peaks"))
+    number, (_, height, first_leaf) = _mountain(leaf_count, leaf_index)
+    steps, _ = _climb_positions(leaf_position(leaf_index), 0, leaf_index - first_leaf, height)
+    peak = _apply(_digest(receipt_hash), proof.get("siblings"), [left for _, left in steps])
+    return peak == peaks[number] and bag_peaks(leaf_count, peaks) == root
+
+
+def verify_consistency(proof: dict[str, Any], old_root: str, new_root: str) -> bool:
+    """Check that the accumulator with ``new_root`` extends the one with ``old_root``."""
+    if proof.get("proof_version") != CONSISTENCY_VERSION:
+        raise ValueError("unsupported MMR consistency proof version")
+    old_count, new_count = proof.get("old_leaf_count"), proof.get("new_leaf_count")
+    if not isinstance(old_count, int) or not isinstance(new_count, int) or not 0 < old_count <= new_count:
+        raise ValueError("MMR consistency proof sizes are out of range")
+    old_peaks = _peak_bytes(old_count, proof.get("old_peaks"))
+    new_peaks = _peak_bytes(new_count, proof.get("new_peaks"))
+    if bag_peaks(old_count, old_peaks) != old_root or bag_peaks(new_count, new_peaks) != new_root:
+        return False
+    paths = proof.get("paths")
+    if not isinstance(paths, list) or len(paths) != len(old_peaks):
+        raise ValueError("MMR consistency proof needs one path per old peak")
+    for (position, height, first_leaf), node, path in zip(peak_layout(old_count), old_peaks, paths):
+        number, (_, new_height, new_first) = _mountain(new_count, first_leaf)
+        steps, _ = _climb_positions(position, height, (first_leaf - new_first) >> height, new_height)
+        if _apply(node, path, [left for _, left in steps]) != new_peaks[number]:
+            return False
+    return True
+
+
+def _extend(peaks: list[bytes], leaf_count: int, leaves: list[str]) -> bytes:
+    """Append ``leaves`` to the peaks of a ``leaf_count`` accumulator in place; returns the new nodes."""
+    heights = [height for _, height, _ in peak_layout(leaf_count)]
+    written = bytearray()
+    for leaf in leaves:
+        node, height = _digest(leaf), 0
+        written += node
+        while heights and heights[-1] == height:
+            node = hashlib.sha256(peaks.pop() + node).digest()
+            heights.pop()
+            height += 1
+            written += node
+        peaks.append(node)
+        heights.append(height)
+    return bytes(written)
+
+
+def read_state(base: pathlib.Path) -> dict[str, Any] | None:
+    try:
+        state = json.loads((base / ACCUMULATOR_DIR / "state.json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return state if isinstance(state, dict) and state.get("schema") == STATE_SCHEMA else None
+
+
+def _write_json(path: pathlib.Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp, path)
+
+
+class Accumulator:
+    """The persisted accumulator: append leaves, read nodes and build proofs."""
+
+    def __init__(self, base: pathlib.Path) -> None:
+        self.base = base
+        self.directory = base / ACCUMULATOR_DIR
+        self.nodes_path = self.directory / "nodes.bin"
+        state = read_state(base)
+        self.leaf_count = state["leaf_count"] if state else 0
+        self.batch_id = state.get("batch_id") if state else None
+        self.batch_hash = state.get("batch_hash") if state else None
+        self.batch_count = state.get("batch_count", 0) if state else 0
+        self.peaks: list[bytes] = [_digest(peak) for peak in state["peaks"]] if state else []
+
+    def node(self, position: int) -> bytes:
+        with self.nodes_path.open("rb") as handle:
+            handle.seek(position * NODE_BYTES)
+            data = handle.read(NODE_BYTES)
+        if len(data) != NODE_BYTES:
+            raise ValueError(f"{self.nodes_path}: node {position} missing")
+        return data
+
+    def is_intact(self) -> bool:
+        """True when ``nodes.bin`` holds at least the committed nodes; a torn tail is left in place."""
+        expected = node_count(self.leaf_count) * NODE_BYTES
+        try:
+            size = self.nodes_path.stat().st_size
+        except OSError:
+            return self.leaf_count == 0
+        return size >= expected and len(self.peaks) == len(peak_layout(self.leaf_count))
+
+    def truncate_to_checkpoint(self) -> None:
+        """Trim nodes an interrupted append wrote past the committed state."""
+        expected = node_count(self.leaf_count) * NODE_BYTES
+        if self.nodes_path.exists() and self.nodes_path.stat().st_size > expected:
+            with self.nodes_path.open("r+b") as handle:
+                handle.truncate(expected)
+
+    @property
+    def root(self) -> str:
+        return bag_peaks(self.leaf_count, self.peaks)
+
+    def append_batch(self, batch: dict[str, Any], ref: str) -> dict[str, Any]:
+        """Append a batch's leaves, then write its checkpoint and the new state."""
+        first_leaf = self.leaf_count
+        leaves = batch["leaf_receipt_hashes"]
+        written = _extend(self.peaks, self.leaf_count, leaves)
+        self.leaf_count += len(leaves)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.nodes_path.open("ab") as handle:
+            handle.write(written)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.batch_id, self.batch_hash = batch.get("batch_id"), batch.get("batch_hash")
+        self.batch_count += 1
+        checkpoint = {
+            "schema": CHECKPOINT_SCHEMA,
+            "batch_id": self.batch_id,
+            "batch_hash": self.batch_hash,
+            "batch_ref": ref,
+            "first_leaf": first_leaf,
+            "leaf_count": self.leaf_count,
+            "peaks": [_label(peak) for peak in self.peaks],
+            "root": self.root,
+        }
+        _write_json(self.directory / "checkpoints" / pathlib.PurePosixPath(ref).name, checkpoint)
+        _write_json(self.directory / "state.json", {
+            "schema": STATE_SCHEMA,
+            "batch_id": self.batch_id,
+            "batch_hash": self.batch_hash,
+            "batch_count": self.batch_count,
+            "leaf_count": self.leaf_count,
+            "node_count": node_count(self.leaf_count),
+            "peaks": checkpoint["peaks"],
+            "root": checkpoint["root"],
+        })
+        return checkpoint
+
+    def _peaks_at(self, leaf_count: int) -> list[str]:
+        return [_label(self.node(position)) for position, _, _ in peak_layout(leaf_count)]
+
+    def inclusion_proof(self, leaf_index: int, leaf_count: int | None = None) -> dict[str, Any]:
+        """Prove leaf ``leaf_index`` against the accumulator at ``leaf_count`` leaves (default: now)."""
+        leaf_count = self.leaf_count if leaf_count is None else leaf_count
+        if not 0 < leaf_count <= self.leaf_count:
+            raise ValueError(f"accumulator never held {leaf_count} leaves")
+        _, (_, height, first_leaf) = _mountain(leaf_count, leaf_index)
+        steps, _ = _climb_positions(leaf_position(leaf_index), 0, leaf_index - first_leaf, height)
+        peaks = self._peaks_at(leaf_count)
+        return {
+            "proof_version": INCLUSION_VERSION,
+            "leaf_index": leaf_index,
+            "leaf_count": leaf_count,
+            "receipt_hash": _label(self.node(leaf_position(leaf_index))),
+            "siblings": [_label(self.node(position)) for position, _ in steps],
+            "peaks": peaks,
+            "root": bag_peaks(leaf_count, (_digest(peak) for peak in peaks)),
+        }
+
+    def consistency_proof(self, old_count: int, new_count: int | None = None) -> dict[str, Any]:
+        """Prove the accumulator at ``new_count`` leaves extends the one at ``old_count``."""
+        new_count = self.leaf_count if new_count is None else new_count
+        if not 0 < old_count <= new_count <= self.leaf_count:
+            raise ValueError(f"no consistency proof from {old_count} to {new_count} leaves")
+        paths: list[list[str]] = []
+        for position, height, first_leaf in peak_layout(old_count):
+            _, (_, new_height, new_first) = _mountain(new_count, first_leaf)
+            steps, _ = _climb_positions(position, height, (first_leaf - new_first) >> height, new_height)
+            paths.append([_label(self.node(sibling)) for sibling, _ in steps])
+        old_peaks, new_peaks = self._peaks_at(old_count), self._peaks_at(new_count)
+        return {
+            "proof_version": CONSISTENCY_VERSION,
+            "old_leaf_count": old_count,
+            "new_leaf_count": new_count,
+            "old_peaks": old_peaks,
+            "new_peaks": new_peaks,
+            "paths": paths,
+            "old_root": bag_peaks(old_count, (_digest(peak) for peak in old_peaks)),
+            "new_root": bag_peaks(new_count, (_digest(peak) for peak in new_peaks)),
+        }
+
+
+def ordered_batches(base: pathlib.Path) -> list[tuple[str, dict[str, Any]]]:
+    """Return ``(ref, batch)`` in chain order, as the validator orders them."""
+    merkle_dir = base / "data" / "evidence" / "merkle"
+    batches = [
+        (f"data/evidence/merkle/{path.name}", json.loads(path.read_text(encoding="utf-8")))
+        for path in (merkle_dir.glob("*.json") if merkle_dir.exists() else [])
+    ]
+    return sorted(batches, key=lambda item: (item[1].get("created_at", ""), pathlib.PurePosixPath(item[0]).name))
+
+
+def rebuild(base: pathlib.Path) -> Accumulator:
+    """Replace the accumulator with one built from every batch file."""
+    directory = base / ACCUMULATOR_DIR
+    for path in [directory / "state.json", directory / "nodes.bin", *sorted((directory / "checkpoints").glob("*.json"))]:
+        path.unlink(missing_ok=True)
+    accumulator = Accumulator(base)
+    for ref, batch in ordered_batches(base):
+        accumulator.append_batch(batch, ref)
+    return accumulator
+
+
+def record_batch(base: pathlib.Path, batch: dict[str, Any], ref: str) -> dict[str, Any]:
+    """Append a newly written batch, rebuilding first if the accumulator is not at its predecessor."""
+    accumulator = Accumulator(base)
+    if not accumulator.is_intact() or accumulator.batch_hash != batch.get("previous_batch_hash"):
+        accumulator = rebuild(base)
+        checkpoint = read_checkpoint(base, ref)
+        if checkpoint is None:
+            raise ValueError(f"{ref}: batch missing from rebuilt accumulator")
+        return checkpoint
+    accumulator.truncate_to_checkpoint()
+    return accumulator.append_batch(batch, ref)
+
+
+def read_checkpoint(base: pathlib.Path, ref: str) -> dict[str, Any] | None:
+    try:
+        checkpoint = json.loads((base / ACCUMULATOR_DIR / "checkpoints" / pathlib.PurePosixPath(ref).name).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return checkpoint if isinstance(checkpoint, dict) and checkpoint.get("schema") == CHECKPOINT_SCHEMA else None
+
+
+def verify_checkpoint(base: pathlib.Path, ref: str, batch: dict[str, Any], previous_ref: str | None) -> None:
+    """Check one batch's checkpoint extends its predecessor's by exactly the batch's leaves.
+
+    Needs only the two checkpoints, so a scoped validation stays O(batch).
+    """
+    name = base / ACCUMULATOR_DIR / "checkpoints" / pathlib.PurePosixPath(ref).name
+    checkpoint = read_checkpoint(base, ref)
+    if checkpoint is None:
+        raise ValueError(f"{name}: accumulator checkpoint missing")
+    peaks: list[bytes] = []
+    leaf_count = 0
+    if previous_ref is not None:
+        previous = read_checkpoint(base, previous_ref)
+        if previous is None or not isinstance(previous.get("leaf_count"), int):
+            raise ValueError(f"{name}: previous accumulator checkpoint missing")
+        leaf_count = previous["leaf_count"]
+        peaks = _peak_bytes(leaf_count, previous.get("peaks"))
+        if bag_peaks(leaf_count, peaks) != previous.get("root"):
+            raise ValueError(f"{name}: previous accumulator checkpoint root mismatch")
+    _extend(peaks, leaf_count, batch["leaf_receipt_hashes"])
+    expected = {
+        "batch_id": batch.get("batch_id"), "batch_hash": batch.get("batch_hash"), "batch_ref": ref,
+        "first_leaf": leaf_count, "leaf_count": leaf_count + len(batch["leaf_receipt_hashes"]),
+        "peaks": [_label(peak) for peak in peaks],
+        "root": bag_peaks(leaf_count + len(batch["leaf_receipt_hashes"]), peaks),
+    }
+    if any(checkpoint.get(field) != value for field, value in expected.items()):
+        raise ValueError(f"{name}: checkpoint does not extend its predecessor by {ref}")
+
+
+def verify_accumulator(base: pathlib.Path, batches: list[tuple[str, dict[str, Any]]]) -> int:
+    """Rebuild the accumulator in memory from ``(ref, batch)`` in chain order and compare.
+
+    Raises ``ValueError`` on any difference in nodes, checkpoints or state; returns
+    the leaf count.
+    """
+    directory = base / ACCUMULATOR_DIR
+    try:
+        stored = (directory / "nodes.bin").read_bytes()
+    except OSError:
+        raise ValueError(f"{directory / 'nodes.bin'}: accumulator nodes missing") from None
+    peaks: list[bytes] = []
+    leaf_count = offset = 0
+    names: set[str] = set()
+    for ref, batch in batches:
+        first_leaf = leaf_count
+        written = _extend(peaks, leaf_count, batch["leaf_receipt_hashes"])
+        leaf_count += len(batch["leaf_receipt_hashes"])
+        if stored[offset:offset + len(written)] != written:
+            raise ValueError(f"{directory / 'nodes.bin'}: nodes for {ref} do not match the batch")
+        offset += len(written)
+        name = pathlib.PurePosixPath(ref).name
+        names.add(name)
+        checkpoint = read_checkpoint(base, ref)
+        expected = {
+            "batch_id": batch.get("batch_id"), "batch_hash": batch.get("batch_hash"), "batch_ref": ref,
+            "first_leaf": first_leaf, "leaf_count": leaf_count,
+            "peaks": [_label(peak) for peak in peaks], "root": bag_peaks(leaf_count, peaks),
+        }
+        if checkpoint is None or any(checkpoint.get(field) != value for field, value in expected.items()):
+            raise ValueError(f"{directory / 'checkpoints' / name}: checkpoint does not match {ref}")
+    if len(stored) != offset:
+        raise ValueError(f"{directory / 'nodes.bin'}: {len(stored) - offset} bytes beyond the last batch")
+    extra = {path.name for path in (directory / "checkpoints").glob("*.json")} - names
+    if extra:
+        raise ValueError(f"{directory / 'checkpoints'}: checkpoints without batches: {sorted(extra)}")
+    state = read_state(base)
+    expected = {
+        "batch_id": batches[-1][1].get("batch_id") if batches else None,
+        "batch_hash": batches[-1][1].get("batch_hash") if batches else None,
+        "batch_count": len(batches),
+        "leaf_count": leaf_count,
+        "node_count": node_count(leaf_count),
+        "peaks": [_label(peak) for peak in peaks],
+        "root": bag_peaks(leaf_count, peaks),
+    }
+    if state is None or any(state.get(field) != value for field, value in expected.items()):
+        raise ValueError(f"{directory / 'state.json'}: accumulator state does not match the batches")
+    return leaf_count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base", default=".")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Rebuild the accumulator from the batch files")
+    commands.add_parser("verify", help="Compare the accumulator with the batch files")
+    prove = commands.add_parser("prove", help="Print an inclusion proof")
+    prove.add_argument("--leaf-index", type=int, required=True)
+    prove.add_argument("--leaf-count", type=int, help="Prove against this earlier accumulator size")
+    consistency = commands.add_parser("consistency", help="Print a consistency proof between two sizes")
+    consistency.add_argument("--from-leaves", type=int, required=True)
+    consistency.add_argument("--to-leaves", type=int)
+    args = parser.parse_args()
+    base = pathlib.Path(args.base).resolve()
+    try:
+        if args.command == "rebuild":
+            accumulator = rebuild(base)
+            print(f"ALLOW mmr_rebuilt batches={accumulator.batch_count} leaves={accumulator.leaf_count} root={accumulator.root}")
+        elif args.command == "verify":
+            leaves = verify_accumulator(base, ordered_batches(base))
+            print(f"ALLOW mmr_valid leaves={leaves}")
+        elif args.command == "prove":
+            print(json.dumps(Accumulator(base).inclusion_proof(args.leaf_index, args.leaf_count), indent=2))
+        else:
+            print(json.dumps(Accumulator(base).consistency_proof(args.from_leaves, args.to_leaves), indent=2))
+    except (ValueError, OSError, json.JSONDecodeError) as exc:
+        print(f"DENY mmr_invalid: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
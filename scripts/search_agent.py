@@ -7,31 +7,69 @@ transition receipts, logs, summaries, and a run Merkle batch.
 """
 from __future__ import annotations
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import argparse
+import contextlib
 import csv
-import json
+import importlib
 import pathlib
 import re
+import sys
+import threading
 from datetime import datetime, timezone
-from typing import Dict, List
+from html.parser import HTMLParser
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, List
+
+from concurrent_fetch import DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST, fetch_all
+from evidence_chain import PROOF_FORMATS, persist_discovery, write_run_merkle_batch
+from evidence_segments import SegmentStore
+from http_cache import HttpCache
+from jsonl_writer import JsonlWriter
+from keyword_index import KeywordIndex
+from search_run_evidence import persist_search_run
+from search_shards import parse_shard, shard_of, shard_run_id, write_shard_record
+from search_state import DEFAULT_RECHECK_TTL_HOURS, SearchState
 
-import feedparser
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    import requests
 
-from evidence_chain import persist_discovery, write_run_merkle_batch
-from search_run_evidence import persist_search_run
+# Seconds spent importing this module and, later, each lazily imported dependency.
+IMPORT_SECONDS: Dict[str, float] = {"search_agent": round(time.perf_counter() - _IMPORT_STARTED, 6)}
 
 USER_AGENT = "StegVerse-AI-Agent/1.3 (+public sources only; canonical-read-only)"
 REQUEST_TIMEOUT_SECONDS = 15
-SESSION = requests.Session()
-SESSION.headers.update(
-    {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    }
-)
+MAX_PAGE_BYTES = 2_000_000
+EVENT_KEY_FIELDS = ["date", "location", "event"]
+PERSON_KEY_FIELDS = ["person", "date", "location", "event"]
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+_THREAD_STATE = threading.local()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a heavy dependency on first use and record how long the import took."""
+    module = sys.modules.get(name)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_SECONDS[name] = round(time.perf_counter() - started, 6)
+    return module
+
+
+def http_session() -> requests.Session:
+    """Return this thread's session; ``requests.Session`` is not shared across threads."""
+    session = getattr(_THREAD_STATE, "session", None)
+    if session is None:
+        session = lazy_import("requests").Session()
+        session.headers.update(REQUEST_HEADERS)
+        _THREAD_STATE.session = session
+    return session
 
 
 def normalize_spaces(value: str) -> str:
@@ -53,25 +91,31 @@ def read_whitelist(path: pathlib.Path) -> List[Dict[str, str]]:
         return list(csv.DictReader(handle))
 
 
-def load_csv_read_only(path: pathlib.Path) -> pd.DataFrame:
-    """Load canonical input without creating or rewriting it."""
-    return pd.read_csv(path) if path.exists() else pd.DataFrame()
+def load_csv_read_only(path: pathlib.Path) -> List[Dict[str, str]]:
+    """Load canonical input without creating or rewriting it.
+
+    Empty and missing cells read as ``""``; every value stays a string.
+    """
+    if not path.exists():
+        return []
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle, restval="")
+        return [{field: value or "" for field, value in row.items() if field is not None} for row in reader]
 
 
-def find_pending(dataframe: pd.DataFrame, column: str, limit: int) -> pd.DataFrame:
-    if dataframe.empty or column not in dataframe.columns or limit <= 0:
-        return pd.DataFrame()
-    values = dataframe[column].fillna("").astype(str).str.lower()
-    return dataframe[values.isin(["", "pending"])].head(limit).copy()
+def find_pending(rows: List[Dict[str, str]], column: str, limit: int) -> List[Dict[str, str]]:
+    if not rows or column not in rows[0] or limit <= 0:
+        return []
+    return [row for row in rows if row[column].lower() in ("", "pending")][:limit]
 
 
-def keywords_for_event(row: pd.Series) -> List[str]:
+def keywords_for_event(row: Dict[str, str]) -> List[str]:
     base = " ".join([str(row.get("event", "")), str(row.get("location", ""))])
     tokens = [token for token in re.split(r"[^A-Za-z0-9]+", base) if len(token) >= 3]
     return list(dict.fromkeys(token.lower() for token in tokens))[:6]
 
 
-def keywords_for_person(row: pd.Series) -> List[str]:
+def keywords_for_person(row: Dict[str, str]) -> List[str]:
     base = " ".join(
         [
             str(row.get("person", "")),
@@ -83,7 +127,7 @@ def keywords_for_person(row: pd.Series) -> List[str]:
     return list(dict.fromkeys(token.lower() for token in tokens))[:6]
 
 
-def row_key(row: pd.Series, fields: list[str]) -> str:
+def row_key(row: Dict[str, str], fields: list[str]) -> str:
     return "|".join(normalize_spaces(str(row.get(field, ""))) for field in fields)
 
 
@@ -92,46 +136,162 @@ def mk_log(log_dir: pathlib.Path, run_id: str) -> pathlib.Path:
     return log_dir / f"agent_run_{run_id}.jsonl"
 
 
-def log_line(log_path: pathlib.Path, payload: Dict) -> None:
-    with log_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, ensure_ascii=False, sort_keys=True) + "\n")
+class AnchorExtractor(HTMLParser):
+    """Streaming extractor that keeps only ``<a href>`` text and targets.
+
+    Text is collected the way ``BeautifulSoup.get_text(" ", strip=True)`` renders
+    it: every text fragment inside the anchor, stripped, joined by one space.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.anchors: list[tuple[str, str]] = []
+        self._href: str | None = None
+        self._depth = 0
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag != "a":
+            return
+        if self._href is not None:
+            self._depth += 1
+            return
+        href = next((value for name, value in attrs if name == "href"), None)
+        if href is not None:
+            self._href, self._depth, self._text = href, 0, []
+
+    def handle_data(self, data: str) -> None:
+        if self._href is not None:
+            stripped = data.strip()
+            if stripped:
+                self._text.append(stripped)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != "a" or self._href is None:
+            return
+        if self._depth:
+            self._depth -= 1
+            return
+        self.anchors.append((" ".join(self._text), self._href))
+        self._href, self._text = None, []
+
+    def close(self) -> None:
+        super().close()
+        if self._href is not None:
+            self.anchors.append((" ".join(self._text), self._href))
+            self._href, self._text = None, []
+
+
+def response_charset(content_type: str) -> str:
+    match = re.search(r"charset=([\w.-]+)", content_type, re.I)
+    return match.group(1) if match else "utf-8"
+
+
+def extract_anchors(payload: bytes, content_type: str = "", max_bytes: int = MAX_PAGE_BYTES) -> list[tuple[str, str]]:
+    """Return ``(text, href)`` for every anchor in at most ``max_bytes`` of a page."""
+    try:
+        html = payload[:max_bytes].decode(response_charset(content_type), errors="replace")
+    except LookupError:
+        html = payload[:max_bytes].decode("utf-8", errors="replace")
+    extractor = AnchorExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.anchors
 
 
-def fetch_public(url: str) -> tuple[bytes, str, str | None]:
+def fetch_public(url: str, http_cache: HttpCache | None = None) -> tuple[bytes, str, str | None]:
     try:
-        response = SESSION.get(url, timeout=REQUEST_TIMEOUT_SECONDS)
+        conditional = http_cache.conditional_headers(url) if http_cache else {}
+        response = http_session().get(url, timeout=REQUEST_TIMEOUT_SECONDS, headers=conditional or None)
         content_type = response.headers.get("content-type", "")
+        if response.status_code == 304 and conditional:
+            cached = http_cache.hit(url)
+            if cached is not None:
+                return cached.body, cached.content_type or content_type, None
+            # The stored body was evicted or is corrupt; fetch it once without validators.
+            response = http_session().get(url, timeout=REQUEST_TIMEOUT_SECONDS)
+            content_type = response.headers.get("content-type", "")
         if response.status_code != 200:
             return b"", content_type, f"status={response.status_code}"
+        if http_cache is not None:
+            http_cache.miss(url, response.content, response.headers)
         return response.content, content_type, None
     except Exception as exc:  # network failures are evidence, not silent absence
         return b"", "", f"{type(exc).__name__}: {exc}"
 
 
-def search_rss(
-    feeds: List[str],
-    keywords: List[str],
-    failures: list[dict],
-    limit_per_feed: int = 25,
-) -> List[Dict]:
-    results: List[Dict] = []
-    required = [keyword.lower() for keyword in keywords if keyword]
-    for url in feeds:
-        payload, _, error = fetch_public(url)
+class DocumentCache:
+    """Run-scoped store of fetched and parsed public sources.
+
+    Each whitelisted URL is downloaded and parsed at most once per run, no matter
+    how many targets are evaluated against it. Retrieval and parse failures are
+    recorded once per source, when the source is first loaded.
+    """
+
+    def __init__(
+        self,
+        failures: list[dict],
+        limit_per_feed: int = 25,
+        http_cache: HttpCache | None = None,
+    ) -> None:
+        self.failures = failures
+        self.limit_per_feed = limit_per_feed
+        self.http_cache = http_cache
+        self._feeds: dict[str, list[tuple[str, dict]]] = {}
+        self._pages: dict[str, list[tuple[str, str, str]]] = {}
+        self._responses: dict[str, tuple[bytes, str, str | None]] = {}
+
+    def prefetch(
+        self,
+        urls: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+    ) -> None:
+        """Download sources concurrently; parsing stays sequential and in run order."""
+        wanted = [url for url in urls if url not in self._feeds and url not in self._pages]
+        self._responses.update(
+            fetch_all(
+                wanted,
+                lambda url: fetch_public(url, self.http_cache),
+                max_workers=max_workers,
+                per_host=per_host,
+            )
+        )
+
+    def _fetch(self, url: str) -> tuple[bytes, str, str | None]:
+        if url in self._responses:
+            return self._responses.pop(url)
+        return fetch_public(url, self.http_cache)
+
+    def feed_entries(self, url: str) -> list[tuple[str, dict]]:
+        """Return ``(lowered_text, hit)`` pairs for the leading entries of one feed."""
+        if url not in self._feeds:
+            self._feeds[url] = self._load_feed(url)
+        return self._feeds[url]
+
+    def page_anchors(self, url: str) -> list[tuple[str, str, str]]:
+        """Return ``(lowered_text, text, href)`` for absolute-URL anchors of one page."""
+        if url not in self._pages:
+            self._pages[url] = self._load_page(url)
+        return self._pages[url]
+
+    def _load_feed(self, url: str) -> list[tuple[str, dict]]:
+        payload, _, error = self._fetch(url)
         if error:
-            failures.append({"source": url, "stage": "rss-fetch", "error": error})
-            continue
+            self.failures.append({"source": url, "stage": "rss-fetch", "error": error})
+            return []
+        entries: list[tuple[str, dict]] = []
         try:
-            parsed = feedparser.parse(payload)
+            parsed = lazy_import("feedparser").parse(payload)
             if getattr(parsed, "bozo", False):
-                failures.append(
+                self.failures.append(
                     {
                         "source": url,
                         "stage": "rss-parse",
                         "error": str(getattr(parsed, "bozo_exception", "unknown parse error")),
                     }
                 )
-            for entry in getattr(parsed, "entries", [])[:limit_per_feed]:
+            for entry in getattr(parsed, "entries", [])[: self.limit_per_feed]:
                 text = " ".join(
                     [
                         entry.get("title", ""),
@@ -143,20 +303,49 @@ def search_rss(
                         ),
                     ]
                 ).lower()
-                if all(keyword in text for keyword in required):
-                    results.append(
+                entries.append(
+                    (
+                        text,
                         {
                             "feed": url,
                             "title": entry.get("title", "").strip(),
                             "link": entry.get("link", "").strip(),
                             "published": entry.get("published", "").strip(),
-                        }
+                        },
                     )
+                )
         except Exception as exc:
-            failures.append(
+            self.failures.append(
                 {"source": url, "stage": "rss-search", "error": f"{type(exc).__name__}: {exc}"}
             )
-    return results
+        return entries
+
+    def _load_page(self, url: str) -> list[tuple[str, str, str]]:
+        payload, content_type, error = self._fetch(url)
+        if error:
+            self.failures.append({"source": url, "stage": "site-fetch", "error": error})
+            return []
+        if "html" not in content_type.lower():
+            self.failures.append(
+                {"source": url, "stage": "site-fetch", "error": f"unsupported content_type={content_type}"}
+            )
+            return []
+        return [
+            (text.lower(), text, href)
+            for text, href in extract_anchors(payload, content_type)
+            if href.startswith(("http://", "https://"))
+        ]
+
+
+def search_rss(
+    feeds: List[str],
+    keywords: List[str],
+    failures: list[dict],
+    limit_per_feed: int = 25,
+    cache: DocumentCache | None = None,
+) -> List[Dict]:
+    cache = cache or DocumentCache(failures, limit_per_feed)
+    return sweep_targets(cache, feeds, [], [keywords], limit_per_feed=limit_per_feed)[0]
 
 
 def site_keyword_scan(
@@ -164,29 +353,58 @@ def site_keyword_scan(
     keywords: List[str],
     failures: list[dict],
     limit_per_site: int = 8,
+    cache: DocumentCache | None = None,
 ) -> List[Dict]:
-    results: List[Dict] = []
-    required = [keyword.lower() for keyword in keywords if keyword]
-    for url in pages:
-        payload, content_type, error = fetch_public(url)
-        if error:
-            failures.append({"source": url, "stage": "site-fetch", "error": error})
-            continue
-        if "html" not in content_type.lower():
-            failures.append(
-                {"source": url, "stage": "site-fetch", "error": f"unsupported content_type={content_type}"}
-            )
-            continue
-        soup = BeautifulSoup(payload, "html.parser")
-        count = 0
-        for anchor in soup.find_all("a", href=True):
-            text = (anchor.get_text(" ", strip=True) or "").lower()
-            href = str(anchor["href"])
-            if all(keyword in text for keyword in required) and href.startswith(("http://", "https://")):
-                results.append({"page": url, "title": anchor.get_text(" ", strip=True), "link": href})
-                count += 1
-                if count >= limit_per_site:
-                    break
+    cache = cache or DocumentCache(failures)
+    return sweep_targets(cache, [], pages, [keywords], limit_per_site=limit_per_site)[0]
+
+
+def sweep_targets(
+    cache: DocumentCache,
+    feeds: List[str],
+    pages: List[str],
+    targets: List[List[str]],
+    limit_per_feed: int = 25,
+    limit_per_site: int = 8,
+) -> List[List[Dict]]:
+    """Evaluate every target against one index of the cached documents.
+
+    Returns, per target, its feed hits followed by its page hits. The swept
+    entries and anchors are indexed once in a ``KeywordIndex`` and each target
+    resolves by posting-list intersection instead of rescanning every document;
+    ``search_rss`` and ``site_keyword_scan`` are its single-target forms.
+    """
+    if not targets:
+        return []
+    entries = {url: cache.feed_entries(url) for url in feeds}
+    anchors = {url: cache.page_anchors(url) for url in pages}
+    index = KeywordIndex()
+    locations: List[tuple[str, str, int]] = []
+    for url, items in entries.items():
+        for position, (text, _) in enumerate(items[:limit_per_feed]):
+            index.add(text)
+            locations.append(("rss", url, position))
+    for url, items in anchors.items():
+        for position, (text, _, _) in enumerate(items):
+            index.add(text)
+            locations.append(("site", url, position))
+
+    results: List[List[Dict]] = []
+    for keywords in targets:
+        matched: Dict[tuple[str, str], List[int]] = {}
+        for doc_id in index.search(keywords):
+            kind, url, position = locations[doc_id]
+            matched.setdefault((kind, url), []).append(position)
+        hits = [
+            dict(entries[url][position][1])
+            for url in feeds
+            for position in matched.get(("rss", url), [])
+        ]
+        for url in pages:
+            for position in matched.get(("site", url), [])[:limit_per_site]:
+                _, title, href = anchors[url][position]
+                hits.append({"page": url, "title": title, "link": href})
+        results.append(hits)
     return results
 
 
@@ -213,8 +431,9 @@ def persist_hits(
     target_row_key: str,
     keywords: list[str],
     run_id: str,
-    log_path: pathlib.Path,
+    log: JsonlWriter,
     receipt_refs: list[dict[str, str]],
+    store: SegmentStore | None = None,
 ) -> None:
     for hit in hits:
         try:
@@ -226,12 +445,12 @@ def persist_hits(
                 target_row_key=target_row_key,
                 keywords=keywords,
                 run_id=run_id,
+                store=store,
             )
             receipt_refs.append(reference)
-            log_line(log_path, {"type": "evidence-receipt", **reference})
+            log.write({"type": "evidence-receipt", **reference})
         except Exception as exc:
-            log_line(
-                log_path,
+            log.write(
                 {
                     "type": "evidence-emission-failure",
                     "target_type": target_type,
@@ -242,12 +461,49 @@ def persist_hits(
             )
 
 
+def shard_rows(
+    rows: List[Dict[str, str]], target_type: str, key_fields: List[str], shard: tuple[int, int] | None
+) -> List[Dict[str, str]]:
+    """Keep the rows owned by ``shard`` (``(i, N)``); all rows when unsharded."""
+    if shard is None:
+        return rows
+    index, count = shard
+    return [row for row in rows if shard_of(target_type, row_key(row, key_fields), count) == index]
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--base", default=".", help="Repository root or portable scope directory")
     parser.add_argument("--max-event-targets", type=int, default=25)
     parser.add_argument("--max-person-targets", type=int, default=25)
+    parser.add_argument("--fetch-workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Concurrent source downloads per run (1 disables concurrency)")
+    parser.add_argument("--fetch-per-host", type=int, default=DEFAULT_PER_HOST,
+                        help="Concurrent source downloads allowed against one host")
+    parser.add_argument("--http-cache-dir", default="data/cache/http",
+                        help="Conditional-GET cache directory, relative to --base")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="Download every source in full without revalidation")
+    parser.add_argument("--state-path", default="data/state/search_cursor.json",
+                        help="Non-canonical search cursor, relative to --base")
+    parser.add_argument("--recheck-ttl-hours", type=float, default=DEFAULT_RECHECK_TTL_HOURS,
+                        help="Skip targets searched more recently than this (0 never skips)")
+    parser.add_argument("--shard", default=None,
+                        help="Sweep only shard i/N of the pending targets; merge with merge_search_shards.py")
+    parser.add_argument("--run-id", default=None, help="Run id; required and shared by all shards of a group")
+    parser.add_argument("--evidence-store", choices=["loose", "packed"], default="loose",
+                        help="Write hit evidence and proofs as loose files or into append-only segments")
+    parser.add_argument("--proof-format", choices=PROOF_FORMATS, default="files",
+                        help="One inclusion proof file per receipt, or one multiproof bundle per batch")
     args = parser.parse_args()
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if not args.run_id:
+            parser.error("--shard requires a --run-id shared by every shard")
 
     started_at = iso_now()
     base = pathlib.Path(args.base).resolve()
@@ -257,128 +513,178 @@ def main() -> int:
     whitelist_path = data / "sources" / "sources_whitelist.csv"
     log_dir = data / "logs" / "ai_agent"
 
-    run_id = make_run_id()
+    group_run_id = args.run_id or make_run_id()
+    run_id = shard_run_id(group_run_id, *shard) if shard else group_run_id
     log_path = mk_log(log_dir, run_id)
-    whitelist = read_whitelist(whitelist_path)
-    rss_feeds = [row["url"] for row in whitelist if row.get("url") and row.get("type", "rss").lower() == "rss"]
-    site_pages = [row["url"] for row in whitelist if row.get("url") and row.get("type", "rss").lower() != "rss"]
-
-    master = load_csv_read_only(master_path)
-    people = load_csv_read_only(people_path)
-    pending_events = find_pending(master, "deep_search_event", args.max_event_targets)
-    pending_people = find_pending(people, "deep_search_person", args.max_person_targets)
-
-    failures: list[dict] = []
-    receipt_refs: list[dict[str, str]] = []
-    total_hits = 0
-
-    for _, row in pending_events.iterrows():
-        keywords = keywords_for_event(row)
-        if not keywords:
-            continue
-        hits = deduplicate_hits(
-            search_rss(rss_feeds, keywords, failures)
-            + site_keyword_scan(site_pages, keywords, failures)
+    packed_store = SegmentStore(base, run_id) if args.evidence_store == "packed" else contextlib.nullcontext()
+    with JsonlWriter(log_path) as log, packed_store as store:
+        whitelist = read_whitelist(whitelist_path)
+        rss_feeds = [row["url"] for row in whitelist if row.get("url") and row.get("type", "rss").lower() == "rss"]
+        site_pages = [row["url"] for row in whitelist if row.get("url") and row.get("type", "rss").lower() != "rss"]
+
+        master = load_csv_read_only(master_path)
+        people = load_csv_read_only(people_path)
+        state = SearchState(base / args.state_path)
+        pending_events, fresh_events = state.select(
+            shard_rows(find_pending(master, "deep_search_event", len(master)), "event", EVENT_KEY_FIELDS, shard),
+            "event",
+            lambda row: row_key(row, EVENT_KEY_FIELDS),
+            args.max_event_targets,
+            args.recheck_ttl_hours,
+            started_at,
         )
-        total_hits += len(hits)
-        target_key = row_key(row, ["date", "location", "event"])
-        log_line(
-            log_path,
-            {
-                "type": "event-search",
-                "keywords": keywords,
-                "hits": hits,
-                "target_row_key": target_key,
-                "canonical_write": False,
-            },
+        pending_people, fresh_people = state.select(
+            shard_rows(find_pending(people, "deep_search_person", len(people)), "person", PERSON_KEY_FIELDS, shard),
+            "person",
+            lambda row: row_key(row, PERSON_KEY_FIELDS),
+            args.max_person_targets,
+            args.recheck_ttl_hours,
+            started_at,
         )
-        persist_hits(
+
+        failures: list[dict] = []
+        http_cache = None if args.no_http_cache else HttpCache(base / args.http_cache_dir)
+        documents = DocumentCache(failures, http_cache=http_cache)
+        event_targets = [(row, keywords_for_event(row)) for row in pending_events]
+        person_targets = [(row, keywords_for_person(row)) for row in pending_people]
+        searchable = [keywords for _, keywords in event_targets + person_targets if keywords]
+        if searchable:
+            documents.prefetch(rss_feeds + site_pages, args.fetch_workers, args.fetch_per_host)
+        target_hits = iter(sweep_targets(documents, rss_feeds, site_pages, searchable))
+        receipt_refs: list[dict[str, str]] = []
+        total_hits = 0
+
+        for row, keywords in event_targets:
+            target_key = row_key(row, EVENT_KEY_FIELDS)
+            if not keywords:
+                state.record("event", target_key, [], started_at)
+                continue
+            hits = deduplicate_hits(next(target_hits))
+            total_hits += len(hits)
+            state.record("event", target_key, hits, started_at)
+            log.write(
+                {
+                    "type": "event-search",
+                    "keywords": keywords,
+                    "hits": hits,
+                    "target_row_key": target_key,
+                    "canonical_write": False,
+                },
+            )
+            persist_hits(
+                base=base,
+                hits=hits,
+                target_type="event",
+                target_label=normalize_spaces(str(row.get("event", ""))),
+                target_row_key=target_key,
+                keywords=keywords,
+                run_id=run_id,
+                log=log,
+                receipt_refs=receipt_refs,
+                store=store,
+            )
+
+        for row, keywords in person_targets:
+            target_key = row_key(row, PERSON_KEY_FIELDS)
+            if not keywords:
+                state.record("person", target_key, [], started_at)
+                continue
+            hits = deduplicate_hits(next(target_hits))
+            total_hits += len(hits)
+            state.record("person", target_key, hits, started_at)
+            log.write(
+                {
+                    "type": "person-search",
+                    "keywords": keywords,
+                    "hits": hits,
+                    "target_row_key": target_key,
+                    "canonical_write": False,
+                },
+            )
+            persist_hits(
+                base=base,
+                hits=hits,
+                target_type="person",
+                target_label=normalize_spaces(str(row.get("person", ""))),
+                target_row_key=target_key,
+                keywords=keywords,
+                run_id=run_id,
+                log=log,
+                receipt_refs=receipt_refs,
+                store=store,
+            )
+
+        for failure in failures:
+            log.write({"type": "source-check-failure", **failure})
+        if shard is None:
+            state.save()
+
+        # Every target record is on disk before the run receipt points at the log.
+        log.flush(durable=True)
+        completed_at = iso_now()
+        run_reference = persist_search_run(
             base=base,
-            hits=hits,
-            target_type="event",
-            target_label=normalize_spaces(str(row.get("event", ""))),
-            target_row_key=target_key,
-            keywords=keywords,
             run_id=run_id,
+            started_at=started_at,
+            completed_at=completed_at,
+            event_targets=len(pending_events),
+            person_targets=len(pending_people),
+            rss_sources=len(rss_feeds),
+            page_sources=len(site_pages),
+            total_hits=total_hits,
+            hit_receipts=len(receipt_refs),
+            failures=failures,
             log_path=log_path,
-            receipt_refs=receipt_refs,
-        )
-
-    for _, row in pending_people.iterrows():
-        keywords = keywords_for_person(row)
-        if not keywords:
-            continue
-        hits = deduplicate_hits(
-            search_rss(rss_feeds, keywords, failures)
-            + site_keyword_scan(site_pages, keywords, failures)
+            http_cache=http_cache.summary() if http_cache else None,
         )
-        total_hits += len(hits)
-        target_key = row_key(row, ["person", "date", "location", "event"])
-        log_line(
-            log_path,
+        receipt_refs.append(run_reference)
+        log.write({"type": "search-run-evidence-receipt", **run_reference})
+
+        batch_path = shard_path = None
+        if shard is None:
+            batch_path = write_run_merkle_batch(base, run_id, receipt_refs, store, args.proof_format)
+        else:
+            # Shards defer batching and cursor updates to merge_search_shards.py.
+            shard_path = write_shard_record(
+                base=base,
+                group_run_id=group_run_id,
+                index=shard[0],
+                count=shard[1],
+                run_id=run_id,
+                started_at=started_at,
+                completed_at=completed_at,
+                receipt_refs=receipt_refs,
+                state_updates=state.updates(),
+            )
+        if store is not None:
+            # Segments are durable before the summary reports the run complete.
+            store.close()
+        log.write(
             {
-                "type": "person-search",
-                "keywords": keywords,
-                "hits": hits,
-                "target_row_key": target_key,
-                "canonical_write": False,
+                "summary": {
+                    "base": str(base),
+                    "run_id": run_id,
+                    "started_at": started_at,
+                    "completed_at": completed_at,
+                    "pending_event_targets": len(pending_events),
+                    "pending_person_targets": len(pending_people),
+                    "fresh_targets_skipped": fresh_events + fresh_people,
+                    "rss_sources": len(rss_feeds),
+                    "page_sources": len(site_pages),
+                    "total_hits": total_hits,
+                    "hit_evidence_receipts": len(receipt_refs) - 1,
+                    "run_evidence_receipts": 1,
+                    "source_failures": len(failures),
+                    "http_cache": http_cache.summary() if http_cache else None,
+                    "import_seconds": dict(sorted(IMPORT_SECONDS.items())),
+                    "evidence_store": args.evidence_store,
+                    "canonical_writes": 0,
+                    "merkle_batch": batch_path.relative_to(base).as_posix() if batch_path else None,
+                    "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+                    "shard_record": shard_path.relative_to(base).as_posix() if shard_path else None,
+                }
             },
         )
-        persist_hits(
-            base=base,
-            hits=hits,
-            target_type="person",
-            target_label=normalize_spaces(str(row.get("person", ""))),
-            target_row_key=target_key,
-            keywords=keywords,
-            run_id=run_id,
-            log_path=log_path,
-            receipt_refs=receipt_refs,
-        )
-
-    for failure in failures:
-        log_line(log_path, {"type": "source-check-failure", **failure})
-
-    completed_at = iso_now()
-    run_reference = persist_search_run(
-        base=base,
-        run_id=run_id,
-        started_at=started_at,
-        completed_at=completed_at,
-        event_targets=len(pending_events),
-        person_targets=len(pending_people),
-        rss_sources=len(rss_feeds),
-        page_sources=len(site_pages),
-        total_hits=total_hits,
-        hit_receipts=len(receipt_refs),
-        failures=failures,
-        log_path=log_path,
-    )
-    receipt_refs.append(run_reference)
-    log_line(log_path, {"type": "search-run-evidence-receipt", **run_reference})
-
-    batch_path = write_run_merkle_batch(base, run_id, receipt_refs)
-    log_line(
-        log_path,
-        {
-            "summary": {
-                "base": str(base),
-                "run_id": run_id,
-                "started_at": started_at,
-                "completed_at": completed_at,
-                "pending_event_targets": len(pending_events),
-                "pending_person_targets": len(pending_people),
-                "rss_sources": len(rss_feeds),
-                "page_sources": len(site_pages),
-                "total_hits": total_hits,
-                "hit_evidence_receipts": len(receipt_refs) - 1,
-                "run_evidence_receipts": 1,
-                "source_failures": len(failures),
-                "canonical_writes": 0,
-                "merkle_batch": batch_path.relative_to(base).as_posix() if batch_path else None,
-            }
-        },
-    )
     print(f"ALLOW governed_search_run={run_id} canonical_writes=0")
     return 0
 
@@ -15,7 +15,7 @@ from evidence_chain import (
     MANIFEST_VERSION,
     POLICY_REF,
     RECEIPT_VERSION,
-    canonical_bytes,
+    canonical,
     safe_slug,
     sha256_value,
     utc_now,
@@ -36,6 +36,7 @@ def persist_search_run(
     hit_receipts: int,
     failures: list[dict[str, Any]],
     log_path: pathlib.Path,
+    http_cache: dict[str, int] | None = None,
 ) -> dict[str, str]:
     completed_at = completed_at or utc_now()
     artifact = {
@@ -61,7 +62,10 @@ def persist_search_run(
         ],
         "log_pointer": log_path.relative_to(base).as_posix(),
     }
-    artifact_hash = sha256_value(artifact)
+    if http_cache is not None:
+        artifact["retrieval"] = {"http_cache": dict(sorted(http_cache.items()))}
+    rendered = canonical(artifact)
+    artifact_hash = rendered.digest
     evidence_id = "EVID-FREEDOM-RUN-" + artifact_hash.split(":", 1)[1][:24]
     claim_text = f"FREE-DOM public OSINT sweep {run_id} executed under recorded scope"
     claim_hash = sha256_value({"claim_text": claim_text})
@@ -74,7 +78,7 @@ def persist_search_run(
         "artifact": {
             "media_type": "application/vnd.stegverse.search-run+json",
             "content_hash": artifact_hash,
-            "size_bytes": len(canonical_bytes(artifact)),
+            "size_bytes": rendered.length,
             "source_pointer": artifact["log_pointer"],
             "custody": "producer-local",
         },
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Deterministic target partitioning and shard records for parallel search sweeps.
+
+A sharded sweep splits pending targets by a stable hash of their type and row key,
+so every process agrees on the partition without coordination. Each shard emits its
+evidence receipts as usual but writes no Merkle batch; it leaves a shard record of
+its receipt references and cursor updates instead. The merge step binds all shard
+receipts of one group into a single batch, keeping ``previous_batch_hash`` linear.
+Shard records are operational only and grant no standing to any target.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pathlib
+import re
+from typing import Any
+
+from evidence_chain import safe_slug, sha256_value
+
+SHARD_SCHEMA = "stegverse.free-dom.search-shard.v1"
+SHARD_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse ``i/N`` with ``1 <= i <= N``."""
+    match = SHARD_RE.match(value or "")
+    if not match:
+        raise ValueError(f"shard must look like i/N, got {value!r}")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard index must be within 1..N, got {value!r}")
+    return index, count
+
+
+def shard_of(target_type: str, target_row_key: str, count: int) -> int:
+    """Return the 1-based shard that owns a target; stable across processes and runs."""
+    digest = hashlib.sha256(f"{target_type}:{target_row_key}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def shard_run_id(group_run_id: str, index: int, count: int) -> str:
+    return f"{group_run_id}-shard-{index}of{count}"
+
+
+def shard_dir(base: pathlib.Path, group_run_id: str) -> pathlib.Path:
+    return base / "data" / "evidence" / "shards" / safe_slug(group_run_id, 64)
+
+
+def write_shard_record(
+    *,
+    base: pathlib.Path,
+    group_run_id: str,
+    index: int,
+    count: int,
+    run_id: str,
+    started_at: str,
+    completed_at: str,
+    receipt_refs: list[dict[str, str]],
+    state_updates: dict[str, dict[str, Any]],
+) -> pathlib.Path:
+    record: dict[str, Any] = {
+        "schema": SHARD_SCHEMA,
+        "group_run_id": group_run_id,
+        "shard_index": index,
+        "shard_count": count,
+        "run_id": run_id,
+        "started_at": started_at,
+        "completed_at": completed_at,
+        "canonical_write": False,
+        "receipt_refs": sorted(receipt_refs, key=lambda item: item["receipt_id"]),
+        "state_updates": state_updates,
+        "shard_hash": "",
+    }
+    record["shard_hash"] = sha256_value({k: v for k, v in record.items() if k != "shard_hash"})
+    path = shard_dir(base, group_run_id) / f"shard-{index}of{count}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(record, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def load_shard_records(base: pathlib.Path, group_run_id: str) -> list[dict[str, Any]]:
+    """Load and check every shard record of a group; all shards 1..N must be present."""
+    records: dict[int, dict[str, Any]] = {}
+    counts: set[int] = set()
+    directory = shard_dir(base, group_run_id)
+    for path in sorted(directory.glob("shard-*.json")) if directory.exists() else []:
+        record = json.loads(path.read_text(encoding="utf-8"))
+        if record.get("schema") != SHARD_SCHEMA:
+            raise ValueError(f"{path}: unsupported shard schema")
+        if record.get("shard_hash") != sha256_value({k: v for k, v in record.items() if k != "shard_hash"}):
+            raise ValueError(f"{path}: shard_hash mismatch")
+        if record.get("group_run_id") != group_run_id:
+            raise ValueError(f"{path}: shard belongs to group {record.get('group_run_id')!r}")
+        index, count = record.get("shard_index"), record.get("shard_count")
+        if not isinstance(index, int) or not isinstance(count, int) or not 1 <= index <= count:
+            raise ValueError(f"{path}: invalid shard position")
+        if index in records:
+            raise ValueError(f"{path}: duplicate shard {index}/{count}")
+        counts.add(count)
+        records[index] = record
+    if not records:
+        raise ValueError(f"{directory}: no shard records for group {group_run_id!r}")
+    if len(counts) != 1:
+        raise ValueError(f"{directory}: shards disagree on shard count {sorted(counts)}")
+    count = counts.pop()
+    missing = [index for index in range(1, count + 1) if index not in records]
+    if missing:
+        raise ValueError(f"{directory}: missing shards {missing} of {count}")
+    return [records[index] for index in sorted(records)]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Non-canonical resumable cursor for FREE-DOM search sweeps.
+
+The cursor records when each search target was last checked and a hash of what the
+check returned. It lets bounded runs prefer never-searched and stale targets and
+skip targets checked within a recheck TTL, so successive runs cover the whole
+canonical table instead of its head. It is operational state only: it never
+changes ``deep_search_*`` columns and grants no standing to any target.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, TypeVar
+
+STATE_SCHEMA = "stegverse.free-dom.search-cursor.v1"
+DEFAULT_RECHECK_TTL_HOURS = 24 * 7
+
+Row = TypeVar("Row")
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def state_key(target_type: str, target_row_key: str) -> str:
+    return f"{target_type}:{target_row_key}"
+
+
+def result_hash(hits: Iterable[dict[str, Any]]) -> str:
+    links = sorted(str(hit.get("link") or "") for hit in hits)
+    raw = json.dumps(links, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return "sha256:" + hashlib.sha256(raw).hexdigest()
+
+
+class SearchState:
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self.targets: dict[str, dict[str, Any]] = {}
+        self._recorded: set[str] = set()
+        if path.exists():
+            loaded = json.loads(path.read_text(encoding="utf-8"))
+            if loaded.get("schema") != STATE_SCHEMA:
+                raise ValueError(f"{path}: unsupported search cursor schema")
+            self.targets = dict(loaded.get("targets") or {})
+
+    def select(
+        self,
+        rows: list[Row],
+        target_type: str,
+        key_for: Callable[[Row], str],
+        limit: int,
+        ttl_hours: float,
+        now: str | None = None,
+    ) -> tuple[list[Row], int]:
+        """Pick up to ``limit`` rows: never-searched first, then least recently searched.
+
+        Rows checked less than ``ttl_hours`` ago are skipped. Returns the selection
+        and the number of rows skipped as fresh.
+        """
+        if limit <= 0:
+            return [], 0
+        cutoff = parse_time(now or utc_now()) - timedelta(hours=ttl_hours)
+        ranked: list[tuple[int, str, int]] = []
+        fresh = 0
+        for index, row in enumerate(rows):
+            entry = self.targets.get(state_key(target_type, key_for(row)))
+            if entry is None:
+                ranked.append((0, "", index))
+                continue
+            searched_at = str(entry.get("last_searched_at") or "")
+            if ttl_hours > 0 and searched_at and parse_time(searched_at) > cutoff:
+                fresh += 1
+                continue
+            ranked.append((1, searched_at, index))
+        return [rows[index] for _, _, index in sorted(ranked)[:limit]], fresh
+
+    def record(self, target_type: str, target_row_key: str, hits: list[dict[str, Any]], searched_at: str) -> None:
+        key = state_key(target_type, target_row_key)
+        previous = self.targets.get(key) or {}
+        self.targets[key] = {
+            "target_type": target_type,
+            "target_row_key": target_row_key,
+            "last_searched_at": searched_at,
+            "result_hash": result_hash(hits),
+            "hit_count": len(hits),
+            "search_count": int(previous.get("search_count") or 0) + 1,
+        }
+        self._recorded.add(key)
+
+    def updates(self) -> dict[str, dict[str, Any]]:
+        """Return the entries recorded by this process, for deferred application."""
+        return {key: dict(self.targets[key]) for key in sorted(self._recorded)}
+
+    def apply(self, updates: dict[str, dict[str, Any]]) -> None:
+        """Adopt entries recorded elsewhere, keeping whichever search is newer."""
+        for key, entry in updates.items():
+            current = self.targets.get(key)
+            if current is None or parse_time(entry["last_searched_at"]) >= parse_time(current["last_searched_at"]):
+                self.targets[key] = dict(entry)
+                self._recorded.add(key)
+
+    def save(self) -> None:
+        payload = {
+            "schema": STATE_SCHEMA,
+            "updated_at": utc_now(),
+            "canonical_write": False,
+            "targets": dict(sorted(self.targets.items())),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(self.path.name + ".tmp")
+        temp.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(temp, self.path)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Conformance test: every canonical JSON backend renders the stdlib reference bytes."""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import os
+import pathlib
+
+import canonical_json
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+HASH_FIELDS = {"manifests": "manifest_hash", "receipts": "receipt_hash", "merkle": "batch_hash"}
+
+EDGE_CASES = [
+    {},
+    [],
+    {"b": 1, "a": [True, False, None], "c": {"z": "", "y": []}},
+    {"text": "Ünïcödé — 東京 \U0001f5f3     \x7f", "control": "\x00\x01\n\t\r\x1f\"\\/"},
+    {"é": 1, "e": 2, "\U0001f600": 3, "￿": 4, "Z": 5},
+    {"big": 2 ** 63 - 1, "small": -(2 ** 63), "bigger": 2 ** 70},
+    {"float": 0.5, "exp": 1e16, "tiny": 1e-7, "neg": -2.25},
+    {2: "non-string keys", 10: "sort numerically"},
+    {"nested": [[[{"deep": ["x"]}]]]},
+]
+
+
+def reference(value: object) -> bytes:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def corpus() -> list[object]:
+    values: list[object] = list(EDGE_CASES)
+    evidence = ROOT / "data" / "evidence"
+    for directory in ("artifacts", "manifests", "receipts", "merkle"):
+        for path in sorted((evidence / directory).glob("*.json")):
+            values.append(json.loads(path.read_text(encoding="utf-8")))
+    return values
+
+
+def check(module: object, values: list[object]) -> None:
+    for value in values:
+        expected = reference(value)
+        rendered = module.canonical(value)
+        assert rendered.data == expected, (module.BACKEND, value)
+        assert rendered.digest == "sha256:" + hashlib.sha256(expected).hexdigest()
+        assert rendered.length == len(expected) and module.canonical_digest(value) == rendered.digest
+
+
+def main() -> int:
+    values = corpus()
+    assert len(values) > len(EDGE_CASES), "committed evidence records belong in the corpus"
+    os.environ.pop(canonical_json.BACKEND_ENV, None)
+    stdlib = importlib.reload(canonical_json)
+    assert stdlib.BACKEND == "stdlib"
+    check(stdlib, values)
+
+    # Committed hashes are reproduced through the shared engine.
+    evidence = ROOT / "data" / "evidence"
+    for directory, field in HASH_FIELDS.items():
+        for path in sorted((evidence / directory).glob("*.json")):
+            record = json.loads(path.read_text(encoding="utf-8"))
+            assert stdlib.canonical_digest({k: v for k, v in record.items() if k != field}) == record[field], path
+
+    os.environ[canonical_json.BACKEND_ENV] = "orjson"
+    try:
+        fast = importlib.reload(canonical_json)
+    finally:
+        os.environ.pop(canonical_json.BACKEND_ENV, None)
+    if fast.BACKEND == "orjson":
+        check(fast, values)
+        print(f"ALLOW canonical_json_test_passed backends=stdlib,orjson values={len(values)}")
+    else:
+        print(f"ALLOW canonical_json_test_passed backends=stdlib values={len(values)} (orjson not installed)")
+    importlib.reload(canonical_json)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Deterministic test for bounded concurrent source retrieval."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+
+from concurrent_fetch import fetch_all, host_of
+
+
+def main() -> int:
+    urls = [f"https://host{index % 3}.test/source-{index}" for index in range(12)]
+    urls.append(urls[0])
+    lock = threading.Lock()
+    active: Counter[str] = Counter()
+    peak_host: Counter[str] = Counter()
+    peak_total = 0
+
+    def fake_fetch(url: str) -> tuple[bytes, str, str | None]:
+        nonlocal peak_total
+        host = host_of(url)
+        with lock:
+            active[host] += 1
+            peak_host[host] = max(peak_host[host], active[host])
+            peak_total = max(peak_total, sum(active.values()))
+        # Later URLs finish first, so completion order differs from input order.
+        time.sleep(0.02 * (1 + (12 - int(url.rsplit("-", 1)[1])) % 4))
+        with lock:
+            active[host] -= 1
+        return url.encode("utf-8"), "text/plain", None
+
+    results = fetch_all(urls, fake_fetch, max_workers=4, per_host=2, max_queued=2)
+    assert list(results) == urls[:12], list(results)
+    assert all(results[url][0] == url.encode("utf-8") for url in urls)
+    assert max(peak_host.values()) <= 2, peak_host
+    assert peak_total <= 4, peak_total
+
+    serial = fetch_all(urls, fake_fetch, max_workers=1)
+    assert serial == results
+
+    print("ALLOW concurrent_fetch_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
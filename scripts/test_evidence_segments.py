@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Deterministic test that packed evidence validates and exports byte-identically."""
+from __future__ import annotations
+
+import pathlib
+import tempfile
+
+from evidence_chain import persist_discovery, write_run_merkle_batch
+from evidence_segments import EvidenceReader, SegmentStore, export_loose, loose_bytes, reindex
+from validate_evidence_outputs import validate
+
+HITS = [
+    {"source": "https://feed.test/rss", "title": f"Hearing record {index} — café", "link": f"https://feed.test/{index}"}
+    for index in range(6)
+]
+
+
+def emit(base: pathlib.Path, store: SegmentStore | None) -> None:
+    refs = [
+        persist_discovery(
+            base=base, hit=hit, target_type="event", target_label="Hearing", target_row_key="2024-01-01|City|Hearing",
+            keywords=["hearing"], run_id="TEST-SEGMENTS", captured_at="2026-10-18T00:00:00Z", store=store,
+        )
+        for hit in HITS
+    ]
+    write_run_merkle_batch(base, "TEST-SEGMENTS", refs, store)
+
+
+def files(base: pathlib.Path, kind_dir: str) -> dict[str, bytes]:
+    root = base / "data" / "evidence" / kind_dir
+    return {path.relative_to(base).as_posix(): path.read_bytes() for path in sorted(root.rglob("*.json"))}
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as loose_dir, tempfile.TemporaryDirectory() as packed_dir:
+        loose, packed = pathlib.Path(loose_dir), pathlib.Path(packed_dir)
+        emit(loose, None)
+        with SegmentStore(packed, "TEST-SEGMENTS", max_segment_bytes=8_000) as store:
+            emit(packed, store)
+        assert store.records == 4 * len(HITS)
+
+        segments = sorted((packed / "data" / "evidence" / "segments").glob("*.seg"))
+        assert len(segments) > 1, "segments must roll over at max_segment_bytes"
+        for kind_dir in ("artifacts", "manifests", "receipts", "proofs"):
+            assert not files(packed, kind_dir), f"packed mode must not write loose {kind_dir}"
+        assert validate(packed) == validate(loose) == (len(HITS), len(HITS), 1, len(HITS))
+
+        reader = EvidenceReader(packed)
+        receipt_path = next(path for path in reader.packed_paths() if "/receipts/" in path)
+        assert reader.get(receipt_path)["receipt_version"] == "stegverse.evidence-transition-receipt.v1"
+        assert reader.load(receipt_path) == (reader.digest(receipt_path), reader.get(receipt_path))
+
+        for index_path in (packed / "data" / "evidence" / "segments").glob("*.idx"):
+            index_path.unlink()
+        try:
+            validate(packed)
+        except ValueError as exc:
+            assert "unknown receipt leaf" in str(exc)
+        else:
+            raise AssertionError("batched receipts lost with their index must fail closed")
+        assert reindex(packed) == 4 * len(HITS)
+
+        assert export_loose(packed) == (4 * len(HITS), 0)
+        for kind_dir in ("artifacts", "manifests", "receipts"):
+            assert files(packed, kind_dir) == files(loose, kind_dir), f"exported {kind_dir} must be byte-identical"
+        for path, data in files(packed, "proofs").items():
+            assert data == loose_bytes(EvidenceReader(packed).packed_record(path))
+        assert validate(packed) == validate(loose), "exported records must not be counted twice"
+        reader = EvidenceReader(packed)
+        assert reader.load(receipt_path) == (reader.digest(receipt_path), reader.get(receipt_path))
+        assert export_loose(packed) == (0, 4 * len(HITS))
+
+        exported = packed / receipt_path
+        exported.write_bytes(exported.read_bytes() + b"\n")
+        try:
+            validate(packed)
+        except ValueError as exc:
+            assert "diverges" in str(exc)
+        else:
+            raise AssertionError("a loose copy that diverges from its packed record must fail validation")
+
+    print("ALLOW evidence_segments_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
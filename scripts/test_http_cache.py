@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Deterministic test for conditional-GET revalidation in the search agent."""
+from __future__ import annotations
+
+import json
+import pathlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import search_agent
+from http_cache import HttpCache
+from search_run_evidence import persist_search_run
+
+BODY = b"<rss version='2.0'><channel><item><title>fixture</title></item></channel></rss>"
+ETAG = '"fixture-v1"'
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests_seen: list[dict[str, str | None]] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        Handler.requests_seen.append({"path": self.path, "if_none_match": self.headers.get("If-None-Match")})
+        if self.path == "/no-validators":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            self.wfile.write(b"<html></html>")
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", "Sun, 18 Oct 2026 00:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *_args) -> None:
+        return
+
+
+def main() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    root = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = pathlib.Path(temp_dir)
+            cache = HttpCache(base / "data" / "cache" / "http")
+
+            first = search_agent.fetch_public(f"{root}/feed", cache)
+            second = search_agent.fetch_public(f"{root}/feed", cache)
+            assert first == (BODY, "application/rss+xml", None), first
+            assert second == first, second
+            assert Handler.requests_seen[0]["if_none_match"] is None
+            assert Handler.requests_seen[1]["if_none_match"] == ETAG
+
+            search_agent.fetch_public(f"{root}/no-validators", cache)
+            search_agent.fetch_public(f"{root}/no-validators", cache)
+            assert Handler.requests_seen[-1]["if_none_match"] is None
+            assert cache.summary() == {"hits": 1, "misses": 3, "stored": 1}, cache.summary()
+
+            # A corrupted body must never be served as a cache hit.
+            body_path = next((base / "data" / "cache" / "http").glob("*.body"))
+            body_path.write_bytes(b"tampered")
+            assert cache.hit(f"{root}/feed") is None
+
+            # A 304 without a usable stored body is retried once without validators.
+            seen = len(Handler.requests_seen)
+            assert search_agent.fetch_public(f"{root}/feed", cache) == first
+            assert [item["if_none_match"] for item in Handler.requests_seen[seen:]] == [ETAG, None]
+            assert body_path.read_bytes() == BODY
+            assert cache.summary() == {"hits": 1, "misses": 4, "stored": 2}, cache.summary()
+
+            log_path = base / "data" / "logs" / "ai_agent" / "agent_run_TEST.jsonl"
+            log_path.parent.mkdir(parents=True)
+            log_path.write_text("", encoding="utf-8")
+            ref = persist_search_run(
+                base=base,
+                run_id="TEST-HTTP-CACHE",
+                started_at="2026-10-18T00:00:00Z",
+                completed_at="2026-10-18T00:00:01Z",
+                event_targets=0,
+                person_targets=0,
+                rss_sources=1,
+                page_sources=1,
+                total_hits=0,
+                hit_receipts=0,
+                failures=[],
+                log_path=log_path,
+                http_cache=cache.summary(),
+            )
+            manifest = json.loads((base / ref["manifest_path"]).read_text(encoding="utf-8"))
+            artifact_path = base / "data" / "evidence" / "artifacts" / f"{manifest['evidence_id']}.json"
+            artifact = json.loads(artifact_path.read_text(encoding="utf-8"))
+            assert artifact["retrieval"]["http_cache"] == {"hits": 1, "misses": 4, "stored": 2}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("ALLOW http_cache_conditional_get_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Deterministic test that single-pass Merkle trees and multiproofs match the per-leaf rebuild."""
+from __future__ import annotations
+
+import hashlib
+import random
+
+from merkle import MerkleTree, ProofVerifier, multiproof_root
+
+
+def rebuilt_root(hashes: list[str]) -> str:
+    level = [bytes.fromhex(value.split(":", 1)[1]) for value in hashes]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return "sha256:" + level[0].hex()
+
+
+def rebuilt_proof(hashes: list[str], index: int) -> list[dict[str, str]]:
+    level = [bytes.fromhex(value.split(":", 1)[1]) for value in hashes]
+    position = index
+    proof: list[dict[str, str]] = []
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        sibling = position - 1 if position % 2 else position + 1
+        proof.append({"position": "left" if sibling < position else "right", "hash": "sha256:" + level[sibling].hex()})
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+        position //= 2
+    return proof
+
+
+def main() -> int:
+    rng = random.Random(20261018)
+    for size in list(range(1, 40)) + [63, 64, 65, 127, 257]:
+        leaves = ["sha256:" + rng.randbytes(32).hex() for _ in range(size)]
+        tree = MerkleTree(leaves)
+        assert tree.root == rebuilt_root(leaves), f"root differs at {size} leaves"
+        proofs = tree.proofs()
+        verifier = ProofVerifier()
+        for index, leaf in enumerate(leaves):
+            assert proofs[index] == tree.proof(index) == rebuilt_proof(leaves, index), f"proof {index}/{size} differs"
+            assert verifier.apply(leaf, proofs[index]) == tree.root
+        if size > 1:
+            forged = [dict(step) for step in proofs[0]]
+            forged[-1]["hash"] = "sha256:" + "0" * 64
+            assert verifier.apply(leaves[0], forged) != tree.root, "a memoized path must not mask a forged sibling"
+        assert tree.multiproof(list(range(size))) == [], "a full multiproof needs no extra nodes"
+        for _ in range(5):
+            subset = rng.sample(range(size), rng.randint(1, size))
+            nodes = tree.multiproof(subset)
+            assert multiproof_root(size, {index: leaves[index] for index in subset}, nodes) == tree.root
+            assert len(nodes) <= sum(len(tree.proof(index)) for index in subset)
+
+    verifier = ProofVerifier()
+    for bad, message in (
+        ([{"position": "left", "hash": "sha256:xyz"}], "invalid sha256"),
+        ([{"position": "up", "hash": "sha256:" + "1" * 64}], "left or right"),
+        (["not-a-step"], "invalid sha256"),
+    ):
+        try:
+            verifier.apply("sha256:" + "2" * 64, bad)
+        except ValueError as exc:
+            assert message in str(exc)
+        else:
+            raise AssertionError(f"malformed sibling {bad!r} must be rejected")
+    tree = MerkleTree(["sha256:" + rng.randbytes(32).hex() for _ in range(9)])
+    covered = {index: "sha256:" + tree.levels[0][index].hex() for index in (0, 5)}
+    nodes = tree.multiproof(list(covered))
+    extra = {"level": 0, "index": 8, "hash": "sha256:" + tree.levels[0][8].hex()}
+    for bad_nodes, message in (
+        (nodes[1:], "missing a sibling"),
+        (nodes + [extra], "unused nodes"),
+        (nodes + [nodes[0]], "duplicated"),
+        ([dict(nodes[0], level=9)] + nodes[1:], "level out of range"),
+        ([dict(nodes[0], index=0)] + nodes[1:], "overlaps"),
+    ):
+        try:
+            multiproof_root(9, covered, bad_nodes)
+        except ValueError as exc:
+            assert message in str(exc), (message, str(exc))
+        else:
+            raise AssertionError(f"malformed multiproof must be rejected: {message}")
+    try:
+        MerkleTree([])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an empty tree must be rejected")
+
+    print("ALLOW merkle_tree_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Deterministic test for the cross-batch Merkle Mountain Range accumulator."""
+from __future__ import annotations
+
+import json
+import pathlib
+import random
+import tempfile
+from unittest import mock
+
+import evidence_chain
+from chain_head import read_head
+from evidence_chain import persist_discovery, write_run_merkle_batch
+from mmr import (
+    ACCUMULATOR_DIR,
+    Accumulator,
+    bag_peaks,
+    node_count,
+    read_checkpoint,
+    read_state,
+    rebuild,
+    verify_consistency,
+    verify_inclusion,
+)
+from validate_evidence_outputs import validate
+
+
+def label(index: int) -> str:
+    return f"sha256:{index:064x}"
+
+
+def check_proofs(accumulator: Accumulator, leaves: list[str], sizes: list[int]) -> None:
+    for size in sizes:
+        root = accumulator.consistency_proof(size, size)["new_root"]
+        for index in range(size):
+            proof = accumulator.inclusion_proof(index, size)
+            assert len(proof["siblings"]) <= size.bit_length(), (index, size)
+            assert verify_inclusion(leaves[index], proof, root), (index, size)
+            assert not verify_inclusion(leaves[(index + 1) % len(leaves)], proof, root)
+        for old in sizes:
+            if old <= size:
+                proof = accumulator.consistency_proof(old, size)
+                old_root = accumulator.consistency_proof(old, old)["new_root"]
+                assert verify_consistency(proof, old_root, root), (old, size)
+                if old < size:
+                    assert not verify_consistency(proof, root, root), (old, size)
+
+
+def emit(base: pathlib.Path, run_id: str, count: int) -> pathlib.Path:
+    refs = [
+        persist_discovery(
+            base=base, hit={"title": f"{run_id} record {index}", "link": f"https://feed.test/{run_id}/{index}"},
+            target_type="event", target_label="Hearing", target_row_key="2024-01-01|City|Hearing",
+            keywords=["hearing"], run_id=run_id,
+        )
+        for index in range(count)
+    ]
+    return write_run_merkle_batch(base, run_id, refs)
+
+
+def expect_invalid(message: str, base: pathlib.Path, **scope: str) -> None:
+    try:
+        validate(base, **scope)
+    except ValueError as exc:
+        assert message in str(exc), (message, str(exc))
+    else:
+        raise AssertionError(f"validation must fail: {message}")
+
+
+def main() -> int:
+    generator = random.Random(20)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Random batch sizes: every checkpoint proves every leaf and every earlier checkpoint.
+        base = pathlib.Path(temp_dir)
+        accumulator = Accumulator(base)
+        leaves: list[str] = []
+        sizes: list[int] = []
+        for batch_index in range(12):
+            batch_leaves = [label(len(leaves) + offset) for offset in range(generator.randint(1, 9))]
+            leaves.extend(batch_leaves)
+            checkpoint = accumulator.append_batch(
+                {"batch_id": f"B{batch_index}", "batch_hash": label(10_000 + batch_index), "leaf_receipt_hashes": batch_leaves},
+                f"data/evidence/merkle/b{batch_index:02d}.json",
+            )
+            sizes.append(checkpoint["leaf_count"])
+            assert checkpoint["root"] == accumulator.root
+        check_proofs(accumulator, leaves, sizes)
+        nodes = (base / ACCUMULATOR_DIR / "nodes.bin").stat().st_size
+        assert nodes == node_count(len(leaves)) * 32 and read_state(base)["leaf_count"] == len(leaves)
+
+        # Growing one leaf at a time exercises every mountain layout.
+        single = Accumulator(base / "single")
+        for index in range(40):
+            single.append_batch({"batch_id": f"S{index}", "batch_hash": label(index), "leaf_receipt_hashes": [label(index)]}, f"s{index}.json")
+        check_proofs(single, [label(index) for index in range(40)], list(range(1, 41)))
+        assert bag_peaks(0, []) != single.consistency_proof(1, 1)["new_root"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Batches written by the evidence chain append to the accumulator as they land.
+        base = pathlib.Path(temp_dir)
+        first = emit(base, "run-1", 3)
+        emit(base, "run-2", 2)
+        third = emit(base, "run-3", 4)
+        state = read_state(base)
+        batch = json.loads(third.read_text(encoding="utf-8"))
+        assert state["leaf_count"] == 9 and state["batch_hash"] == batch["batch_hash"]
+        checkpoint = read_checkpoint(base, "data/evidence/merkle/run-1.json")
+        assert checkpoint["leaf_count"] == 3 and checkpoint["first_leaf"] == 0
+        leaf = json.loads(first.read_text(encoding="utf-8"))["leaf_receipt_hashes"][1]
+        proof = Accumulator(base).inclusion_proof(1)
+        assert proof["receipt_hash"] == leaf and verify_inclusion(leaf, proof, state["root"])
+        assert verify_consistency(Accumulator(base).consistency_proof(3), checkpoint["root"], state["root"])
+        assert validate(base) == (9, 9, 3, 9)
+        assert validate(base, run_id="run-3") == (4, 4, 1, 4)
+
+        # A missing accumulator is rebuilt from the batch files to the same root.
+        built = state["root"]
+        rebuild(base)
+        assert read_state(base)["root"] == built
+        for path in (base / ACCUMULATOR_DIR).rglob("*"):
+            if path.is_file():
+                path.unlink()
+        emit(base, "run-4", 1)
+        assert read_state(base)["leaf_count"] == 10 and read_state(base)["batch_count"] == 4
+        assert validate(base) == (10, 10, 4, 10)
+
+        # Damaged nodes or checkpoints fail validation.
+        nodes_path = base / ACCUMULATOR_DIR / "nodes.bin"
+        nodes = nodes_path.read_bytes()
+        nodes_path.write_bytes(nodes[:40] + bytes([nodes[40] ^ 1]) + nodes[41:])
+        expect_invalid("accumulator", base)
+        nodes_path.write_bytes(nodes)
+        checkpoint_path = base / ACCUMULATOR_DIR / "checkpoints" / "run-4.json"
+        original = checkpoint_path.read_bytes()
+        damaged = json.loads(original)
+        damaged["first_leaf"] = 8
+        checkpoint_path.write_text(json.dumps(damaged), encoding="utf-8")
+        expect_invalid("checkpoint", base)
+        expect_invalid("checkpoint", base, run_id="run-4")
+        checkpoint_path.write_bytes(original)
+        assert validate(base) == (10, 10, 4, 10)
+
+        # A torn tail is reported, not trimmed, until the next batch is recorded.
+        nodes_path.write_bytes(nodes + b"torn")
+        assert Accumulator(base).is_intact() and nodes_path.read_bytes() == nodes + b"torn"
+        expect_invalid("beyond the last batch", base)
+        emit(base, "run-5", 2)
+        assert validate(base) == (12, 12, 5, 12)
+
+        # A failed accumulator append leaves a complete batch that the next run folds in.
+        def fail(*_args: object) -> None:
+            raise OSError("disk full")
+
+        with mock.patch.object(evidence_chain, "record_batch", fail):
+            try:
+                emit(base, "run-6", 1)
+            except OSError:
+                pass
+            else:
+                raise AssertionError("record_batch failure must propagate")
+        assert read_head(base)["batch_count"] == 6 and read_state(base)["batch_count"] == 5
+        emit(base, "run-7", 1)
+        assert validate(base) == (14, 14, 7, 14)
+
+    print("ALLOW mmr_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Deterministic test that pooled evidence validation matches the serial validator."""
+from __future__ import annotations
+
+import pathlib
+import tempfile
+
+from evidence_chain import persist_discovery, write_run_merkle_batch
+from evidence_segments import SegmentStore
+from validate_evidence_outputs import ValidationCache, validate
+
+
+def emit(base: pathlib.Path, run_id: str, count: int, packed: bool) -> None:
+    store = SegmentStore(base, run_id) if packed else None
+    refs = [
+        persist_discovery(
+            base=base, hit={"title": f"{run_id} record {index}", "link": f"https://feed.test/{run_id}/{index}"},
+            target_type="event", target_label="Hearing", target_row_key="2024-01-01|City|Hearing",
+            keywords=["hearing"], run_id=run_id, captured_at="2026-10-18T00:00:00Z", store=store,
+        )
+        for index in range(count)
+    ]
+    write_run_merkle_batch(base, run_id, refs, store=store)
+    if store is not None:
+        store.close()
+
+
+def outcome(base: pathlib.Path, jobs: int) -> tuple[object, int]:
+    cache = ValidationCache(None)
+    try:
+        return validate(base, cache, jobs=jobs), cache.checked
+    except ValueError as exc:
+        return f"DENY {exc}", cache.checked
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = pathlib.Path(temp_dir)
+        emit(base, "run-loose", 12, packed=False)
+        emit(base, "run-packed", 9, packed=True)
+        serial = outcome(base, 1)
+        assert serial == outcome(base, 3) == ((21, 21, 2, 21), 21 * 4 + 2), serial
+
+        evidence = base / "data" / "evidence"
+        manifests = sorted((evidence / "manifests").glob("*.json"))
+        proofs = sorted((evidence / "proofs").rglob("*.json"))
+        # Several failing objects at once: both modes must report the first in path order.
+        originals = {path: path.read_bytes() for path in (manifests[3], manifests[7], proofs[5], proofs[1])}
+        for path, data in originals.items():
+            path.write_bytes(data.replace(b'"sha256:', b'"sha256:0', 1))
+        for _ in range(len(originals)):
+            serial, parallel = outcome(base, 1), outcome(base, 2)
+            assert isinstance(serial[0], str) and serial == parallel, (serial, parallel)
+            failing = min(originals)
+            assert str(failing) in serial[0], (failing, serial)
+            failing.write_bytes(originals.pop(failing))
+        assert outcome(base, 4)[0] == (21, 21, 2, 21)
+
+        # Binding errors are raised in the parent, in the same order.
+        receipts = sorted((evidence / "receipts").glob("*.json"))
+        receipts[2].rename(base / "receipt.bak")
+        assert outcome(base, 1) == outcome(base, 3) and "unknown receipt leaf" in str(outcome(base, 3)[0])
+
+    print("ALLOW parallel_validation_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
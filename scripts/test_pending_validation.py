@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Deterministic test for streaming, pooled validation of pending batches."""
+from __future__ import annotations
+
+import csv
+import pathlib
+import tempfile
+
+from import_pending import ALL_MASTER, REQ_PEOPLE, REQ_UNVER_CONN, CsvSchemaError, validate_pending
+
+
+def write_csv(path: pathlib.Path, rows: list[list[str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        csv.writer(handle).writerows(rows)
+
+
+def errors(data: pathlib.Path, jobs: int) -> list[str]:
+    try:
+        validate_pending(data, jobs=jobs)
+    except CsvSchemaError as exc:
+        return str(exc).split("\n")
+    raise AssertionError("validation must fail")
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data = pathlib.Path(temp_dir) / "data"
+        pending = data / "pending"
+        master_row = ["2019-07-07", "New York NY", "Arrest", "Person A", "https://source.test", "note", "", ""]
+        people_row = ["2019-07-07", "New York NY", "Arrest", "Person A", "subject", "https://source.test", "", ""]
+        for index in range(12):
+            write_csv(pending / f"pending_updates_{index:03d}.csv", [ALL_MASTER] + [master_row] * index)
+            write_csv(pending / f"pending_people_{index:03d}.csv", [REQ_PEOPLE, people_row])
+        write_csv(pending / "pending_updates_template.csv", [["broken"]])
+        write_csv(pending / "pending_unverified_001.csv", [
+            ["type", *REQ_UNVER_CONN],
+            ["connection", "A", "B", "met", "https://source.test", "low", "", ""],
+            ["", "", "", "", "", "", "", ""],
+        ])
+        sequential = validate_pending(data)
+        assert validate_pending(data, jobs=3) == sequential
+        # Header-only batches validate but are not accepted; templates are never read.
+        assert [path.name for path in sequential][:2] == ["pending_updates_001.csv", "pending_updates_002.csv"]
+        assert len(sequential) == 11 + 12 + 1 and sequential[-1].name == "pending_unverified_001.csv"
+
+        # Every failing batch is reported, in group then file order, however many workers run.
+        write_csv(pending / "pending_updates_004.csv", [ALL_MASTER, master_row, master_row[:3]])
+        write_csv(pending / "pending_people_007.csv", [REQ_PEOPLE[:-1], people_row[:-1]])
+        write_csv(pending / "pending_people_009.csv", [])
+        write_csv(pending / "pending_unverified_002.csv", [["type", "entity_a"], ["rumor", "A"]])
+        write_csv(pending / "pending_unverified_003.csv", [["type", "entity_a"], ["connection", "A"]])
+        expected = [
+            f"{(pending / 'pending_updates_004.csv').as_posix()}: row 3 has 3 columns; expected 8",
+            f"{(pending / 'pending_people_007.csv').as_posix()}: missing required headers: deep_search_notes",
+            f"{(pending / 'pending_people_009.csv').as_posix()}: missing required headers: {', '.join(REQ_PEOPLE)}",
+            f"{(pending / 'pending_unverified_002.csv').as_posix()}: unknown type 'rumor'",
+            f"{(pending / 'pending_unverified_003.csv').as_posix()}: missing required headers: "
+            + ", ".join(REQ_UNVER_CONN[1:]),
+        ]
+        assert errors(data, 1) == expected, errors(data, 1)
+        assert errors(data, 4) == expected
+
+    print("ALLOW pending_validation_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
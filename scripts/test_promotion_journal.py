@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Deterministic test for skip-unchanged writes and the import_pending promotion journal."""
+from __future__ import annotations
+
+import csv
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+import import_pending
+from import_pending import (
+    ALL_MASTER,
+    JOURNAL_NAME,
+    REQ_UNVER_EVENTS,
+    PromotionJournal,
+    apply_journal,
+    archive_files,
+    merge_master,
+    merge_people,
+    merge_unverified,
+)
+
+REPO = pathlib.Path(__file__).resolve().parents[1]
+
+
+def write_csv(path: pathlib.Path, header: list[str], rows: list[list[str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def importer(base: pathlib.Path, *flags: str) -> str:
+    return subprocess.run(
+        [sys.executable, str(REPO / "scripts" / "import_pending.py"), "--base", str(base), *flags],
+        check=True, capture_output=True, text=True,
+    ).stdout
+
+
+def snapshot(data: pathlib.Path) -> dict[str, bytes]:
+    return {
+        path.relative_to(data).as_posix(): path.read_bytes()
+        for directory in ("master", "unverified", "pending", "archive")
+        for path in sorted((data / directory).glob("*")) if path.is_file() and path.suffix != ".staged"
+    }
+
+
+def add_pending(data: pathlib.Path, suffix: str, event: str) -> None:
+    write_csv(data / "pending" / f"pending_updates_{suffix}.csv", ALL_MASTER,
+              [["2019-07-07", "New York NY", event, "Person A", "https://source.test", "note", "", ""]])
+    write_csv(data / "pending" / f"pending_unverified_{suffix}.csv", ["type", *REQ_UNVER_EVENTS],
+              [["event", "2020-01-01", "Paris", event, "a", "b", "low", "n", "s"]])
+
+
+def stage_all(data: pathlib.Path, journal: PromotionJournal) -> None:
+    files = merge_master(data, journal) + merge_people(data, journal) + merge_unverified(data, journal)
+    archive_files(journal, data / "archive", files)
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = pathlib.Path(temp_dir)
+        data = base / "data"
+        add_pending(data, "001", "Arrest")
+
+        # A first promotion creates every canonical table; pending inputs are archived with them.
+        output = importer(base, "--allow-master-promotion")
+        assert "Promoted 2 pending batch(es); 5 canonical file(s) changed." in output, output
+        assert sorted(snapshot(data)) == [
+            *sorted(f"archive/{path.name}" for path in (data / "archive").glob("*.csv")),
+            "master/master_timeline.csv", "master/verified_people_events.csv", "unverified/unverified_connections.csv",
+            "unverified/unverified_events.csv", "unverified/unverified_people.csv",
+        ]
+        assert not (data / JOURNAL_NAME).exists()
+
+        # Batches that add nothing new change no canonical bytes or timestamps.
+        stamps = {name: (data / name).stat().st_mtime_ns for name in ("master/master_timeline.csv", "unverified/unverified_events.csv")}
+        add_pending(data, "002", "Arrest")
+        output = importer(base, "--allow-master-promotion")
+        assert "Promoted 2 pending batch(es); 0 canonical file(s) changed." in output, output
+        assert all((data / name).stat().st_mtime_ns == stamp for name, stamp in stamps.items())
+        assert not list((data / "pending").glob("*_002.csv"))
+
+        # A crash after the journal is written leaves canonical files and inputs untouched...
+        add_pending(data, "003", "Hearing")
+        before = snapshot(data)
+        with PromotionJournal(data) as journal:
+            stage_all(data, journal)
+            original = import_pending.apply_journal
+            import_pending.apply_journal = lambda data: (_ for _ in ()).throw(OSError("simulated crash"))
+            try:
+                journal.commit()
+            except OSError:
+                pass
+            else:
+                raise AssertionError("commit must reach the simulated crash")
+            finally:
+                import_pending.apply_journal = original
+        assert snapshot(data) == before and (data / JOURNAL_NAME).exists()
+        entries = json.loads((data / JOURNAL_NAME).read_text(encoding="utf-8"))
+        assert len(entries["replace"]) == 1 and len(entries["append"]) == 1 and len(entries["move"]) == 2
+        assert "Interrupted promotion pending" in importer(base)
+        assert snapshot(data) == before
+
+        # ...and the next authorized run rolls it forward exactly once.
+        output = importer(base, "--allow-master-promotion")
+        assert "Rolled forward an interrupted promotion" in output, output
+        assert "Promoted 0 pending batch(es); 0 canonical file(s) changed." in output, output
+        with (data / "unverified" / "unverified_events.csv").open(encoding="utf-8") as handle:
+            assert [row["event"] for row in csv.DictReader(handle)] == ["Arrest", "Hearing"]
+        with (data / "master" / "master_timeline.csv").open(encoding="utf-8") as handle:
+            assert [row["event"] for row in csv.DictReader(handle)] == ["Arrest", "Hearing"]
+        assert not list((data / "pending").glob("*_003.csv")) and not (data / JOURNAL_NAME).exists()
+
+        # Replaying an append that already landed does not duplicate it.
+        add_pending(data, "004", "Plea agreement")
+        with PromotionJournal(data) as journal:
+            stage_all(data, journal)
+            journal_body = {"schema": import_pending.JOURNAL_SCHEMA, "replace": journal.replace,
+                            "append": journal.append, "move": journal.move}
+            (data / JOURNAL_NAME).write_text(json.dumps(journal_body), encoding="utf-8")
+            entry = journal.append[0]
+            with (data / entry["target"]).open("ab") as handle:
+                handle.write((data / entry["staged"]).read_bytes())
+            apply_journal(data)
+            applied = snapshot(data)
+        with (data / "unverified" / "unverified_events.csv").open(encoding="utf-8") as handle:
+            assert [row["event"] for row in csv.DictReader(handle)] == ["Arrest", "Hearing", "Plea agreement"]
+        assert not list(data.glob("*/*.staged")) and applied == snapshot(data)
+
+        # Staged files from a crash before the journal existed are discarded.
+        add_pending(data, "005", "Sentencing")
+        before = snapshot(data)
+        with PromotionJournal(data) as journal:
+            merge_master(data, journal)
+            assert list((data / "master").glob("*.staged"))
+        assert snapshot(data) == before and not list(data.glob("*/*.staged"))
+
+    print("ALLOW promotion_journal_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
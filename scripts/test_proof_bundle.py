@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Deterministic test for per-batch Merkle proof bundles and subset multiproofs."""
+from __future__ import annotations
+
+import json
+import pathlib
+import tempfile
+
+from evidence_chain import make_proof_bundle, persist_discovery, sha256_value, write_run_merkle_batch
+from merkle import MerkleTree, multiproof_root
+from validate_evidence_outputs import validate
+
+HITS = [{"title": f"Hearing record {index}", "link": f"https://feed.test/{index}"} for index in range(11)]
+
+
+def emit(base: pathlib.Path, proof_format: str) -> tuple[pathlib.Path, list[dict[str, str]]]:
+    refs = [
+        persist_discovery(
+            base=base, hit=hit, target_type="event", target_label="Hearing", target_row_key="2024-01-01|City|Hearing",
+            keywords=["hearing"], run_id="TEST-BUNDLE", captured_at="2026-10-18T00:00:00Z",
+        )
+        for hit in HITS
+    ]
+    return write_run_merkle_batch(base, "TEST-BUNDLE", refs, proof_format=proof_format), refs
+
+
+def expect_invalid(base: pathlib.Path, message: str) -> None:
+    try:
+        validate(base)
+    except ValueError as exc:
+        assert message in str(exc), (message, str(exc))
+    else:
+        raise AssertionError(f"validation must fail: {message}")
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as files_dir, tempfile.TemporaryDirectory() as bundle_dir:
+        files_base, bundle_base = pathlib.Path(files_dir), pathlib.Path(bundle_dir)
+        emit(files_base, "files")
+        batch_path, refs = emit(bundle_base, "bundle")
+        assert validate(bundle_base) == validate(files_base) == (len(HITS), len(HITS), 1, len(HITS))
+
+        assert not (bundle_base / "data" / "evidence" / "proofs").exists()
+        bundle_path = bundle_base / "data" / "evidence" / "proof-bundles" / "test-bundle.json"
+        bundle = json.loads(bundle_path.read_text(encoding="utf-8"))
+        assert bundle["bundle_version"] == "stegverse.merkle-proof-bundle.v1"
+        assert bundle["nodes"] == [] and [leaf["leaf_index"] for leaf in bundle["leaves"]] == list(range(len(HITS)))
+        proof_bytes = sum(path.stat().st_size for path in (files_base / "data" / "evidence" / "proofs").rglob("*.json"))
+        assert bundle_path.stat().st_size * 3 < proof_bytes, "a bundle must be far smaller than per-receipt files"
+
+        # A subset multiproof carries only the nodes its leaves do not cover.
+        batch = json.loads(batch_path.read_text(encoding="utf-8"))
+        tree = MerkleTree(batch["leaf_receipt_hashes"])
+        ordered = sorted(refs, key=lambda ref: ref["receipt_id"])
+        subset = make_proof_bundle(batch, tree, [ordered[1], ordered[2], ordered[9]])
+        assert [leaf["leaf_index"] for leaf in subset["leaves"]] == [1, 2, 9]
+        covered = {leaf["leaf_index"]: leaf["receipt_hash"] for leaf in subset["leaves"]}
+        assert multiproof_root(subset["leaf_count"], covered, subset["nodes"]) == batch["merkle_root"]
+        assert len(subset["nodes"]) < sum(len(tree.proof(index)) for index in covered)
+
+        original = bundle_path.read_text(encoding="utf-8")
+        bundle_path.write_text(json.dumps(subset, indent=2) + "\n", encoding="utf-8")
+        expect_invalid(bundle_base, "inclusion proof count mismatch")
+
+        tampered = dict(subset, nodes=subset["nodes"][1:], bundle_hash="")
+        tampered["bundle_hash"] = sha256_value({k: v for k, v in tampered.items() if k != "bundle_hash"})
+        bundle_path.write_text(json.dumps(tampered, indent=2) + "\n", encoding="utf-8")
+        expect_invalid(bundle_base, "missing a sibling")
+
+        bundle_path.write_text(original.replace('"leaf_count": 11', '"leaf_count": 12'), encoding="utf-8")
+        expect_invalid(bundle_base, "bundle_hash mismatch")
+
+        bundle_path.write_text(original, encoding="utf-8")
+        assert validate(bundle_base)[3] == len(HITS)
+
+    print("ALLOW proof_bundle_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Deterministic test for the persisted row-fingerprint indexes used by import_pending."""
+from __future__ import annotations
+
+import csv
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+from import_pending import (
+    ALL_MASTER,
+    REQ_UNVER_EVENTS,
+    RowIndex,
+    already_canonical,
+    dedupe,
+    index_path,
+    master_key,
+    merge_master,
+    merge_unverified,
+    read_dicts,
+)
+
+
+def write_csv(path: pathlib.Path, header: list[str], rows: list[list[str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def master_row(day: str, event: str) -> list[str]:
+    return [day, "New York NY", event, "Person A", "https://source.test", "note", "pending", ""]
+
+
+def main() -> int:
+    repo = pathlib.Path(__file__).resolve().parents[1]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = pathlib.Path(temp_dir)
+        data = base / "data"
+        master = data / "master" / "master_timeline.csv"
+        write_csv(master, ALL_MASTER, [master_row("2019-07-07", "Arrest"), master_row("2019-08-10", "Death")])
+        write_csv(data / "pending" / "pending_updates_001.csv", ALL_MASTER, [
+            master_row("2008-06-30", "Plea agreement"),
+            ["2019-07-07", " New York  NY", "Arrest", "Person A", "https://source.test", "note", "", ""],
+        ])
+        unverified_header = ["type", *REQ_UNVER_EVENTS]
+        write_csv(data / "pending" / "pending_unverified_001.csv", unverified_header, [
+            ["event", "2020-01-01", "Paris", "Flight", "a", "b", "low", "n", "s"],
+            ["event", "2020-01-02", "Paris", "Dinner", "a", "b", "low", "n", "s"],
+        ])
+        events = data / "unverified" / "unverified_events.csv"
+        write_csv(events, REQ_UNVER_EVENTS, [["2020-01-02", "Paris", "Dinner", "a", "b", "low", "n", "s"]])
+
+        # Validation-only runs leave the fingerprint cache alone.
+        subprocess.run(
+            [sys.executable, str(repo / "scripts" / "import_pending.py"), "--base", str(base)],
+            check=True, capture_output=True, text=True,
+        )
+        assert not (data / "cache").exists()
+
+        # Rows already canonical are found after normalization and the pending default.
+        found = already_canonical(data)
+        assert found[data / "pending" / "pending_updates_001.csv"] == [3], found
+        assert found[data / "pending" / "pending_unverified_001.csv"] == [3], found
+        assert index_path(master).exists() and index_path(events).exists()
+
+        # Promotion merges only the new row, and the index follows the rewrite.
+        merge_master(data)
+        assert [row["event"] for row in read_dicts(master)] == ["Plea agreement", "Arrest", "Death"]
+        with RowIndex(master, ALL_MASTER, master_key) as index:
+            assert index.clean and index.state["digest"]
+        assert already_canonical(data)[data / "pending" / "pending_updates_001.csv"] == [2, 3]
+
+        # A clean table that gains nothing is not rewritten.
+        before = master.stat().st_mtime_ns
+        merge_master(data)
+        assert master.stat().st_mtime_ns == before
+
+        # Unverified rows are appended to a clean table, in the old dedupe order.
+        merge_unverified(data)
+        assert [row["event"] for row in read_dicts(events)] == ["Dinner", "Flight"]
+        merge_unverified(data)
+        assert [row["event"] for row in read_dicts(events)] == ["Dinner", "Flight"]
+
+        # Edits outside the importer are noticed by digest and rescanned.
+        with master.open("a", newline="", encoding="utf-8") as handle:
+            csv.writer(handle).writerow(master_row("2000-01-01", "Plea agreement"))
+        write_csv(data / "pending" / "pending_updates_002.csv", ALL_MASTER, [master_row("2000-01-01", "Plea agreement")])
+        assert already_canonical(data)[data / "pending" / "pending_updates_002.csv"] == [2]
+        with RowIndex(master, ALL_MASTER, master_key) as index:
+            assert not index.clean, "an out-of-order row leaves the table unclean"
+        merge_master(data)
+        assert [row["date"] for row in read_dicts(master)] == ["2000-01-01", "2008-06-30", "2019-07-07", "2019-08-10"]
+
+        # A touched but unchanged table keeps its index; duplicate rows mark a table unclean.
+        os.utime(master, ns=(before, before))
+        with RowIndex(master, ALL_MASTER, master_key) as index:
+            assert index.clean and index.state["stamp"][1] == before
+        rows = read_dicts(events)
+        write_csv(events, REQ_UNVER_EVENTS, [list(row.values()) for row in rows + rows])
+        with RowIndex(events, REQ_UNVER_EVENTS) as index:
+            assert not index.clean
+        merge_unverified(data)
+        assert read_dicts(events) == dedupe(rows, REQ_UNVER_EVENTS)
+
+        # A table whose last line lacks its newline is rewritten, not appended to.
+        events.write_bytes(events.read_bytes().rstrip(b"\r\n"))
+        with RowIndex(events, REQ_UNVER_EVENTS) as index:
+            assert not index.clean
+        write_csv(data / "pending" / "pending_unverified_002.csv", unverified_header, [
+            ["event", "2021-01-01", "Rome", "Summit", "p", "s", "high", "nn", "ns"],
+        ])
+        merge_unverified(data)
+        assert read_dicts(events) == dedupe(rows, REQ_UNVER_EVENTS) + [
+            {"date": "2021-01-01", "location": "Rome", "event": "Summit", "primary_source": "p",
+             "secondary_source": "s", "confidence": "high", "notes": "nn", "next_step": "ns"},
+        ]
+        assert events.read_bytes().endswith(b"\r\n")
+
+        # An authorized promotion reports the rows it skips as already canonical.
+        write_csv(data / "pending" / "pending_updates_003.csv", ALL_MASTER, [master_row("2019-08-10", "Death")])
+        result = subprocess.run(
+            [sys.executable, str(repo / "scripts" / "import_pending.py"), "--base", str(base), "--allow-master-promotion"],
+            check=True, capture_output=True, text=True,
+        )
+        assert "pending_updates_003.csv: 1 row(s) already canonical (lines 2)" in result.stdout, result.stdout
+
+    print("ALLOW row_fingerprints_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Deterministic test for run- and batch-scoped evidence validation."""
+from __future__ import annotations
+
+import json
+import pathlib
+import tempfile
+
+from chain_head import read_head, write_head
+from evidence_chain import persist_discovery, write_run_merkle_batch
+from validate_evidence_outputs import validate
+
+
+def emit(base: pathlib.Path, run_id: str, count: int, proof_format: str = "files") -> pathlib.Path:
+    refs = [
+        persist_discovery(
+            base=base, hit={"title": f"{run_id} record {index}", "link": f"https://feed.test/{run_id}/{index}"},
+            target_type="event", target_label="Hearing", target_row_key="2024-01-01|City|Hearing",
+            keywords=["hearing"], run_id=run_id,
+        )
+        for index in range(count)
+    ]
+    return write_run_merkle_batch(base, run_id, refs, proof_format=proof_format)
+
+
+def expect_invalid(message: str, base: pathlib.Path, **scope: str) -> None:
+    try:
+        validate(base, **scope)
+    except ValueError as exc:
+        assert message in str(exc), (message, str(exc))
+    else:
+        raise AssertionError(f"validation must fail: {message}")
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = pathlib.Path(temp_dir)
+        first = emit(base, "run-1", 4)
+        emit(base, "run-2", 3, proof_format="bundle")
+        third = emit(base, "run-3", 2)
+        assert validate(base) == (9, 9, 3, 9)
+        assert validate(base, run_id="run-3") == (2, 2, 1, 2)
+        assert validate(base, run_id="run-2") == (3, 3, 1, 3)
+        assert validate(base, since_batch_id="BATCH-FREEDOM-run-1") == (5, 5, 2, 5)
+        assert validate(base, since_batch_id="BATCH-FREEDOM-run-3") == (0, 0, 0, 0)
+
+        # Damage outside the closure is left to full validation.
+        leaf = json.loads(first.read_text(encoding="utf-8"))["leaf_receipt_hashes"][0]
+        old_receipt = next(
+            path for path in (base / "data/evidence/receipts").glob("*.json")
+            if json.loads(path.read_text(encoding="utf-8"))["receipt_hash"] == leaf
+        )
+        original = old_receipt.read_bytes()
+        old_receipt.write_bytes(original.replace(b'"observe"', b'"enforce"'))
+        assert validate(base, run_id="run-3") == (2, 2, 1, 2)
+        expect_invalid("receipt_hash mismatch", base)
+        old_receipt.write_bytes(original)
+
+        # Damage inside the closure, or to the batch it links to, fails the scoped run.
+        proof = next((base / "data/evidence/proofs/run-3").glob("*.json"))
+        proof_bytes = proof.read_bytes()
+        proof.unlink()
+        # Receipts are reached through proofs, so a missing proof leaves its leaf unknown.
+        expect_invalid("unknown receipt leaf", base, run_id="run-3")
+        proof.write_bytes(proof_bytes)
+        anchor = base / "data/evidence/merkle/run-2.json"
+        anchor_bytes = anchor.read_bytes()
+        anchor.write_bytes(anchor_bytes.replace(b'"sha256"', b'"sha-256"'))
+        expect_invalid("batch_hash mismatch", base, run_id="run-3")
+        anchor.write_bytes(anchor_bytes)
+        batch = json.loads(third.read_text(encoding="utf-8"))
+        assert batch["checkpoint_ref"] == "data/evidence/merkle/run-2.json"
+
+        # The head must be current, and --since must name a batch behind it.
+        head = read_head(base)
+        write_head(base, dict(head, batch_count=2))
+        expect_invalid("chain head", base, since_batch_id="BATCH-FREEDOM-run-1")
+        expect_invalid("chain head", base, run_id="run-3")
+        write_head(base, head)
+        expect_invalid("not in the chain", base, since_batch_id="BATCH-FREEDOM-run-9")
+        expect_invalid("no Merkle batch", base, run_id="run-9")
+        assert validate(base) == (9, 9, 3, 9)
+
+    print("ALLOW scoped_validation_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
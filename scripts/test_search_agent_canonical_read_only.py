@@ -2,13 +2,13 @@
 """Deterministic regression test for canonical read-only search-agent behavior."""
 from __future__ import annotations
 
+import csv
 import hashlib
 import json
 import pathlib
+import sys
 import tempfile
 
-import pandas as pd
-
 import search_agent
 
 
@@ -16,6 +16,13 @@ def digest(path: pathlib.Path) -> str:
     return hashlib.sha256(path.read_bytes()).hexdigest()
 
 
+def write_rows(path: pathlib.Path, rows: list[dict[str, str]]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
 def main() -> int:
     with tempfile.TemporaryDirectory() as temp_dir:
         base = pathlib.Path(temp_dir)
@@ -28,7 +35,8 @@ def main() -> int:
         people_path = master_dir / "verified_people_events.csv"
         whitelist_path = source_dir / "sources_whitelist.csv"
 
-        pd.DataFrame(
+        write_rows(
+            master_path,
             [
                 {
                     "date": "2026-01-01",
@@ -40,10 +48,11 @@ def main() -> int:
                     "deep_search_event": "pending",
                     "deep_search_notes": "",
                 }
-            ]
-        ).to_csv(master_path, index=False)
+            ],
+        )
 
-        pd.DataFrame(
+        write_rows(
+            people_path,
             [
                 {
                     "date": "2026-01-01",
@@ -55,15 +64,15 @@ def main() -> int:
                     "deep_search_person": "pending",
                     "deep_search_notes": "canonical person note",
                 }
-            ]
-        ).to_csv(people_path, index=False)
+            ],
+        )
 
         whitelist_path.write_text("type,url\n", encoding="utf-8")
         before = {master_path: digest(master_path), people_path: digest(people_path)}
 
-        original_argv = list(__import__("sys").argv)
+        original_argv = list(sys.argv)
         try:
-            __import__("sys").argv = [
+            sys.argv = [
                 "search_agent.py",
                 "--base",
                 str(base),
@@ -74,7 +83,7 @@ def main() -> int:
             ]
             result = search_agent.main()
         finally:
-            __import__("sys").argv = original_argv
+            sys.argv = original_argv
 
         if result != 0:
             raise AssertionError(f"unexpected search-agent result: {result}")
@@ -96,6 +105,9 @@ def main() -> int:
         if not evidence_root.exists():
             raise AssertionError("governed run evidence was not emitted")
 
+        if "pandas" in sys.modules:
+            raise AssertionError("search agent imported pandas to read canonical targets")
+
     print("ALLOW search_agent_canonical_read_only_test_passed")
     return 0
 
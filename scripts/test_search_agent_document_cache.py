@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Deterministic test that a search run fetches and parses each source once."""
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import search_agent
+from keyword_automaton import TargetMatcher
+from keyword_index import KeywordIndex
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Fixture</title>
+<item><title>Alpha Beta hearing</title><link>https://feed.test/alpha-beta</link>
+<description>committee record</description></item>
+<item><title>Gamma only</title><link>https://feed.test/gamma</link></item>
+</channel></rss>"""
+
+PAGE = b"""<html><body>
+<a href="https://page.test/alpha-beta">Alpha Beta release</a>
+<a href="/relative/alpha-beta">Alpha Beta relative</a>
+<a href="https://page.test/gamma">Gamma release</a>
+</body></html>"""
+
+RESPONSES = {
+    "https://feed.test/rss": (FEED, "application/rss+xml", None),
+    "https://page.test/": (PAGE, "text/html; charset=utf-8", None),
+    "https://down.test/rss": (b"", "", "status=503"),
+    "https://down.test/": (b"", "", "status=404"),
+}
+
+
+def check_matchers_follow_substring_rule() -> None:
+    rng = random.Random(20261018)
+    words = ["epstein", "palm", "beach", "new", "york", "newyork", "jan", "january", "c-span", "1992"]
+    texts = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(0, 6))) + rng.choice(["", "!", " x.y"])
+        for _ in range(200)
+    ]
+    index = KeywordIndex()
+    for text in texts:
+        index.add(text)
+    probes = [[], ["york"], ["ork", "new"], ["jan", "palm"], ["c-span"], ["x.y", "beach"], ["absent"]]
+    for keywords in probes:
+        expected = [doc_id for doc_id, text in enumerate(texts) if all(word in text for word in keywords)]
+        assert index.search(keywords) == expected, keywords
+    matcher = TargetMatcher(probes)
+    for doc_id, text in enumerate(texts):
+        expected = [target for target, keywords in enumerate(probes) if all(word in text for word in keywords)]
+        assert matcher.match(text) == expected, (doc_id, text)
+
+
+def main() -> int:
+    check_matchers_follow_substring_rule()
+    calls: Counter[str] = Counter()
+
+    def fake_fetch(url: str, *args, **kwargs) -> tuple[bytes, str, str | None]:
+        calls[url] += 1
+        return RESPONSES[url]
+
+    original = search_agent.fetch_public
+    search_agent.fetch_public = fake_fetch
+    try:
+        failures: list[dict] = []
+        cache = search_agent.DocumentCache(failures)
+        feeds = ["https://feed.test/rss", "https://down.test/rss"]
+        pages = ["https://page.test/", "https://down.test/"]
+        targets = [["alpha", "beta"], ["gamma"], ["alpha", "gamma"], ["alpha", "beta"]]
+        cache.prefetch(feeds + pages, max_workers=4, per_host=1)
+        results = [
+            search_agent.search_rss(feeds, keywords, failures, cache=cache)
+            + search_agent.site_keyword_scan(pages, keywords, failures, cache=cache)
+            for keywords in targets
+        ]
+        swept = search_agent.sweep_targets(cache, feeds, pages, targets)
+        capped = (
+            search_agent.search_rss(feeds, ["gamma"], failures, limit_per_feed=1, cache=cache),
+            search_agent.site_keyword_scan(pages, ["release"], failures, limit_per_site=1, cache=cache),
+        )
+    finally:
+        search_agent.fetch_public = original
+
+    assert all(count == 1 for count in calls.values()), calls
+    assert set(calls) == set(RESPONSES), calls
+    assert [link["link"] for link in results[0]] == [
+        "https://feed.test/alpha-beta",
+        "https://page.test/alpha-beta",
+    ], results[0]
+    assert [link["link"] for link in results[1]] == [
+        "https://feed.test/gamma",
+        "https://page.test/gamma",
+    ], results[1]
+    assert results[2] == []
+    assert results[3] == results[0]
+    assert swept == results, swept
+    assert capped[0] == [], capped
+    assert [link["link"] for link in capped[1]] == ["https://page.test/alpha-beta"], capped
+
+    anchors = search_agent.extract_anchors(
+        b'<a href="https://x.test/1"> Caf\xc3\xa9 &amp; <b>Court</b> </a><a href="https://x.test/2">late</a>',
+        "text/html; charset=utf-8",
+        max_bytes=60,
+    )
+    assert anchors == [("Café & Court", "https://x.test/1")], anchors
+    assert sorted((item["source"], item["stage"]) for item in failures) == [
+        ("https://down.test/", "site-fetch"),
+        ("https://down.test/rss", "rss-fetch"),
+    ], failures
+
+    print("ALLOW search_agent_document_cache_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
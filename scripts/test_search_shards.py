@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Deterministic test for sharded search sweeps and their single-batch merge."""
+from __future__ import annotations
+
+import csv
+import json
+import pathlib
+import sys
+import tempfile
+
+import search_agent
+from merge_search_shards import merge_shards
+from search_shards import load_shard_records, parse_shard, shard_of
+from search_state import SearchState
+from validate_evidence_outputs import validate
+
+SHARDS = 3
+
+
+def write_rows(path: pathlib.Path, rows: list[dict[str, str]]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_agent(base: pathlib.Path, *extra: str) -> None:
+    original_argv = list(sys.argv)
+    try:
+        sys.argv = ["search_agent.py", "--base", str(base), "--max-event-targets", "100",
+                    "--max-person-targets", "100", "--no-http-cache", *extra]
+        result = search_agent.main()
+    finally:
+        sys.argv = original_argv
+    assert result == 0, f"unexpected search-agent result: {result}"
+
+
+def main() -> int:
+    assert parse_shard("2/3") == (2, 3)
+    for bad in ("0/3", "4/3", "1/0", "1-3", ""):
+        try:
+            parse_shard(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"invalid shard {bad!r} must be rejected")
+    owners = [shard_of("event", f"2024-01-{day:02d}|City|Event", SHARDS) for day in range(1, 29)]
+    assert owners == [shard_of("event", f"2024-01-{day:02d}|City|Event", SHARDS) for day in range(1, 29)]
+    assert set(owners) == set(range(1, SHARDS + 1))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = pathlib.Path(temp_dir)
+        (base / "data" / "master").mkdir(parents=True)
+        (base / "data" / "sources").mkdir(parents=True)
+        events = [
+            {"date": f"2024-01-{day:02d}", "location": "City", "event": f"Hearing {day}",
+             "participants_on_record": "", "source_urls": "", "notes": "",
+             "deep_search_event": "pending", "deep_search_notes": ""}
+            for day in range(1, 13)
+        ]
+        people = [
+            {"date": f"2024-02-{day:02d}", "location": "City", "event": "Hearing", "person": f"Person {day}",
+             "role": "", "source_urls": "", "deep_search_person": "pending", "deep_search_notes": ""}
+            for day in range(1, 7)
+        ]
+        write_rows(base / "data" / "master" / "master_timeline.csv", events)
+        write_rows(base / "data" / "master" / "verified_people_events.csv", people)
+        (base / "data" / "sources" / "sources_whitelist.csv").write_text("type,url\n", encoding="utf-8")
+
+        run_agent(base, "--run-id", "PRIOR", "--max-event-targets", "0", "--max-person-targets", "0")
+        prior = json.loads((base / "data" / "evidence" / "merkle" / "prior.json").read_text(encoding="utf-8"))
+
+        for index in range(1, SHARDS):
+            run_agent(base, "--shard", f"{index}/{SHARDS}", "--run-id", "GROUP")
+        try:
+            merge_shards(base, "GROUP", base / "data" / "state" / "search_cursor.json")
+        except ValueError as exc:
+            assert "missing shards" in str(exc)
+        else:
+            raise AssertionError("merge must refuse an incomplete shard group")
+        run_agent(base, "--shard", f"{SHARDS}/{SHARDS}", "--run-id", "GROUP")
+
+        merkle_dir = base / "data" / "evidence" / "merkle"
+        assert sorted(path.name for path in merkle_dir.glob("*.json")) == ["prior.json"], "shards must not batch"
+        assert not SearchState(base / "data" / "state" / "search_cursor.json").targets, "shards must not write the cursor"
+
+        records = load_shard_records(base, "GROUP")
+        swept = [key for record in records for key in record["state_updates"]]
+        expected = [f"event:{search_agent.row_key(row, search_agent.EVENT_KEY_FIELDS)}" for row in events]
+        expected += [f"person:{search_agent.row_key(row, search_agent.PERSON_KEY_FIELDS)}" for row in people]
+        assert sorted(swept) == sorted(expected), "shards must partition every pending target exactly once"
+        for record in records:
+            for key in record["state_updates"]:
+                target_type, row_key = key.split(":", 1)
+                assert shard_of(target_type, row_key, SHARDS) == record["shard_index"]
+
+        path, receipts = merge_shards(base, "GROUP", base / "data" / "state" / "search_cursor.json")
+        batch = json.loads(path.read_text(encoding="utf-8"))
+        assert receipts == SHARDS and len(batch["leaf_receipt_hashes"]) == SHARDS
+        assert batch["previous_batch_hash"] == prior["batch_hash"]
+        assert batch["checkpoint_ref"] == "data/evidence/merkle/prior.json"
+        assert sorted(SearchState(base / "data" / "state" / "search_cursor.json").targets) == sorted(expected)
+        assert validate(base)[2:] == (2, SHARDS + 1)
+
+        try:
+            merge_shards(base, "GROUP", base / "data" / "state" / "search_cursor.json")
+        except ValueError as exc:
+            assert "already merged" in str(exc)
+        else:
+            raise AssertionError("a shard group must merge only once")
+
+    print("ALLOW search_shards_merge_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
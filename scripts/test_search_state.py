@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Deterministic test that bounded search runs rotate through every pending target."""
+from __future__ import annotations
+
+import json
+import pathlib
+import tempfile
+
+from search_state import STATE_SCHEMA, SearchState, result_hash
+
+KEYS = [f"2024-01-{day:02d}|City|Event {day}" for day in range(1, 8)]
+
+
+def sweep(path: pathlib.Path, now: str, limit: int, ttl_hours: float = 168) -> tuple[list[str], int]:
+    state = SearchState(path)
+    selected, fresh = state.select(KEYS, "event", lambda key: key, limit, ttl_hours, now)
+    for key in selected:
+        state.record("event", key, [{"link": f"https://example.test/{key}"}], now)
+    state.save()
+    return selected, fresh
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "data" / "state" / "search_cursor.json"
+
+        first, fresh = sweep(path, "2026-10-01T00:00:00Z", 3)
+        assert first == KEYS[:3] and fresh == 0
+        second, fresh = sweep(path, "2026-10-01T06:00:00Z", 3)
+        assert second == KEYS[3:6] and fresh == 3, "fresh targets must not crowd out the tail"
+        third, fresh = sweep(path, "2026-10-01T12:00:00Z", 3)
+        assert third == KEYS[6:] and fresh == 6
+
+        # Past the TTL, the least recently searched targets come back first.
+        later, fresh = sweep(path, "2026-10-07T03:00:00Z", 2, ttl_hours=144)
+        assert later == KEYS[:2] and fresh == 4
+
+        # A zero TTL never skips and still orders by staleness.
+        state = SearchState(path)
+        rotated, fresh = state.select(KEYS, "event", lambda key: key, len(KEYS), 0, "2026-10-07T04:00:00Z")
+        assert fresh == 0 and rotated == KEYS[2:6] + [KEYS[6]] + KEYS[:2]
+
+        # Event and person keys never collide.
+        people, fresh = state.select(KEYS, "person", lambda key: key, 2, 168, "2026-10-07T04:00:00Z")
+        assert people == KEYS[:2] and fresh == 0
+
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        assert payload["schema"] == STATE_SCHEMA
+        assert payload["canonical_write"] is False
+        entry = payload["targets"][f"event:{KEYS[0]}"]
+        assert entry["search_count"] == 2 and entry["hit_count"] == 1
+        assert entry["last_searched_at"] == "2026-10-07T03:00:00Z"
+        assert entry["result_hash"] == result_hash([{"link": f"https://example.test/{KEYS[0]}"}])
+        assert result_hash([{"link": "b"}, {"link": "a"}]) == result_hash([{"link": "a"}, {"link": "b"}])
+        assert not list(path.parent.glob("*.tmp"))
+
+        assert SearchState(path).select(KEYS, "event", lambda key: key, 0, 168) == ([], 0)
+
+        path.write_text(json.dumps({"schema": "other", "targets": {}}), encoding="utf-8")
+        try:
+            SearchState(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown cursor schema must be rejected")
+
+    print("ALLOW search_state_cursor_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Deterministic test for incremental evidence validation with the verified-object cache."""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import tempfile
+
+from evidence_chain import persist_discovery, write_run_merkle_batch
+from validate_evidence_outputs import ValidationCache, validate
+
+
+def emit(base: pathlib.Path, run_id: str, count: int) -> None:
+    refs = [
+        persist_discovery(
+            base=base, hit={"title": f"{run_id} record {index}", "link": f"https://feed.test/{run_id}/{index}"},
+            target_type="event", target_label="Hearing", target_row_key="2024-01-01|City|Hearing",
+            keywords=["hearing"], run_id=run_id, captured_at="2026-10-18T00:00:00Z",
+        )
+        for index in range(count)
+    ]
+    write_run_merkle_batch(base, run_id, refs)
+
+
+def run(base: pathlib.Path, cache_path: pathlib.Path, full: bool = False) -> tuple[tuple[int, int, int, int], ValidationCache]:
+    cache = ValidationCache(cache_path, full=full)
+    counts = validate(base, cache)
+    cache.save()
+    return counts, cache
+
+
+def expect_invalid(base: pathlib.Path, cache_path: pathlib.Path, message: str, full: bool = False) -> None:
+    try:
+        run(base, cache_path, full)
+    except ValueError as exc:
+        assert message in str(exc), (message, str(exc))
+    else:
+        raise AssertionError(f"validation must fail: {message}")
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base = pathlib.Path(temp_dir)
+        cache_path = base / "data" / "cache" / "validation" / "objects.json"
+        emit(base, "run-1", 3)
+        counts, cache = run(base, cache_path)
+        # artifact, manifest and receipt per hit, one batch, one proof per hit
+        assert counts == (3, 3, 1, 3) and (cache.checked, cache.cached) == (13, 0)
+        counts, cache = run(base, cache_path)
+        assert counts == (3, 3, 1, 3) and (cache.checked, cache.cached) == (0, 13)
+
+        # Only the new run's objects are checked; history is served from the cache.
+        emit(base, "run-2", 2)
+        counts, cache = run(base, cache_path)
+        assert counts == (5, 5, 2, 5) and (cache.checked, cache.cached) == (9, 13)
+
+        # A new mtime alone (a fresh checkout) falls back to the content digest.
+        receipt = next((base / "data" / "evidence" / "receipts").glob("*.json"))
+        os.utime(receipt, ns=(1, 1))
+        _, cache = run(base, cache_path)
+        assert (cache.checked, cache.cached) == (0, 22)
+
+        # Changed bytes are re-checked even from a warm cache.
+        original = receipt.read_bytes()
+        receipt.write_bytes(original.replace(b'"observe"', b'"enforce"'))
+        expect_invalid(base, cache_path, "receipt_hash mismatch")
+        receipt.write_bytes(original)
+
+        # Bindings are never cached: a removed receipt breaks its batch and proof.
+        receipt.rename(base / "receipt.bak")
+        expect_invalid(base, cache_path, "unknown receipt leaf")
+        (base / "receipt.bak").rename(receipt)
+        assert run(base, cache_path)[0] == (5, 5, 2, 5)
+
+        # An edit that keeps size and mtime is trusted by the fast path; --full still catches it.
+        stat = receipt.stat()
+        receipt.write_bytes(original.replace(b'"observe"', b'"observX"'))
+        os.utime(receipt, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert run(base, cache_path)[0] == (5, 5, 2, 5)
+        expect_invalid(base, cache_path, "receipt_hash mismatch", full=True)
+        receipt.write_bytes(original)
+
+        # A cache written by a different validator revision is discarded.
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        cache_path.write_text(json.dumps(dict(data, rules_digest="sha256:" + "0" * 64)), encoding="utf-8")
+        _, cache = run(base, cache_path)
+        assert (cache.checked, cache.cached) == (22, 0)
+
+        # Without a cache every object is checked and nothing is written.
+        assert validate(base) == (5, 5, 2, 5)
+
+    print("ALLOW validation_cache_test_passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse, sys, csv, pathlib
-from datetime import datetime
+
+from date_keys import is_standard_date
 
 def read_csv(path: pathlib.Path):
     if not path.exists():
@@ -22,19 +23,8 @@ def check_dates(rows, field, name):
         if not val:
             print(f"::warning ::{name} row {i} has empty {field}")
             continue
-        if "–" in val:
-            val = val.split("–",1)[0].strip()
-        ok = False
-        for fmt in ("%Y-%m-%d","%Y-%m","%Y"):
-            try:
-                datetime.strptime(val, fmt)
-                ok = True
-                break
-            except ValueError:
-                pass
-        if not ok:
-            raw = (r.get(field,"") or "").strip()
-            print(f"::warning ::{name} row {i} has non-standard date '{raw}'")
+        if not is_standard_date(val):
+            print(f"::warning ::{name} row {i} has non-standard date '{val}'")
 
 def main():
     ap = argparse.ArgumentParser()
@@ -1,16 +1,47 @@
 #!/usr/bin/env python3
-"""Fail-closed validation for FREE-DOM ST-007 evidence outputs."""
+"""Fail-closed validation for FREE-DOM ST-007 evidence outputs.
+
+Each object first passes intrinsic checks that depend on its own bytes only;
+the summaries those checks return are then bound to each other (manifest to
+artifact, receipt to manifest, batch to receipts, proof to batch). Evidence is
+append-only, so the CLI keeps intrinsic summaries in a local validation cache
+and re-checks only new or changed objects; bindings are re-checked on every
+run. ``--full`` ignores the cache. ``--run`` and ``--since`` validate only the
+closure of recent batches; full history is validated on a schedule. ``--jobs N``
+runs the intrinsic checks, which are canonical JSON plus SHA-256 per file, in N
+worker processes.
+"""
 from __future__ import annotations
 
 import argparse
 import hashlib
 import json
+import os
 import pathlib
 import re
 import sys
-from typing import Any
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from canonical_json import canonical, canonical_digest
+from chain_head import HEAD_PATH, head_is_current, read_head, verify_head
+from evidence_chain import safe_slug
+from evidence_segments import EvidenceReader, loose_path
+from merkle import MerkleTree, ProofVerifier, multiproof_root
+from mmr import ACCUMULATOR_DIR, verify_accumulator, verify_checkpoint
 
 SHA256_RE = re.compile(r"^sha256:[0-9a-f]{64}$")
+MERKLE_PREFIX = "data/evidence/merkle/"
+CACHE_SCHEMA = "stegverse.validation-cache.v1"
+CACHE_PATH = pathlib.PurePosixPath("data/cache/validation/objects.json")
+RULES_DIGEST = "sha256:" + hashlib.sha256(b"".join(
+    (pathlib.Path(__file__).parent / name).read_bytes()
+    for name in (
+        "validate_evidence_outputs.py", "merkle.py", "canonical_json.py", "mmr.py",
+        "evidence_segments.py", "chain_head.py",
+    )
+)).hexdigest()
 
 
 def load(path: pathlib.Path) -> dict[str, Any]:
@@ -21,8 +52,7 @@ def load(path: pathlib.Path) -> dict[str, Any]:
 
 
 def canonical_value_hash(value: Any) -> str:
-    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return "sha256:" + hashlib.sha256(raw).hexdigest()
+    return canonical_digest(value)
 
 
 def canonical_hash(obj: dict[str, Any], hash_field: str) -> str:
@@ -39,146 +69,524 @@ def require_hash(value: Any, label: str, nullable: bool = False) -> None:
 def calculate_merkle_root(hashes: list[str]) -> str:
     if not hashes:
         raise ValueError("Merkle batch has no leaves")
-    level = [bytes.fromhex(v.split(":", 1)[1]) for v in hashes]
-    while len(level) > 1:
-        if len(level) % 2:
-            level.append(level[-1])
-        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
-    return "sha256:" + level[0].hex()
-
-
-def apply_proof(receipt_hash: str, siblings: list[dict[str, str]]) -> str:
-    current = bytes.fromhex(receipt_hash.split(":", 1)[1])
-    for step in siblings:
-        sibling_hash = step.get("hash")
-        require_hash(sibling_hash, "proof sibling")
-        sibling = bytes.fromhex(sibling_hash.split(":", 1)[1])
-        position = step.get("position")
-        if position == "left":
-            current = hashlib.sha256(sibling + current).digest()
-        elif position == "right":
-            current = hashlib.sha256(current + sibling).digest()
+    return MerkleTree(hashes).root
+
+
+def apply_proof(receipt_hash: str, siblings: list[dict[str, str]], verifier: ProofVerifier | None = None) -> str:
+    return (verifier or ProofVerifier()).apply(receipt_hash, siblings)
+
+
+class ValidationCache:
+    """Intrinsic check results for evidence objects, keyed by path and stored bytes.
+
+    An entry is reused only while the object's bytes are unchanged: a matching
+    loose ``(size, mtime_ns)`` stamp is trusted, otherwise the stored bytes are
+    hashed and compared. Entries are discarded wholesale when this validator's
+    source changes. Binding checks never come from the cache.
+    """
+
+    def __init__(self, path: pathlib.Path | None, full: bool = False) -> None:
+        self.path = path
+        self.full = full
+        self.checked = self.cached = 0
+        self._entries: dict[str, Any] = {}
+        self._kept: dict[str, Any] = {}
+        if path is not None and not full and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                data = None
+            if isinstance(data, dict) and data.get("cache_schema") == CACHE_SCHEMA and data.get("rules_digest") == RULES_DIGEST:
+                entries = data.get("objects")
+                self._entries = entries if isinstance(entries, dict) else {}
+
+    def lookup(self, reader: EvidenceReader, kind: str, path: str) -> tuple[dict[str, Any] | None, tuple[int, int] | None, str | None]:
+        """Return ``(summary, stamp, digest)``; ``summary`` is ``None`` unless a current entry exists."""
+        stamp = reader.stamp(path)
+        entry = self._entries.get(path)
+        digest = None
+        if isinstance(entry, dict) and entry.get("kind") == kind and isinstance(entry.get("summary"), dict):
+            if stamp is None or entry.get("stamp") != list(stamp):
+                digest = reader.digest(path)
+            if digest is None or entry.get("digest") == digest:
+                self._kept[path] = dict(entry, stamp=list(stamp) if stamp else None)
+                self.cached += 1
+                return entry["summary"], stamp, digest
+        return None, stamp, digest
+
+    def store(self, kind: str, path: str, stamp: tuple[int, int] | None, digest: str, summary: dict[str, Any]) -> None:
+        self._kept[path] = {"kind": kind, "stamp": list(stamp) if stamp else None, "digest": digest, "summary": summary}
+        self.checked += 1
+
+    def save(self, prune: bool = True) -> None:
+        """Write the cache; ``prune`` drops entries for objects this run did not visit."""
+        if self.path is None:
+            return
+        objects = self._kept if prune else {**self._entries, **self._kept}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"cache_schema": CACHE_SCHEMA, "rules_digest": RULES_DIGEST, "objects": objects}
+        temp = self.path.with_name(self.path.name + ".tmp")
+        temp.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n", encoding="utf-8")
+        os.replace(temp, self.path)
+
+
+def check_artifact(path: str, obj: dict[str, Any]) -> dict[str, Any]:
+    rendered = canonical(obj)
+    return {"content_hash": rendered.digest, "size_bytes": rendered.length}
+
+
+def check_manifest(path: str, obj: dict[str, Any]) -> dict[str, Any]:
+    if obj.get("manifest_version") != "stegverse.evidence-manifest.v1":
+        raise ValueError(f"{path}: unsupported manifest_version")
+    if obj.get("manifest_hash") != canonical_hash(obj, "manifest_hash"):
+        raise ValueError(f"{path}: manifest_hash mismatch")
+    if not obj.get("evidence_id"):
+        raise ValueError(f"{path}: missing or duplicate evidence_id")
+    artifact = obj.get("artifact", {})
+    require_hash(artifact.get("content_hash"), f"{path}: artifact.content_hash")
+    return {
+        "evidence_id": obj["evidence_id"],
+        "manifest_hash": obj["manifest_hash"],
+        "artifact_hash": artifact["content_hash"],
+        "artifact_size": artifact.get("size_bytes"),
+    }
+
+
+def check_receipt(path: str, obj: dict[str, Any]) -> dict[str, Any]:
+    if obj.get("receipt_version") != "stegverse.evidence-transition-receipt.v1":
+        raise ValueError(f"{path}: unsupported receipt_version")
+    if obj.get("receipt_hash") != canonical_hash(obj, "receipt_hash"):
+        raise ValueError(f"{path}: receipt_hash mismatch")
+    require_hash(obj.get("receipt_hash"), f"{path}: receipt_hash")
+    if not obj.get("receipt_id"):
+        raise ValueError(f"{path}: duplicate or missing receipt identity")
+    if obj.get("authority_class") != "observe" or obj.get("evidence_effect") != "discovery-only":
+        raise ValueError(f"{path}: FREE-DOM receipt exceeds authority")
+    if obj.get("transition_type") not in {"discovered", "captured"}:
+        raise ValueError(f"{path}: unsupported FREE-DOM transition type")
+    if obj.get("transition_type") == "captured" and "zero-hits-not-absence-proof" not in obj.get("reason_codes", []) and obj.get("result") == "RECORDED":
+        standing = obj.get("standing") or {}
+        excluded = standing.get("excluded_inferences", [])
+        if not any("absence" in str(item).lower() for item in excluded):
+            raise ValueError(f"{path}: run receipt does not exclude absence inference")
+    return {
+        "receipt_id": obj["receipt_id"],
+        "receipt_hash": obj["receipt_hash"],
+        "evidence_id": obj.get("evidence_id"),
+        "manifest_hash": obj.get("manifest_hash"),
+    }
+
+
+def check_batch(path: str, obj: dict[str, Any]) -> dict[str, Any]:
+    if obj.get("batch_version") != "stegverse.evidence-merkle-batch.v1":
+        raise ValueError(f"{path}: unsupported batch_version")
+    if obj.get("leaf_order") != "lexicographic-receipt-id":
+        raise ValueError(f"{path}: invalid leaf order")
+    if obj.get("batch_hash") != canonical_hash(obj, "batch_hash"):
+        raise ValueError(f"{path}: batch_hash mismatch")
+    leaves = obj.get("leaf_receipt_hashes")
+    if not isinstance(leaves, list) or not leaves or len(leaves) != len(set(leaves)):
+        raise ValueError(f"{path}: invalid Merkle leaves")
+    for leaf in leaves:
+        require_hash(leaf, f"{path}: leaf")
+    if obj.get("merkle_root") != calculate_merkle_root(leaves):
+        raise ValueError(f"{path}: Merkle root mismatch")
+    require_hash(obj.get("previous_batch_hash"), f"{path}: previous_batch_hash", nullable=True)
+    return {
+        "batch_id": obj.get("batch_id"),
+        "batch_hash": obj["batch_hash"],
+        "merkle_root": obj["merkle_root"],
+        "leaves": leaves,
+        "previous_batch_hash": obj.get("previous_batch_hash"),
+        "checkpoint_ref": obj.get("checkpoint_ref"),
+        "created_at": obj.get("created_at", ""),
+    }
+
+
+def check_proof(path: str, proof: dict[str, Any], verifiers: dict[Any, ProofVerifier]) -> dict[str, Any]:
+    if proof.get("proof_version") != "stegverse.merkle-inclusion-proof.v1":
+        raise ValueError(f"{path}: unsupported proof_version")
+    if proof.get("proof_hash") != canonical_hash(proof, "proof_hash"):
+        raise ValueError(f"{path}: proof_hash mismatch")
+    receipt_hash = proof.get("receipt_hash")
+    if not isinstance(receipt_hash, str) or not SHA256_RE.fullmatch(receipt_hash):
+        raise ValueError(f"{path}: proof receipt binding invalid")
+    siblings = proof.get("siblings")
+    resolved = None
+    if isinstance(siblings, list):
+        verifier = verifiers.setdefault(proof.get("batch_id"), ProofVerifier())
+        try:
+            resolved = apply_proof(receipt_hash, siblings, verifier)
+        except ValueError as exc:
+            raise ValueError(f"{path}: {exc}") from exc
+    return {
+        "batch_id": proof.get("batch_id"),
+        "batch_hash": proof.get("batch_hash"),
+        "receipt_id": proof.get("receipt_id"),
+        "receipt_hash": receipt_hash,
+        "leaf_index": proof.get("leaf_index"),
+        "resolved_root": resolved,
+    }
+
+
+def check_bundle(path: str, bundle: dict[str, Any]) -> dict[str, Any]:
+    if bundle.get("bundle_version") != "stegverse.merkle-proof-bundle.v1":
+        raise ValueError(f"{path}: unsupported bundle_version")
+    if bundle.get("bundle_hash") != canonical_hash(bundle, "bundle_hash"):
+        raise ValueError(f"{path}: bundle_hash mismatch")
+    covered = bundle.get("leaves")
+    if not isinstance(covered, list) or not covered:
+        raise ValueError(f"{path}: proof bundle covers no leaves")
+    leaf_count = bundle.get("leaf_count")
+    if not isinstance(leaf_count, int) or leaf_count < 1:
+        raise ValueError(f"{path}: proof bundle does not describe its batch")
+    positions: dict[int, str] = {}
+    leaves: list[list[Any]] = []
+    previous = -1
+    for item in covered:
+        receipt_hash = item.get("receipt_hash") if isinstance(item, dict) else None
+        index = item.get("leaf_index") if isinstance(item, dict) else None
+        if not isinstance(receipt_hash, str) or not SHA256_RE.fullmatch(receipt_hash):
+            raise ValueError(f"{path}: proof bundle receipt binding invalid")
+        if not isinstance(index, int) or index < 0 or index >= leaf_count:
+            raise ValueError(f"{path}: invalid leaf_index")
+        if index <= previous:
+            raise ValueError(f"{path}: proof bundle leaves not ordered by leaf_index")
+        positions[index] = receipt_hash
+        leaves.append([item.get("receipt_id"), receipt_hash, index])
+        previous = index
+    nodes = bundle.get("nodes")
+    if not isinstance(nodes, list):
+        raise ValueError(f"{path}: proof bundle nodes must be a list")
+    try:
+        resolved = multiproof_root(leaf_count, positions, nodes)
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    return {
+        "batch_id": bundle.get("batch_id"),
+        "batch_hash": bundle.get("batch_hash"),
+        "merkle_root": bundle.get("merkle_root"),
+        "leaf_count": leaf_count,
+        "leaves": leaves,
+        "resolved_root": resolved,
+    }
+
+
+CHECKS: dict[str, Callable[..., dict[str, Any]]] = {
+    "artifact": check_artifact,
+    "manifest": check_manifest,
+    "receipt": check_receipt,
+    "batch": check_batch,
+    "bundle": check_bundle,
+}
+
+
+def check_object(reader: EvidenceReader, kind: str, path: str, verifiers: dict[Any, ProofVerifier],
+                 digest: str | None = None) -> tuple[str, dict[str, Any]]:
+    """Run the intrinsic check for one object; returns ``(digest, summary)``."""
+    if digest is None:
+        digest, record = reader.load(path)
+    else:
+        record = reader.get(path)
+    if record is None:
+        raise ValueError(f"{reader.base / path}: record missing")
+    label = os.path.join(reader.base, path)
+    if kind == "proof":
+        return digest, check_proof(label, record, verifiers)
+    return digest, CHECKS[kind](label, record)
+
+
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(base: str) -> None:
+    _WORKER["reader"] = EvidenceReader(pathlib.Path(base))
+    _WORKER["verifiers"] = {}
+
+
+def _check_in_worker(task: tuple[str, str, str | None]) -> tuple[str | None, dict[str, Any] | None, str | None]:
+    kind, path, digest = task
+    try:
+        digest, summary = check_object(_WORKER["reader"], kind, path, _WORKER["verifiers"], digest)
+    except ValueError as exc:
+        return None, None, str(exc)
+    return digest, summary, None
+
+
+class IntrinsicChecks:
+    """Serve intrinsic summaries in path order from the cache, this process or a worker pool.
+
+    Workers only hash and check single objects; every error is raised here, for
+    the first failing object in path order, so the outcome matches a serial run.
+    """
+
+    def __init__(self, reader: EvidenceReader, cache: ValidationCache, jobs: int = 1) -> None:
+        self.reader = reader
+        self.cache = cache
+        self.jobs = jobs
+        self.verifiers: dict[Any, ProofVerifier] = {}
+        self._done: dict[tuple[str, str], dict[str, Any]] = {}
+        self._pool: ProcessPoolExecutor | None = None
+
+    def summaries(self, kind: str, paths: list[str]) -> list[tuple[str, dict[str, Any]]]:
+        """Return ``(file label, summary)`` for ``paths``, which are relative to the base."""
+        results: list[dict[str, Any] | None] = []
+        misses: list[tuple[int, str, tuple[int, int] | None, str | None]] = []
+        for position, path in enumerate(paths):
+            summary = self._done.get((kind, path))
+            if summary is None:
+                summary, stamp, digest = self.cache.lookup(self.reader, kind, path)
+                if summary is None:
+                    misses.append((position, path, stamp, digest))
+                else:
+                    self._done[(kind, path)] = summary
+            results.append(summary)
+        if self.jobs > 1 and len(misses) > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.jobs, initializer=_init_worker, initargs=(str(self.reader.base),))
+            tasks = [(kind, path, digest) for _, path, _, digest in misses]
+            chunksize = max(1, len(tasks) // (self.jobs * 4))
+            for (position, path, stamp, _), (digest, summary, error) in zip(misses, self._pool.map(_check_in_worker, tasks, chunksize=chunksize)):
+                if error is not None:
+                    raise ValueError(error)
+                self.cache.store(kind, path, stamp, digest, summary)
+                results[position] = summary
+                self._done[(kind, path)] = summary
         else:
-            raise ValueError("proof sibling position must be left or right")
-    return "sha256:" + current.hex()
+            for position, path, stamp, digest in misses:
+                digest, summary = check_object(self.reader, kind, path, self.verifiers, digest)
+                self.cache.store(kind, path, stamp, digest, summary)
+                results[position] = summary
+                self._done[(kind, path)] = summary
+        base = str(self.reader.base)
+        return [(os.path.join(base, path), summary) for path, summary in zip(paths, results)]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def run_batches(base: pathlib.Path, run_id: str) -> list[str]:
+    """Return the batch path written for ``run_id``."""
+    path = f"{MERKLE_PREFIX}{safe_slug(run_id, 64)}.json"
+    if not (base / path).exists():
+        raise ValueError(f"no Merkle batch for run {run_id!r}")
+    return [path]
+
+
+def batch_ref(ref: Any) -> str | None:
+    """Return ``ref`` if it names a batch file directly under the Merkle directory."""
+    if isinstance(ref, str) and ref.startswith(MERKLE_PREFIX) and ref.endswith(".json") and "/" not in ref[len(MERKLE_PREFIX):]:
+        return ref
+    return None
+
+
+def since_batches(checks: IntrinsicChecks, batch_id: str) -> list[str]:
+    """Walk back from the chain head and return every batch committed after ``batch_id``."""
+    base = checks.reader.base
+    head = read_head(base)
+    if head is None or not head_is_current(base, head):
+        raise ValueError(f"{HEAD_PATH}: chain head missing or stale; validate the full history")
+    paths: list[str] = []
+    ref = batch_ref(head.get("ref"))
+    while ref is not None and ref not in paths and (base / ref).exists():
+        (_, summary), = checks.summaries("batch", [ref])
+        if summary["batch_id"] == batch_id:
+            return sorted(paths, key=lambda value: value.split("/"))
+        paths.append(ref)
+        ref = batch_ref(summary["checkpoint_ref"])
+    raise ValueError(f"batch {batch_id!r} is not in the chain behind the head")
+
 
+def closure(checks: IntrinsicChecks, batch_paths: list[str]) -> dict[str, list[str]]:
+    """Return the record paths, by kind, that ``batch_paths`` reach through their proofs."""
+    reader = checks.reader
+    scope: dict[str, list[str]] = {"batch": batch_paths, "proof": [], "bundle": []}
+    receipt_ids: list[Any] = []
+    for path in batch_paths:
+        run_slug = pathlib.PurePosixPath(path).stem
+        proofs = reader.record_paths("proof", f"{run_slug}/")
+        scope["proof"].extend(proofs)
+        receipt_ids.extend(summary["receipt_id"] for _, summary in checks.summaries("proof", proofs))
+        bundle = loose_path("bundle", run_slug)
+        if reader.exists(bundle):
+            scope["bundle"].append(bundle)
+            receipt_ids.extend(leaf[0] for _, summary in checks.summaries("bundle", [bundle]) for leaf in summary["leaves"])
 
-def validate(base: pathlib.Path) -> tuple[int, int, int, int]:
-    root = base / "data" / "evidence"
-    artifacts_dir = root / "artifacts"
-    manifests_dir, receipts_dir = root / "manifests", root / "receipts"
-    batches_dir, proofs_dir = root / "merkle", root / "proofs"
+    def existing(kind: str, keys: list[Any]) -> list[str]:
+        paths = {loose_path(kind, key) for key in keys if isinstance(key, str) and key and "/" not in key}
+        return sorted((path for path in paths if reader.exists(path)), key=lambda value: value.split("/"))
+
+    scope["receipt"] = existing("receipt", receipt_ids)
+    evidence_ids = [summary["evidence_id"] for _, summary in checks.summaries("receipt", scope["receipt"])]
+    scope["manifest"] = existing("manifest", evidence_ids)
+    scope["artifact"] = existing("artifact", evidence_ids)
+    return scope
+
+
+def validate(base: pathlib.Path, cache: ValidationCache | None = None, jobs: int = 1,
+             run_id: str | None = None, since_batch_id: str | None = None) -> tuple[int, int, int, int]:
+    """Validate every evidence object, then every binding between them.
+
+    Intrinsic checks (versions, self-hashes, Merkle roots and proof walks) run per
+    object, may be served by ``cache`` and fan out to ``jobs`` worker processes;
+    binding checks always run in full, in this process.
+
+    ``run_id`` or ``since_batch_id`` limits validation to the closure of one run's
+    batch, or of every batch after ``since_batch_id``: those batches, their proofs,
+    receipts, manifests and artifacts, and the link from the first batch to the
+    batch its ``checkpoint_ref`` names. Objects outside the closure, including
+    duplicates of objects inside it, are left to full validation.
+    """
+    if run_id is not None and since_batch_id is not None:
+        raise ValueError("validate either one run or the batches since one batch, not both")
+    checks = IntrinsicChecks(EvidenceReader(base), cache or ValidationCache(None), jobs)
+    try:
+        scope = None
+        if run_id is not None:
+            scope = closure(checks, run_batches(base, run_id))
+        elif since_batch_id is not None:
+            scope = closure(checks, since_batches(checks, since_batch_id))
+        return _validate(base, checks, scope)
+    finally:
+        checks.close()
+
+
+def _validate(base: pathlib.Path, checks: IntrinsicChecks, scope: dict[str, list[str]] | None) -> tuple[int, int, int, int]:
+    reader = checks.reader
+    summaries = checks.summaries
+
+    def paths(kind: str) -> list[str]:
+        return scope[kind] if scope is not None else reader.record_paths(kind)
+
+    artifact_paths = paths("artifact")
+    artifacts = {path: summary for path, (_, summary) in zip(artifact_paths, summaries("artifact", artifact_paths))}
     manifests: dict[str, dict[str, Any]] = {}
-    receipts: dict[str, dict[str, Any]] = {}
-    receipt_ids: set[str] = set()
-
-    for path in sorted(manifests_dir.glob("*.json")) if manifests_dir.exists() else []:
-        obj = load(path)
-        if obj.get("manifest_version") != "stegverse.evidence-manifest.v1":
-            raise ValueError(f"{path}: unsupported manifest_version")
-        if obj.get("manifest_hash") != canonical_hash(obj, "manifest_hash"):
-            raise ValueError(f"{path}: manifest_hash mismatch")
-        evidence_id = obj.get("evidence_id")
-        if not evidence_id or evidence_id in manifests:
+    for path, summary in summaries("manifest", paths("manifest")):
+        evidence_id = summary["evidence_id"]
+        if evidence_id in manifests:
             raise ValueError(f"{path}: missing or duplicate evidence_id")
-        artifact_path = artifacts_dir / f"{evidence_id}.json"
-        if not artifact_path.exists():
+        artifact = artifacts.get(f"data/evidence/artifacts/{evidence_id}.json")
+        if artifact is None:
             raise ValueError(f"{path}: retained artifact missing")
-        artifact = load(artifact_path)
-        artifact_hash = obj.get("artifact", {}).get("content_hash")
-        require_hash(artifact_hash, f"{path}: artifact.content_hash")
-        if artifact_hash != canonical_value_hash(artifact):
+        if summary["artifact_hash"] != artifact["content_hash"]:
             raise ValueError(f"{path}: artifact.content_hash mismatch")
-        declared_size = obj.get("artifact", {}).get("size_bytes")
-        actual_size = len(json.dumps(artifact, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8"))
-        if declared_size is not None and declared_size != actual_size:
+        if summary["artifact_size"] is not None and summary["artifact_size"] != artifact["size_bytes"]:
             raise ValueError(f"{path}: artifact.size_bytes mismatch")
-        manifests[evidence_id] = obj
-
-    for path in sorted(receipts_dir.glob("*.json")) if receipts_dir.exists() else []:
-        obj = load(path)
-        if obj.get("receipt_version") != "stegverse.evidence-transition-receipt.v1":
-            raise ValueError(f"{path}: unsupported receipt_version")
-        if obj.get("receipt_hash") != canonical_hash(obj, "receipt_hash"):
-            raise ValueError(f"{path}: receipt_hash mismatch")
-        receipt_hash, receipt_id = obj.get("receipt_hash"), obj.get("receipt_id")
-        require_hash(receipt_hash, f"{path}: receipt_hash")
-        if receipt_hash in receipts or not receipt_id or receipt_id in receipt_ids:
+        manifests[evidence_id] = summary
+
+    receipts: dict[str, dict[str, Any]] = {}
+    receipt_by_id: dict[str, dict[str, Any]] = {}
+    for path, summary in summaries("receipt", paths("receipt")):
+        receipt_hash, receipt_id = summary["receipt_hash"], summary["receipt_id"]
+        if receipt_hash in receipts or receipt_id in receipt_by_id:
             raise ValueError(f"{path}: duplicate or missing receipt identity")
-        manifest = manifests.get(obj.get("evidence_id"))
-        if manifest is None or obj.get("manifest_hash") != manifest.get("manifest_hash"):
+        manifest = manifests.get(summary["evidence_id"])
+        if manifest is None or summary["manifest_hash"] != manifest["manifest_hash"]:
             raise ValueError(f"{path}: receipt manifest binding invalid")
-        if obj.get("authority_class") != "observe" or obj.get("evidence_effect") != "discovery-only":
-            raise ValueError(f"{path}: FREE-DOM receipt exceeds authority")
-        if obj.get("transition_type") not in {"discovered", "captured"}:
-            raise ValueError(f"{path}: unsupported FREE-DOM transition type")
-        if obj.get("transition_type") == "captured" and "zero-hits-not-absence-proof" not in obj.get("reason_codes", []) and obj.get("result") == "RECORDED":
-            standing = obj.get("standing") or {}
-            excluded = standing.get("excluded_inferences", [])
-            if not any("absence" in str(item).lower() for item in excluded):
-                raise ValueError(f"{path}: run receipt does not exclude absence inference")
-        receipts[receipt_hash] = obj
-        receipt_ids.add(receipt_id)
-
-    batches: list[tuple[pathlib.Path, dict[str, Any]]] = []
-    for path in sorted(batches_dir.glob("*.json")) if batches_dir.exists() else []:
-        obj = load(path)
-        if obj.get("batch_version") != "stegverse.evidence-merkle-batch.v1":
-            raise ValueError(f"{path}: unsupported batch_version")
-        if obj.get("leaf_order") != "lexicographic-receipt-id":
-            raise ValueError(f"{path}: invalid leaf order")
-        if obj.get("batch_hash") != canonical_hash(obj, "batch_hash"):
-            raise ValueError(f"{path}: batch_hash mismatch")
-        leaves = obj.get("leaf_receipt_hashes")
-        if not isinstance(leaves, list) or not leaves or len(leaves) != len(set(leaves)):
-            raise ValueError(f"{path}: invalid Merkle leaves")
-        for leaf in leaves:
-            require_hash(leaf, f"{path}: leaf")
-            if leaf not in receipts:
+        receipts[receipt_hash] = summary
+        receipt_by_id[receipt_id] = summary
+
+    batches_dir = base / MERKLE_PREFIX
+    if scope is not None:
+        batch_paths = scope["batch"]
+    else:
+        batch_paths = [path.relative_to(base).as_posix() for path in sorted(batches_dir.glob("*.json"))] if batches_dir.exists() else []
+    batches = summaries("batch", batch_paths)
+    # Leaf position per batch, so proof and bundle bindings are lookups rather than list scans.
+    leaf_positions: dict[Any, dict[str, int]] = {}
+    for path, summary in batches:
+        previous_id = None
+        for leaf in summary["leaves"]:
+            receipt = receipts.get(leaf)
+            if receipt is None:
                 raise ValueError(f"{path}: unknown receipt leaf {leaf}")
-        expected = [r["receipt_hash"] for r in sorted((receipts[h] for h in leaves), key=lambda item: item["receipt_id"])]
-        if leaves != expected:
-            raise ValueError(f"{path}: Merkle leaves not ordered by receipt_id")
-        if obj.get("merkle_root") != calculate_merkle_root(leaves):
-            raise ValueError(f"{path}: Merkle root mismatch")
-        require_hash(obj.get("previous_batch_hash"), f"{path}: previous_batch_hash", nullable=True)
-        batches.append((path, obj))
-
-    ordered_batches = sorted(batches, key=lambda item: (item[1].get("created_at", ""), item[0].name))
-    for index, (path, obj) in enumerate(ordered_batches):
-        expected_previous = None if index == 0 else ordered_batches[index - 1][1].get("batch_hash")
-        if obj.get("previous_batch_hash") != expected_previous:
+            if previous_id is not None and receipt["receipt_id"] <= previous_id:
+                raise ValueError(f"{path}: Merkle leaves not ordered by receipt_id")
+            previous_id = receipt["receipt_id"]
+        leaf_positions[summary["batch_id"]] = {leaf: index for index, leaf in enumerate(summary["leaves"])}
+
+    ordered_batches = sorted(batches, key=lambda item: (item[1]["created_at"], os.path.basename(item[0])))
+    expected_previous = None
+    if scope is not None and ordered_batches:
+        # A scoped chain starts from the batch the earliest batch in scope names.
+        first_path, first = ordered_batches[0]
+        if first["checkpoint_ref"] is not None:
+            anchor = batch_ref(first["checkpoint_ref"])
+            if anchor is None or not (base / anchor).exists():
+                raise ValueError(f"{first_path}: checkpoint_ref does not name a batch")
+            expected_previous = summaries("batch", [anchor])[0][1]["batch_hash"]
+    for index, (path, summary) in enumerate(ordered_batches):
+        if index:
+            expected_previous = ordered_batches[index - 1][1]["batch_hash"]
+        if summary["previous_batch_hash"] != expected_previous:
             raise ValueError(f"{path}: previous_batch_hash does not match prior batch")
+    if (base / HEAD_PATH).exists():
+        if scope is None:
+            verify_head(base)
+        elif not head_is_current(base, read_head(base) or {}):
+            raise ValueError(f"{HEAD_PATH}: chain head does not name the latest batch")
+    if (base / ACCUMULATOR_DIR / "state.json").exists():
+        chain = [
+            (f"{MERKLE_PREFIX}{os.path.basename(path)}",
+             {"batch_id": summary["batch_id"], "batch_hash": summary["batch_hash"], "leaf_receipt_hashes": summary["leaves"]})
+            for path, summary in ordered_batches
+        ]
+        if scope is None:
+            verify_accumulator(base, chain)
+        elif chain:
+            # A scoped chain is contiguous, so each checkpoint extends the one before it.
+            previous_ref = batch_ref(ordered_batches[0][1]["checkpoint_ref"])
+            for ref, batch in chain:
+                verify_checkpoint(base, ref, batch, previous_ref)
+                previous_ref = ref
 
     proof_count = 0
     seen_proofs: set[tuple[str, str]] = set()
-    batch_by_id = {obj.get("batch_id"): obj for _, obj in batches}
-    for path in sorted(proofs_dir.rglob("*.json")) if proofs_dir.exists() else []:
-        proof = load(path)
-        if proof.get("proof_version") != "stegverse.merkle-inclusion-proof.v1":
-            raise ValueError(f"{path}: unsupported proof_version")
-        if proof.get("proof_hash") != canonical_hash(proof, "proof_hash"):
-            raise ValueError(f"{path}: proof_hash mismatch")
-        batch = batch_by_id.get(proof.get("batch_id"))
-        if batch is None or proof.get("batch_hash") != batch.get("batch_hash"):
+    batch_by_id = {summary["batch_id"]: summary for _, summary in batches}
+    for path, proof in summaries("proof", paths("proof")):
+        batch = batch_by_id.get(proof["batch_id"])
+        if batch is None or proof["batch_hash"] != batch["batch_hash"]:
             raise ValueError(f"{path}: proof batch binding invalid")
-        receipt_hash = proof.get("receipt_hash")
-        if receipt_hash not in receipts or receipt_hash not in batch.get("leaf_receipt_hashes", []):
+        receipt_hash = proof["receipt_hash"]
+        position = leaf_positions[proof["batch_id"]].get(receipt_hash)
+        if receipt_hash not in receipts or position is None:
             raise ValueError(f"{path}: proof receipt binding invalid")
-        index = proof.get("leaf_index")
-        leaves = batch.get("leaf_receipt_hashes", [])
-        if not isinstance(index, int) or index < 0 or index >= len(leaves) or leaves[index] != receipt_hash:
+        index = proof["leaf_index"]
+        if not isinstance(index, int) or index != position:
             raise ValueError(f"{path}: invalid leaf_index")
-        siblings = proof.get("siblings")
-        if not isinstance(siblings, list) or apply_proof(receipt_hash, siblings) != batch.get("merkle_root"):
+        if proof["resolved_root"] != batch["merkle_root"]:
             raise ValueError(f"{path}: inclusion proof does not resolve to batch root")
-        key = (proof.get("batch_id"), receipt_hash)
+        key = (proof["batch_id"], receipt_hash)
         if key in seen_proofs:
             raise ValueError(f"{path}: duplicate inclusion proof")
         seen_proofs.add(key)
         proof_count += 1
 
-    expected_proofs = sum(len(obj.get("leaf_receipt_hashes", [])) for _, obj in batches)
+    for path, bundle in summaries("bundle", paths("bundle")):
+        batch = batch_by_id.get(bundle["batch_id"])
+        if batch is None or bundle["batch_hash"] != batch["batch_hash"]:
+            raise ValueError(f"{path}: proof bundle batch binding invalid")
+        positions = leaf_positions[bundle["batch_id"]]
+        if bundle["merkle_root"] != batch["merkle_root"] or bundle["leaf_count"] != len(batch["leaves"]):
+            raise ValueError(f"{path}: proof bundle does not describe its batch")
+        for receipt_id, receipt_hash, index in bundle["leaves"]:
+            receipt = receipts.get(receipt_hash)
+            if receipt is None or receipt["receipt_id"] != receipt_id:
+                raise ValueError(f"{path}: proof bundle receipt binding invalid")
+            if positions.get(receipt_hash) != index:
+                raise ValueError(f"{path}: invalid leaf_index")
+        if bundle["resolved_root"] != batch["merkle_root"]:
+            raise ValueError(f"{path}: proof bundle does not resolve to batch root")
+        for _, receipt_hash, _ in bundle["leaves"]:
+            key = (bundle["batch_id"], receipt_hash)
+            if key in seen_proofs:
+                raise ValueError(f"{path}: duplicate inclusion proof")
+            seen_proofs.add(key)
+            proof_count += 1
+
+    expected_proofs = sum(len(summary["leaves"]) for _, summary in batches)
     if proof_count != expected_proofs:
         raise ValueError(f"inclusion proof count mismatch: expected {expected_proofs}, found {proof_count}")
     return len(manifests), len(receipts), len(batches), proof_count
@@ -187,13 +595,34 @@ def validate(base: pathlib.Path) -> tuple[int, int, int, int]:
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--base", default=".")
+    parser.add_argument("--full", action="store_true", help="Ignore the validation cache and re-check every object")
+    parser.add_argument("--cache-path", default=str(CACHE_PATH), help="Validation cache, relative to --base")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for per-object hash checks")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--run", help="Validate only this run's batch closure and its link to the chain")
+    scope.add_argument("--since", metavar="BATCH_ID", help="Validate only the batches committed after BATCH_ID")
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    base = pathlib.Path(args.base).resolve()
+    cache = ValidationCache(base / args.cache_path, full=args.full)
+    started = time.perf_counter()
     try:
-        counts = validate(pathlib.Path(args.base).resolve())
+        counts = validate(base, cache, jobs=args.jobs, run_id=args.run, since_batch_id=args.since)
     except (ValueError, json.JSONDecodeError) as exc:
+        cache.save(prune=False)
         print(f"DENY evidence_outputs_invalid: {exc}", file=sys.stderr)
         return 1
-    print(f"ALLOW evidence_outputs_valid manifests={counts[0]} receipts={counts[1]} batches={counts[2]} proofs={counts[3]}")
+    # A scoped run visits a subset of objects; keep the others' entries.
+    cache.save(prune=args.run is None and args.since is None)
+    elapsed = time.perf_counter() - started
+    objects = cache.checked + cache.cached
+    scope_label = f"run:{args.run}" if args.run else f"since:{args.since}" if args.since else "full"
+    print(
+        f"ALLOW evidence_outputs_valid scope={scope_label} manifests={counts[0]} receipts={counts[1]} batches={counts[2]} proofs={counts[3]} "
+        f"objects_checked={cache.checked} objects_cached={cache.cached} jobs={args.jobs} "
+        f"seconds={elapsed:.3f} objects_per_second={objects / elapsed if elapsed else 0:.0f}"
+    )
     return 0
 
 
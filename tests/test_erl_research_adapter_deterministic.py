@@ -30,6 +30,16 @@ def main():
         assert any(x['result']=='NO_UPDATE' and x['hits']==0 for x in r); assert any(x['result']=='CANDIDATES_EMITTED' and x['hits']==2 for x in r)
         assert sha(sentinel_master)==before_master and sha(sentinel_unverified)==before_unverified, 'ERL sidecar must not mutate native FREE-DOM records'
         assert all(x.get('privacy_policy_preserved') is True for x in r)
+        cache=adapter.HttpCache(b/'cache/http'); seen=[]
+        def conditional(request,timeout=15):
+            seen.append(request.get_header('If-none-match'))
+            if seen[-1]=='"v1"': raise adapter.urllib.error.HTTPError(request.full_url,304,'Not Modified',{},None)
+            response=FakeResponse(positive); response.headers={'Content-Type':'text/html','ETag':'"v1"'}; return response
+        with mock.patch.object(adapter.urllib.request,'urlopen',side_effect=conditional):
+            assert adapter.fetch('https://fixture.local/positive',cache)==positive
+            next((b/'cache/http').glob('*.body')).write_bytes(b'corrupt')
+            assert adapter.fetch('https://fixture.local/positive',cache)==positive, 'a 304 without a usable cached body must refetch'
+        assert seen==[None,'"v1"',None] and cache.summary()=={'hits':0,'misses':2,'stored':2}, (seen,cache.summary())
         print(json.dumps({'status':'PASS','repository':REPOSITORY,'active_trajectory_requests':1,'saturated_trajectory_requests':0,'candidates':2,'receipts':2,'supporting_and_contrary_leads_preserved':True,'null_result_preserved':True,'duplicate_links_collapsed':True,'native_state_unchanged':True,'privacy_policy_preserved':True,'github_token_authority':'NONE','credential_authority':'TV/TVC','authority_effect':'NONE'},sort_keys=True))
     return 0
 if __name__=='__main__': raise SystemExit(main())